@@ -0,0 +1,71 @@
+"""
+бенчмарк выполнения сценария из множества команд: построчный цикл с приглашением (как в интерактивном режиме)
+против пакетного режима без приглашения с буферизованным выводом
+вывод направляется в /dev/null, лог - во временный файл
+
+запуск:
+    python benchmarks/bench_batch.py --commands 100000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from src.core import ShellCore
+from main import run_batch
+from utils.console_info import get_info
+from utils.logger import BATCH_LOG_CAPACITY, get_logger
+
+
+def interactive(core: ShellCore, lines: list[str]):
+    try:
+        os.getlogin()
+    except OSError: # без управляющего терминала (cron, CI) приглашение не строится
+        os.getlogin = lambda: "user"
+    print(f"{get_info()}", end=' ')
+    for line in lines:
+        core.execute_command(line)
+        print(f"{get_info()}", end=' ')
+    sys.stdout.flush()
+
+
+def run(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "file.txt").write_text("line\n")
+        lines = ["pwd\n"] * count
+        null = open(os.devnull, 'w')
+        stdout, sys.stdout = sys.stdout, null
+        try:
+            for label, capacity, func in (("prompt per line", 0, interactive), ("batch mode", BATCH_LOG_CAPACITY, run_batch)):
+                root = logging.getLogger()
+                for handler in root.handlers[:]:
+                    root.removeHandler(handler)
+                    handler.close()
+                core = ShellCore(get_logger(tmp / f"{capacity}.log", capacity))
+                core.auto_discover_commands()
+                start = time.perf_counter()
+                func(core, lines)
+                logging.getLogger().handlers[0].flush()
+                elapsed = time.perf_counter() - start
+                print(f"{label:>24}: {elapsed:8.3f} s ({elapsed / len(lines) * 1e6:.1f} us/command)", file=stdout)
+        finally:
+            sys.stdout = stdout
+            null.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.commands)
+
+
+if __name__ == "__main__":
+    main()
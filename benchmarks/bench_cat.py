@@ -0,0 +1,74 @@
+"""
+бенчмарк команды cat: пиковое потребление памяти (RSS) и скорость в МБ/с
+
+сравнивает старую реализацию (чтение файла целиком и print) с потоковой
+каждый режим запускается в отдельном процессе, вывод читается родителем через канал
+
+запуск:
+    python benchmarks/bench_cat.py --size-mb 1024
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def run_child(mode: str, path: str):
+    """
+    выполнение одного режима cat в дочернем процессе, результат пишется в stderr в формате json
+    """
+    sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+    from commands.cat import CatCommand
+
+    start = time.perf_counter()
+    if mode == "old":
+        with open(path) as file:
+            print(file.read())
+    else:
+        CatCommand().execute([path], ["text"] if mode == "text" else [])
+    sys.stdout.flush()
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sys.stderr.write(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_kb / 1024}))
+
+
+def run_parent(size_mb: int):
+    """
+    создание тестового файла и последовательный запуск всех режимов
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "input.log"
+        line = b"2025-01-01 00:00:00 INFO some log message with payload 0123456789\n"
+        block = line * (1024 * 1024 // len(line) + 1)
+        with open(path, "wb") as file:
+            for _ in range(size_mb):
+                file.write(block[:1024 * 1024])
+
+        for mode in ("old", "text", "raw"):
+            process = subprocess.Popen([sys.executable, __file__, "--child", mode, str(path)],
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            buffer = bytearray(1024 * 1024)
+            while process.stdout.readinto(buffer):
+                pass
+            result = json.loads(process.stderr.read())
+            process.wait()
+            speed = size_mb / result["seconds"] if result["seconds"] else float("inf")
+            print(f"{mode:>5}: {result['seconds']:8.3f} s {speed:10.1f} MB/s  peak RSS {result['peak_rss_mb']:8.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"))
+    namespace = parser.parse_args()
+    if namespace.child:
+        run_child(*namespace.child)
+    else:
+        run_parent(namespace.size_mb)
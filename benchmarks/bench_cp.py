@@ -0,0 +1,58 @@
+"""
+бенчмарк копирования больших файлов: shutil.copy2 против копирования силами ядра (copy_file)
+
+для обычного и разреженного файла выводятся время и объем занятого копией места на диске
+
+запуск:
+    python benchmarks/bench_cp.py --size-mb 1024
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from src.utils.fastcopy import copy_file
+
+
+def measure(name: str, func, src: Path, dst: Path):
+    start = time.perf_counter()
+    method = func(src, dst)
+    elapsed = time.perf_counter() - start
+    allocated = dst.stat().st_blocks * 512 / 1024 ** 2
+    print(f"{name:>24}: {elapsed:8.3f} s  allocated {allocated:9.1f} MB  ({method})")
+    dst.unlink()
+
+
+def run(size_mb: int, directory: str | None):
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        tmp = Path(tmp)
+        dense = tmp / "dense.img"
+        with open(dense, "wb") as file:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                file.write(block)
+        sparse = tmp / "sparse.img"
+        with open(sparse, "wb") as file:
+            file.truncate(size_mb * 1024 * 1024)
+            for offset in range(0, size_mb, 64): # 1 МБ данных на каждые 64 МБ
+                file.seek(offset * 1024 * 1024)
+                file.write(block)
+
+        for label, src in (("dense", dense), ("sparse", sparse)):
+            measure(f"{label} copy2", lambda s, d: shutil.copy2(s, d) and "copy2", src, tmp / "copy.img")
+            measure(f"{label} copy_file", lambda s, d: copy_file(s, d, "never"), src, tmp / "copy.img")
+            measure(f"{label} copy_file reflink", lambda s, d: copy_file(s, d, "auto"), src, tmp / "copy.img")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--dir", default=None, help="директория на проверяемой файловой системе")
+    namespace = parser.parse_args()
+    run(namespace.size_mb, namespace.dir)
@@ -0,0 +1,65 @@
+"""
+микробенчмарк format_table на таблице из миллиона строк: время и пиковая память
+
+сравнивает старую реализацию (str дважды на ячейку, ljust и вложенные списки) с реализацией по столбцам
+время измеряется отдельно от памяти, так как tracemalloc замедляет выполнение
+
+запуск:
+    python benchmarks/bench_format_table.py --rows 1000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from src.utils.format_output import format_table
+
+
+def old_format_table(data):
+    """
+    реализация format_table до переписывания
+    """
+    if not data:
+        return ""
+    num_columns = len(data[0])
+    column_widths = [0] * num_columns
+    for row in data:
+        for i, cell in enumerate(row):
+            column_widths[i] = max(column_widths[i], len(str(cell)))
+    formatted_lines = []
+    for row in data:
+        formatted_cells = []
+        for i, cell in enumerate(row):
+            formatted_cell = str(cell).ljust(column_widths[i])
+            formatted_cells.append(formatted_cell)
+        formatted_lines.append(" ".join(formatted_cells))
+    return "\n".join(formatted_lines)
+
+
+def measure(name: str, func, data):
+    start = time.perf_counter()
+    func(data)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>4}: {elapsed:8.3f} s  peak memory {peak / 1024 ** 2:8.1f} MB")
+
+
+def run(rows: int):
+    data = [['File name', 'File size', 'Last change time', 'Permissions']]
+    data.extend([f"file_{i:07}.txt", i * 37 % 100000, "01.01.25 12:00", "-rw-r--r--"] for i in range(rows))
+    measure("old", old_format_table, data)
+    measure("new", format_table, data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    run(parser.parse_args().rows)
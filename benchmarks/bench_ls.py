@@ -0,0 +1,76 @@
+"""
+бенчмарк команды ls -l на синтетической директории
+
+сравнивает старую реализацию (os.listdir + getsize + getmtime + Path.stat на каждый файл)
+с реализацией на os.scandir, считая время и количество вызовов os.stat
+
+запуск:
+    python benchmarks/bench_ls.py --files 100000
+"""
+import argparse
+import datetime
+import os
+import stat
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from commands.ls import LsCommand
+from src.utils.format_output import format_table
+
+
+def old_ls(path: Path):
+    """
+    реализация ls -l до перехода на os.scandir
+    """
+    output_list = [['File name', 'File size', 'Last change time', 'Permissions'], ]
+    for name in os.listdir(Path(path)):
+        file_path = Path(path, name)
+        file_size = os.path.getsize(file_path)
+        change_timestamp = os.path.getmtime(file_path)
+        file_change_time = datetime.datetime.fromtimestamp(change_timestamp).strftime('%d.%m.%y %H:%M')
+        permissions = stat.filemode(Path.stat(file_path).st_mode)
+        output_list.append([name, file_size, file_change_time, permissions])
+    print(format_table(output_list))
+
+
+def measure(name: str, func, path: Path):
+    """
+    запуск одной реализации с подсчетом вызовов os.stat и выводом в /dev/null
+    """
+    calls = 0
+    original_stat = os.stat
+
+    def counting_stat(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original_stat(*args, **kwargs)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull), patch("os.stat", counting_stat):
+        start = time.perf_counter()
+        func(path)
+        elapsed = time.perf_counter() - start
+    print(f"{name:>8}: {elapsed:8.3f} s  os.stat calls {calls}")
+
+
+def run(files: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        for i in range(files):
+            with open(path / f"file_{i:07}.txt", "wb") as file:
+                file.write(b"x" * (i % 100))
+        measure("old", old_ls, path)
+        # DirEntry.stat выполняет stat внутри C-кода, по одному на элемент, os.stat не вызывается
+        measure("scandir", lambda p: LsCommand().execute([str(p)], ['l']), path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100000)
+    run(parser.parse_args().files)
@@ -0,0 +1,52 @@
+"""
+бенчмарк перемещения множества файлов в директорию: shutil.move для каждого файла против MvCommand,
+который переименовывает файлы одного устройства подряд через os.rename
+
+запуск:
+    python benchmarks/bench_mv.py --files 100000
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+from commands.mv import MvCommand
+
+
+def create_files(directory: Path, count: int) -> list[str]:
+    directory.mkdir()
+    paths = []
+    for i in range(count):
+        path = directory / f"file{i:06d}.txt"
+        path.touch()
+        paths.append(str(path))
+    return paths
+
+
+def run(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = create_files(tmp / "shutil_src", count)
+        (tmp / "shutil_dst").mkdir()
+        start = time.perf_counter()
+        for path in paths:
+            shutil.move(path, tmp / "shutil_dst")
+        print(f"{'shutil.move per file':>24}: {time.perf_counter() - start:8.3f} s")
+
+        paths = create_files(tmp / "mv_src", count)
+        (tmp / "mv_dst").mkdir()
+        start = time.perf_counter()
+        MvCommand().execute([*paths, str(tmp / "mv_dst")], ["no-progress"])
+        print(f"{'mv batch rename':>24}: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100_000)
+    namespace = parser.parse_args()
+    run(namespace.files)
@@ -0,0 +1,90 @@
+"""
+бенчмарк запуска оболочки: время от старта интерпретатора до первого приглашения
+eager - прежний поиск команд, который импортирует все модули команд и создает их экземпляры,
+lazy - ShellCore.auto_discover_commands с манифестом, модули команд не импортируются
+каждый запуск - отдельный процесс python, выводится медиана; с --importtime дополнительно выводятся
+самые дорогие импорты каждого способа (python -X importtime)
+
+запуск:
+    python benchmarks/bench_startup.py --runs 30 --importtime
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# общая часть main.py до первого приглашения
+PRELUDE = """
+import logging
+from utils.console_info import get_info
+from src.core import ShellCore
+core = ShellCore(logging.getLogger())
+"""
+
+EAGER = PRELUDE + """
+import importlib
+from pathlib import Path
+from commands.base import BaseCommand
+for file_path in (Path('src') / 'commands').iterdir():
+    if file_path.suffix == '.py' and file_path.name not in ['__init__.py', 'base.py']:
+        module = importlib.import_module(f'.{file_path.stem}', package='commands')
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, type) and issubclass(attr, BaseCommand) and attr != BaseCommand:
+                core.register_command(attr())
+"""
+
+LAZY = PRELUDE + """
+core.auto_discover_commands()
+"""
+
+
+def measure(code: str, runs: int) -> float:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "src")])}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def import_times(code: str, top: int) -> list[tuple[int, str]]:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "src")])}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "): # только импорты верхнего уровня
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run(runs: int, importtime: bool):
+    measure(LAZY, 1) # первый запуск создает манифест
+    baseline = measure("pass", runs)
+    print(f"{'python -c pass':>24}: {baseline * 1000:8.1f} ms")
+    for label, code in (("eager discovery", EAGER), ("lazy discovery", LAZY)):
+        elapsed = measure(code, runs)
+        print(f"{label:>24}: {elapsed * 1000:8.1f} ms ({(elapsed - baseline) * 1000:.1f} ms over python)")
+        if importtime:
+            for cumulative, name in import_times(code, 8):
+                print(f"{'':>26}{cumulative / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--importtime", action="store_true", help="вывести самые дорогие импорты")
+    args = parser.parse_args()
+    run(args.runs, args.importtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from src.utils.stream import capture_output
 
 
 class BaseCommand(ABC):
@@ -12,3 +15,13 @@ class BaseCommand(ABC):
     def name(self):
         """абстрактное свойство для имени команды"""
         pass
+
+    def stream(self, args, options, stdin: Iterator[bytes] | None = None) -> Iterator[bytes]:
+        """
+        выполнение команды как части конвейера (cmd1 | cmd2): генератор блоков байт вывода
+        stdin - поток блоков байт от предыдущей команды (None, если команда первая)
+        генератор выполняется по мере того, как следующая команда запрашивает данные, поэтому поток
+        не накапливается в памяти, а закрытие генератора (head получил нужные строки) останавливает команду
+        по умолчанию команда не читает stdin, выполняется целиком, и ее вывод отдается одним блоком
+        """
+        yield capture_output(self.execute, args, options)
@@ -1,29 +1,226 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import os
+import codecs, io, locale, os, stat, sys
 from .base import BaseCommand
+from src.utils.parser import expand_globs, get_option_value, parse_size
+from src.utils.session import resolve
+
+CHUNK_SIZE = 1024 * 1024 # размер блока чтения по умолчанию (1 МБ)
+PREFETCH_DEPTH = 8 # сколько следующих файлов читается заранее
+PREFETCH_BUDGET = 64 * 1024 * 1024 # сколько байт могут занимать заранее прочитанные данные
+
+
+class _Prefetched:
+    """
+    заранее открытый файл: прочитанное начало и дескриптор для дочитывания остатка
+    """
+    __slots__ = ("head", "file")
+
+    def __init__(self, head: bytes, file):
+        self.head = head
+        self.file = file # None, если файл прочитан целиком
+
 
 class CatCommand(BaseCommand):
     """
     команда для вывода содержимого файлов
+
+    поддерживает несколько файлов и шаблоны, файлы выводятся в порядке аргументов
+    следующие файлы открываются и читаются заранее в пуле потоков (--prefetch=N),
+    объем заранее прочитанных данных ограничен (--budget=64M)
+    файл читается блоками фиксированного размера, поэтому потребление памяти не зависит от размера файла
+    по умолчанию байты пишутся напрямую в stdout без декодирования,
+    если stdout - файл или канал, то копирование выполняется ядром через os.sendfile
+    флаг --text включает вывод через текстовый слой stdout с декодированием
+    в конвейере без аргументов передает дальше поток предыдущей команды
     """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self._chunk_size = chunk_size
+
     @property
     def name(self):
         return "cat"
 
     def execute(self, args, options):
-        if args:
-            path = Path(args[0])
-        else:
+        if not args:
             raise SyntaxError(f"{self.name}: no arguments given")
-        if path.exists():
-            if os.access(path, os.R_OK):
-                if path.is_file():
-                    with open(path) as file:
-                        print(file.read())
-                else:
-                    raise FileNotFoundError(f"{self.name}: not a file: {str(path).split('/')[-1]}")
+        paths = [resolve(arg) for arg in expand_globs(args)]
+        depth, budget = self._prefetch_options(options)
+
+        output = getattr(sys.stdout, "buffer", None)
+        text = 'text' in options or output is None
+        if not text:
+            sys.stdout.flush() # текст, ранее записанный через print, должен оказаться перед содержимым файла
+
+        for prefetched in self._prefetch(paths, depth, max(budget // depth, 1)):
+            if text:
+                self._write_text(prefetched)
             else:
-                raise PermissionError(f"{self.name}: access denied")
+                self._write_bytes(prefetched, output)
+        if text:
+            sys.stdout.flush()
         else:
+            output.flush()
+
+    def stream(self, args, options, stdin=None):
+        """
+        cat в конвейере: содержимое файлов блоками, без аргументов - поток предыдущей команды без изменений
+        файл дочитывается только когда следующая команда запрашивает данные
+        """
+        if not args:
+            if stdin is None:
+                raise SyntaxError(f"{self.name}: no arguments given")
+            yield from stdin
+            return
+        paths = [resolve(arg) for arg in expand_globs(args)]
+        depth, budget = self._prefetch_options(options)
+        # заранее читается не больше одного блока файла: остальное может не понадобиться следующей команде
+        for prefetched in self._prefetch(paths, depth, max(min(budget // depth, self._chunk_size), 1)):
+            if prefetched.head:
+                yield prefetched.head
+            if prefetched.file is not None:
+                while chunk := prefetched.file.read(self._chunk_size):
+                    yield chunk
+
+    def _prefetch_options(self, options: list[str]) -> tuple[int, int]:
+        """
+        глубина и бюджет предварительного чтения из флагов --prefetch и --budget
+        Returns:
+            tuple[int, int]: глубина (не меньше 1) и бюджет в байтах
+        """
+        try:
+            depth = int(get_option_value(options, "prefetch", PREFETCH_DEPTH))
+            budget = parse_size(get_option_value(options, "budget", str(PREFETCH_BUDGET)))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid prefetch depth or budget")
+        return max(depth, 1), budget
+
+    def _open(self, path: Path, head_size: int) -> _Prefetched:
+        """
+        проверка и открытие файла с чтением его начала, выполняется в потоке пула
+        Args:
+            path (Path): путь до файла
+            head_size (int): сколько байт прочитать заранее
+        Returns:
+            _Prefetched: начало файла и открытый дескриптор, если файл прочитан не полностью
+        """
+        try:
+            mode = os.stat(path).st_mode # один stat вместо отдельных проверок exists и is_file
+        except FileNotFoundError:
             raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+        if not os.access(path, os.R_OK):
+            raise PermissionError(f"{self.name}: access denied")
+        if not stat.S_ISREG(mode):
+            raise FileNotFoundError(f"{self.name}: not a file: {str(path).split('/')[-1]}")
+
+        file = open(path, 'rb')
+        try:
+            head = file.read(head_size)
+            if len(head) < head_size:
+                file.close()
+                file = None
+        except BaseException:
+            file.close()
+            raise
+        return _Prefetched(head, file)
+
+    def _prefetch(self, paths: list[Path], depth: int, head_size: int):
+        """
+        генератор заранее открытых файлов в порядке аргументов
+        в работе одновременно не больше depth файлов, поэтому память ограничена depth * head_size
+        Args:
+            paths (list[Path]): пути до файлов
+            depth (int): глубина предварительного чтения
+            head_size (int): сколько байт каждого файла читать заранее
+        Yields:
+            _Prefetched: очередной файл
+        """
+        pending = deque()
+        remaining = iter(paths)
+        with ThreadPoolExecutor(max_workers=min(depth, len(paths))) as pool:
+            try:
+                for path in remaining:
+                    pending.append(pool.submit(self._open, path, head_size))
+                    if len(pending) >= depth:
+                        break
+                while pending:
+                    prefetched = pending.popleft().result()
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        pending.append(pool.submit(self._open, next_path, head_size))
+                    try:
+                        yield prefetched
+                    finally:
+                        if prefetched.file is not None:
+                            prefetched.file.close()
+            finally:
+                # при ошибке закрываем уже открытые файлы и отменяем остальные
+                for future in pending:
+                    if not future.cancel() and future.exception() is None:
+                        if future.result().file is not None:
+                            future.result().file.close()
+
+    def _write_text(self, prefetched: _Prefetched):
+        """
+        вывод файла блоками через текстовый stdout
+        Args:
+            prefetched (_Prefetched): заранее открытый файл
+        """
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(locale.getpreferredencoding(False))(), translate=True)
+        sys.stdout.write(decoder.decode(prefetched.head))
+        if prefetched.file is not None:
+            while chunk := prefetched.file.read(self._chunk_size):
+                sys.stdout.write(decoder.decode(chunk))
+        sys.stdout.write(decoder.decode(b'', final=True))
+
+    def _write_bytes(self, prefetched: _Prefetched, output):
+        """
+        вывод сырых байтов файла в бинарный буфер stdout
+        остаток файла сначала пробует отправить через os.sendfile, при неудаче копирует блоками
+        Args:
+            prefetched (_Prefetched): заранее открытый файл
+            output: бинарный буфер stdout
+        """
+        output.write(prefetched.head)
+        file = prefetched.file
+        if file is not None:
+            output.flush()
+            if not self._sendfile(file, output):
+                while chunk := file.read(self._chunk_size):
+                    output.write(chunk)
+
+    def _sendfile(self, file, output) -> bool:
+        """
+        копирование файла с текущей позиции в stdout средствами ядра без участия буферов python
+        используется только если stdout - обычный файл или канал
+        Args:
+            file: открытый на чтение бинарный файл
+            output: бинарный буфер stdout
+        Returns:
+            bool: True если файл полностью отправлен, False если нужен обычный способ
+        """
+        if not hasattr(os, "sendfile"):
+            return False
+        try:
+            out_fd = output.fileno()
+            in_fd = file.fileno()
+            mode = os.fstat(out_fd).st_mode
+            offset = start = file.tell()
+        except (OSError, ValueError, AttributeError): # stdout подменен (например, в тестах)
+            return False
+        if not (stat.S_ISREG(mode) or stat.S_ISFIFO(mode)):
+            return False
 
+        while True:
+            try:
+                sent = os.sendfile(out_fd, in_fd, offset, self._chunk_size)
+            except OSError:
+                if offset == start: # sendfile не поддерживается для этой пары дескрипторов
+                    return False
+                raise
+            if sent == 0:
+                return True
+            offset += sent
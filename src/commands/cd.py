@@ -1,12 +1,16 @@
 import os
 from pathlib import Path
 from .base import BaseCommand
+from src.utils.session import current_session, resolve
 
 
 class CdCommand(BaseCommand):
     """
     команда для изменения рабочей директории
+    в ядре меняется директория сеанса (см. Session), а не процесса, поэтому фоновые задачи
+    и другие сеансы в том же процессе не затрагиваются
     """
+
     @property
     def name(self):
         return "cd"
@@ -14,13 +18,15 @@ class CdCommand(BaseCommand):
     def execute(self, args, options):
         if len(args) > 1:
             raise SyntaxError(f"{self.name}: given more arguments than required")
+        session = current_session()
+        chdir = os.chdir if session is None else session.chdir
         if not args or args[0] == '~':
-            os.chdir(Path.home())
+            chdir(Path.home())
         else:
-            path = Path(args[0])
+            path = resolve(args[0])
             if path.exists():
                 if not path.is_file():
-                    os.chdir(path)
+                    chdir(args[0])
                 else:
                     raise NotADirectoryError(f"{self.name}: not a directory: {str(path).split('/')[-1]}")
             else:
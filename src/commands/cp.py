@@ -1,32 +1,353 @@
-import shutil
+import hashlib, os, shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from .base import BaseCommand
+from src.utils.fastcopy import REFLINK_MODES, RESUME_CHUNK_SIZE, copy_file, copy_file_resumable
+from src.utils.format_output import human_size
+from src.utils.parser import get_option_value, parse_size
+from src.utils.progress import Progress, progress_from_options
+from src.utils.ratelimit import RateLimiter, limiter_from_options, run_low_priority
+from src.utils.session import resolve
+
+KERNEL_COPY_MIN_SIZE = 1024 * 1024 # с какого размера файл копируется силами ядра, а не через copy2
 
 class CpCommand(BaseCommand):
     """
     команда для копирования файлов или директорий
 
     поддерживает рекурсивное копирование директорий
+    с флагом -j N (или --jobs=N) файлы копируются параллельно в N потоках:
+    дерево обходится один раз, директории создаются до копирования их файлов,
+    ошибки отдельных файлов собираются и выводятся в конце, не прерывая копирование
+    большие файлы копируются силами ядра (reflink, copy_file_range) с сохранением дыр разреженных файлов,
+    --reflink=auto|always|never управляет клонированием и включает этот способ для файлов любого размера
+    --update (--sync) копирует только файлы, отличающиеся размером или временем изменения
+    (с --checksum - содержимым), --delete удаляет из назначения элементы, которых нет в источнике
+    --resume копирует файл блоками (--chunk-size=SIZE) с контрольными точками,
+    поэтому прерванное копирование продолжается с последнего проверенного блока
+    --bwlimit=SIZE ограничивает суммарную скорость копирования (байт в секунду), --iops=N - число операций в секунду,
+    --nice выполняет копирование с наименьшим приоритетом процессора и ввода-вывода
+    прогресс (объем, файлы, скорость, оставшееся время) выводится в stderr, если он терминал, или с --progress,
+    --no-scan пропускает предварительный подсчет объема, счетчики последнего завершенного копирования
+    доступны в self.progress (во время выполнения счетчики передаются по цепочке вызовов, поэтому
+    одновременные фоновые задачи с одним экземпляром команды не смешивают их)
     """
+    def __init__(self):
+        self.progress: Progress | None = None
+
     @property
     def name(self):
         return "cp"
 
     def execute(self, args, options):
+        if 'nice' in options:
+            return run_low_priority(self.execute, args, [option for option in options if option != 'nice'])
+        args = list(args)
+        try:
+            jobs = int(args.pop(0)) if 'j' in options and args else None
+            jobs = get_option_value(options, "jobs", jobs)
+            jobs = int(jobs) if jobs is not None else None
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid number of jobs")
+        if jobs is not None and jobs < 1:
+            raise SyntaxError(f"{self.name}: invalid number of jobs")
+        try:
+            chunk_size = parse_size(get_option_value(options, "chunk-size", str(RESUME_CHUNK_SIZE)))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid chunk size")
+        if chunk_size < 1:
+            raise SyntaxError(f"{self.name}: invalid chunk size")
+        reflink = get_option_value(options, "reflink")
+        if reflink is not None and reflink not in REFLINK_MODES:
+            raise SyntaxError(f"{self.name}: invalid reflink mode: {reflink}")
+        try:
+            limiter = limiter_from_options(options)
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid bandwidth or iops limit")
+
         if len(args) > 2:
             raise SyntaxError(f"{self.name}: given more arguments than required")
         elif len(args) < 2:
             raise SyntaxError(f"{self.name}: given less arguments than required")
         else:
-            src = Path(args[0])
-            dst = Path(args[1])
-            if 'r' in options:
-                if src.exists():
-                    shutil.copytree(src, dst / src.name, dirs_exist_ok=True)
+            src = resolve(args[0])
+            dst = resolve(args[1])
+            progress = progress_from_options(self.name, [src] if src.exists() else [], options)
+            try:
+                self._copy(src, dst, options, jobs, chunk_size, reflink, limiter, progress)
+            finally:
+                progress.finish()
+                self.progress = progress
+
+    def _copy(self, src: Path, dst: Path, options: list[str], jobs: int | None, chunk_size: int,
+              reflink: str | None, limiter: RateLimiter | None, progress: Progress):
+        """
+        копирование после разбора аргументов
+        Args:
+            src (Path): исходный путь
+            dst (Path): путь назначения
+            options (list[str]): флаги команды
+            jobs (int | None): количество потоков, None - не задано
+            chunk_size (int): размер блока возобновляемого копирования
+            reflink (str | None): режим reflink
+            limiter (RateLimiter | None): ограничитель скорости
+            progress (Progress): счетчики прогресса этого копирования
+        """
+        if 'r' in options:
+            if src.exists():
+                update = 'update' in options or 'sync' in options
+                delete = 'delete' in options
+                if (jobs is not None or update or delete) and src.is_dir():
+                    stats = self._copy_tree(src, dst / src.name, jobs or 1, reflink,
+                                            update, 'checksum' in options, delete, limiter, progress)
+                    if update or delete:
+                        progress.finish()
+                        print(f"{self.name}: copied {stats['copied_files']} files "
+                              f"({human_size(stats['copied_bytes'])}), skipped {stats['skipped_files']} files "
+                              f"({human_size(stats['skipped_bytes'])}), deleted {stats['deleted']} items")
                 else:
-                    raise FileNotFoundError(f"{self.name}: no such file or directory: {str(src).split('/')[-1]}")
+                    shutil.copytree(src, dst / src.name, dirs_exist_ok=True,
+                                    copy_function=lambda s, d: self._copy_one(s, d, reflink, limiter, progress))
             else:
-                if src.exists() and src.is_file():
-                    shutil.copy2(src, dst)
+                raise FileNotFoundError(f"{self.name}: no such file or directory: {str(src).split('/')[-1]}")
+        else:
+            if src.exists() and src.is_file():
+                if 'resume' in options:
+                    resumed = copy_file_resumable(src, dst, chunk_size, limiter, progress)
+                    progress.add(files=1)
+                    if resumed:
+                        progress.finish()
+                        print(f"{self.name}: resumed {src.name} from {human_size(resumed)}")
+                else:
+                    self._copy_one(src, dst, reflink, limiter, progress)
+            else:
+                raise FileNotFoundError(f"{self.name}: {str(src).split('/')[-1]}: is a directory")
+
+    def _copy_tree(self, src: Path, dst: Path, jobs: int, reflink: str | None = None,
+                   update: bool = False, checksum: bool = False, delete: bool = False,
+                   limiter: RateLimiter | None = None, progress: Progress | None = None) -> dict:
+        """
+        параллельное рекурсивное копирование директории
+        главный поток обходит дерево и создает директории, файлы копируются через shutil.copy2 в пуле потоков
+        права и время изменения директорий копируются в конце, от вложенных к внешним,
+        чтобы запись файлов их не изменила
+        в режиме update файл пропускается, если в назначении уже есть файл с тем же размером и временем изменения
+        (с checksum - с тем же содержимым), с delete удаляются элементы назначения, которых нет в источнике
+        Args:
+            src (Path): исходная директория
+            dst (Path): путь новой директории
+            jobs (int): количество потоков
+            reflink (str | None): режим reflink
+            update (bool): копировать только измененные файлы
+            checksum (bool): сравнивать содержимое файлов вместо времени изменения
+            delete (bool): удалять лишние элементы назначения
+            limiter (RateLimiter | None): общий для всех потоков ограничитель скорости
+            progress (Progress | None): счетчики прогресса
+        Returns:
+            dict: количество и объем скопированных и пропущенных файлов, количество удаленных элементов
+        Raises:
+            OSError: если часть элементов не удалось скопировать (после копирования остальных)
+        """
+        stats = {"copied_files": 0, "copied_bytes": 0, "skipped_files": 0, "skipped_bytes": 0, "deleted": 0}
+        errors = []
+        directories = []
+        futures = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            stack = [(src, dst)]
+            while stack:
+                src_dir, dst_dir = stack.pop()
+                try:
+                    # содержимое назначения читается одним scandir вместо stat на каждый файл
+                    existing = {}
+                    if update or delete:
+                        try:
+                            with os.scandir(dst_dir) as entries:
+                                existing = {entry.name: entry for entry in entries}
+                        except FileNotFoundError:
+                            pass
+                    os.makedirs(dst_dir, exist_ok=True)
+
+                    with os.scandir(src_dir) as entries:
+                        for entry in entries:
+                            target = dst_dir / entry.name
+                            old = existing.pop(entry.name, None)
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((Path(entry.path), target))
+                            elif entry.is_symlink() and (entry.is_dir() or not os.path.exists(entry.path)):
+                                # ссылка на директорию копируется ссылкой, чтобы не попасть в цикл,
+                                # битая ссылка - тоже ссылкой, так как копировать нечего
+                                futures.append(pool.submit(self._copy_link, entry.path, target))
+                            else:
+                                try:
+                                    size = entry.stat().st_size
+                                except OSError as e: # ошибка одного элемента не прерывает обход директории
+                                    errors.append(f"{entry.path}: {e.strerror or e}")
+                                    continue
+                                if update and old is not None and not checksum and self._same_stat(entry, old):
+                                    stats["skipped_files"] += 1
+                                    stats["skipped_bytes"] += size
+                                    self._count(progress, size)
+                                    continue
+                                compare = update and checksum and old is not None
+                                futures.append(pool.submit(self._copy_file, entry.path, target, reflink, compare, limiter,
+                                                           progress))
+
+                    if delete:
+                        for old in existing.values():
+                            errors.extend(self._delete(old))
+                            stats["deleted"] += 1
+                except OSError as e:
+                    errors.append(f"{src_dir}: {e.strerror or e}")
+                    continue
+                directories.append((src_dir, dst_dir))
+
+            for future in futures:
+                copied, size, error = future.result()
+                if error is not None:
+                    errors.append(error)
+                elif copied:
+                    stats["copied_files"] += 1
+                    stats["copied_bytes"] += size
                 else:
-                    raise FileNotFoundError(f"{self.name}: {str(src).split('/')[-1]}: is a directory")
+                    stats["skipped_files"] += 1
+                    stats["skipped_bytes"] += size
+
+        for src_dir, dst_dir in reversed(directories):
+            try:
+                shutil.copystat(src_dir, dst_dir)
+            except OSError as e:
+                errors.append(f"{src_dir}: {e.strerror or e}")
+
+        if errors:
+            raise OSError(f"{self.name}: failed to copy {len(errors)} items:\n" + "\n".join(errors))
+        return stats
+
+    def _same_stat(self, src: os.DirEntry, dst: os.DirEntry) -> bool:
+        """
+        быстрая проверка, что файл назначения не изменился: тот же размер и время изменения с точностью до секунды
+        (copy2 переносит время изменения, а некоторые файловые системы хранят его с точностью до секунды)
+        Args:
+            src (os.DirEntry): исходный файл
+            dst (os.DirEntry): файл назначения
+        Returns:
+            bool: True если файл можно не копировать
+        """
+        try:
+            if not dst.is_file():
+                return False
+            src_stat, dst_stat = src.stat(), dst.stat()
+        except OSError:
+            return False
+        return src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime)
+
+    def _same_content(self, src: str, dst: Path) -> bool:
+        """
+        сравнение содержимого файлов по размеру и хэшу blake2b
+        Args:
+            src (str): путь до исходного файла
+            dst (Path): путь до файла назначения
+        Returns:
+            bool: True если содержимое совпадает
+        """
+        try:
+            if not dst.is_file() or os.path.getsize(src) != os.path.getsize(dst):
+                return False
+            hashes = []
+            for path in (src, dst):
+                with open(path, 'rb') as file:
+                    hashes.append(hashlib.file_digest(file, hashlib.blake2b).digest())
+        except OSError:
+            return False
+        return hashes[0] == hashes[1]
+
+    def _delete(self, entry: os.DirEntry) -> list[str]:
+        """
+        удаление лишнего элемента назначения в режиме --delete
+        Args:
+            entry (os.DirEntry): элемент назначения
+        Returns:
+            list[str]: описание ошибок
+        """
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+        except OSError as e:
+            return [f"{entry.path}: {e.strerror or e}"]
+        return []
+
+    def _copy_one(self, src: str | Path, dst: str | Path, reflink: str | None = None,
+                  limiter: RateLimiter | None = None, progress: Progress | None = None):
+        """
+        копирование одного файла с метаданными
+        маленькие файлы копируются через shutil.copy2, большие, при заданном --reflink
+        или при ограничении скорости - силами ядра
+        Args:
+            src (str | Path): путь до исходного файла
+            dst (str | Path): путь до копии или директории
+            reflink (str | None): режим reflink, None - не задан
+            limiter (RateLimiter | None): ограничитель скорости, None - без ограничения
+            progress (Progress | None): счетчики прогресса, None - без учета
+        """
+        size = os.path.getsize(src)
+        if reflink is None and limiter is None and size < KERNEL_COPY_MIN_SIZE:
+            shutil.copy2(src, dst)
+            self._count(progress, size)
+        else:
+            copy_file(src, dst, reflink or "auto", limiter=limiter, progress=progress)
+            self._count(progress, 0)
+        return dst
+
+    def _count(self, progress: Progress | None, size: int):
+        """
+        учет завершенного (скопированного или пропущенного) файла в счетчиках прогресса
+        Args:
+            progress (Progress | None): счетчики прогресса
+            size (int): сколько байт файла еще не учтено
+        """
+        if progress is not None:
+            progress.add(size, files=1)
+
+    def _copy_file(self, src: str, dst: Path, reflink: str | None = None,
+                   compare: bool = False, limiter: RateLimiter | None = None,
+                   progress: Progress | None = None) -> tuple[bool, int, str | None]:
+        """
+        копирование одного файла с метаданными, выполняется в потоке пула
+        Args:
+            src (str): путь до исходного файла
+            dst (Path): путь до копии
+            reflink (str | None): режим reflink
+            compare (bool): не копировать, если содержимое копии совпадает
+            limiter (RateLimiter | None): ограничитель скорости
+            progress (Progress | None): счетчики прогресса
+        Returns:
+            tuple[bool, int, str | None]: был ли файл скопирован, его размер и описание ошибки или None
+        """
+        try:
+            size = os.path.getsize(src)
+            if compare and self._same_content(src, dst):
+                self._count(progress, size)
+                return False, size, None
+            self._copy_one(src, dst, reflink, limiter, progress)
+        except OSError as e:
+            return False, 0, f"{src}: {e.strerror or e}"
+        return True, size, None
+
+    def _copy_link(self, src: str, dst: Path) -> tuple[bool, int, str | None]:
+        """
+        копирование символической ссылки как ссылки, выполняется в потоке пула
+        Args:
+            src (str): путь до исходной ссылки
+            dst (Path): путь до копии
+        Returns:
+            tuple[bool, int, str | None]: как у _copy_file - была ли ссылка скопирована,
+                                          размер (0) и описание ошибки или None
+        """
+        try:
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            os.symlink(os.readlink(src), dst)
+        except OSError as e:
+            return False, 0, f"{src}: {e.strerror or e}"
+        return True, 0, None
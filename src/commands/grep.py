@@ -0,0 +1,97 @@
+import os
+import re
+from functools import partial
+from itertools import chain
+from pathlib import Path
+
+from .base import BaseCommand
+from src.utils.parser import expand_globs
+from src.utils.session import open_file, resolve
+from src.utils.stream import STREAM_CHUNK_SIZE, write_chunks
+
+
+class GrepCommand(BaseCommand):
+    """
+    команда для поиска строк по регулярному выражению
+
+    ищет в файлах (поддерживаются шаблоны) или, в конвейере без файлов, в потоке предыдущей команды
+    файлы и поток читаются блоками и обрабатываются построчно, поэтому память не зависит от их размера
+    флаги: -i без учета регистра, -v строки без совпадений, -n номера строк, -c только количество строк
+    при нескольких файлах перед строкой выводится имя файла
+    """
+
+    @property
+    def name(self):
+        return "grep"
+
+    def execute(self, args, options):
+        write_chunks(self.stream(args, options))
+
+    def stream(self, args, options, stdin=None):
+        if not args:
+            raise SyntaxError(f"{self.name}: given less arguments than required")
+        try:
+            pattern = re.compile(os.fsencode(args[0]), re.IGNORECASE if 'i' in options else 0)
+        except re.error:
+            raise SyntaxError(f"{self.name}: invalid pattern: {args[0]}")
+        if len(args) == 1:
+            if stdin is None:
+                raise SyntaxError(f"{self.name}: given less arguments than required")
+            yield from self._search(pattern, stdin, options, b'')
+            return
+        paths = expand_globs(args[1:])
+        for path in paths:
+            self._check(resolve(path))
+        for path in paths:
+            prefix = os.fsencode(path) + b':' if len(paths) > 1 else b''
+            with open_file(path, 'rb') as file:
+                yield from self._search(pattern, iter(partial(file.read, STREAM_CHUNK_SIZE), b''), options, prefix)
+
+    def _check(self, path: Path):
+        """
+        проверка, что путь - доступный для чтения файл
+        Args:
+            path (Path): путь до файла
+        """
+        if not path.exists():
+            raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+        if not os.access(path, os.R_OK):
+            raise PermissionError(f"{self.name}: access denied")
+        if not path.is_file():
+            raise FileNotFoundError(f"{self.name}: not a file: {str(path).split('/')[-1]}")
+
+    def _search(self, pattern: re.Pattern, chunks, options: list[str], prefix: bytes):
+        """
+        генератор блоков с подходящими строками потока
+        найденные строки каждого блока отдаются сразу, поэтому следующая команда получает их без задержки,
+        а head после нужного количества строк останавливает чтение
+        Args:
+            pattern (re.Pattern): регулярное выражение
+            chunks: итератор блоков байт
+            options (list[str]): флаги команды
+            prefix (bytes): префикс строки (имя файла)
+        Yields:
+            bytes: блок найденных строк или количество строк для -c
+        """
+        invert = 'v' in options
+        numbers = 'n' in options
+        search = pattern.search
+        count = 0
+        number = 0 # номер последней обработанной строки
+        rest = b''
+        for chunk in chain(chunks, [None]):
+            if chunk is None: # конец потока: последняя строка без перевода строки
+                lines = [rest] if rest else []
+            else:
+                lines = (rest + chunk).split(b'\n')
+                rest = lines.pop()
+            found = [(number + i, line) for i, line in enumerate(lines, 1) if (search(line) is None) == invert]
+            number += len(lines)
+            count += len(found)
+            if found and 'c' not in options:
+                if numbers:
+                    yield b''.join(b'%s%d:%s\n' % (prefix, i, line) for i, line in found)
+                else:
+                    yield b''.join(prefix + line + b'\n' for _, line in found)
+        if 'c' in options:
+            yield prefix + str(count).encode() + b'\n'
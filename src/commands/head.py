@@ -0,0 +1,119 @@
+import os
+from functools import partial
+
+from .base import BaseCommand
+from src.utils.output import write_bytes
+from src.utils.parser import get_option_value
+from src.utils.session import open_file, resolve
+
+BLOCK_SIZE = 64 * 1024 # размер блока чтения
+DEFAULT_LINES = 10
+
+
+class HeadCommand(BaseCommand):
+    """
+    команда для вывода первых строк файла
+
+    файл читается блоками только до N-й строки, поэтому время работы зависит от размера вывода, а не файла
+    в конвейере без аргумента читает поток предыдущей команды и останавливает ее после N-й строки
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self._block_size = block_size
+
+    @property
+    def name(self):
+        return "head"
+
+    def execute(self, args, options):
+        count, path = self._parse(args, options)
+        if path is None:
+            raise SyntaxError(f"{self.name}: given less arguments than required")
+        with self._open(path) as file:
+            self._write_head(file, count)
+
+    def stream(self, args, options, stdin=None):
+        """
+        head в конвейере: первые строки файла или, без аргумента, потока предыдущей команды
+        после нужной строки поток больше не запрашивается, и конвейер закрывает предыдущие команды
+        """
+        count, path = self._parse(args, options)
+        if path is None:
+            if stdin is None:
+                raise SyntaxError(f"{self.name}: given less arguments than required")
+            yield from self._head(stdin, count)
+            return
+        with self._open(path) as file:
+            yield from self._head(iter(partial(file.read, self._block_size), b''), count)
+
+    def _parse(self, args: list[str], options: list[str]) -> tuple[int, str | None]:
+        """
+        разбор количества строк (-n N или --lines=N) и пути
+        Returns:
+            tuple[int, str | None]: количество строк и путь до файла (None, если путь не указан)
+        """
+        args = list(args)
+        try:
+            count = int(args.pop(0)) if 'n' in options and args else DEFAULT_LINES
+            count = int(get_option_value(options, "lines", count))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid number of lines")
+        if count < 0:
+            raise SyntaxError(f"{self.name}: invalid number of lines")
+        if len(args) > 1:
+            raise SyntaxError(f"{self.name}: given more arguments than required")
+        return count, args[0] if args else None
+
+    def _open(self, arg: str):
+        """
+        проверка и открытие файла на чтение относительно директории сеанса
+        Args:
+            arg (str): путь из аргументов
+        Returns:
+            открытый бинарный файл
+        """
+        path = resolve(arg)
+        if path.exists():
+            if os.access(path, os.R_OK):
+                if path.is_file():
+                    return open_file(arg, 'rb')
+                else:
+                    raise FileNotFoundError(f"{self.name}: not a file: {str(path).split('/')[-1]}")
+            else:
+                raise PermissionError(f"{self.name}: access denied")
+        else:
+            raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+
+    def _write_head(self, file, count: int):
+        """
+        вывод первых count строк файла, чтение прекращается сразу после последней нужной строки
+        Args:
+            file: открытый на чтение бинарный файл
+            count (int): количество строк
+        """
+        for block in self._head(iter(partial(file.read, self._block_size), b''), count):
+            write_bytes(block)
+
+    def _head(self, chunks, count: int):
+        """
+        генератор первых count строк потока блоков, следующий блок запрашивается только если строк не хватает
+        Args:
+            chunks: итератор блоков байт
+            count (int): количество строк
+        Yields:
+            bytes: блок с очередными строками
+        """
+        if count <= 0:
+            return
+        for block in chunks:
+            newlines = block.count(b'\n')
+            if newlines >= count:
+                # обрезаем блок по count-й строке
+                end = -1
+                for _ in range(count):
+                    end = block.index(b'\n', end + 1)
+                block = block[:end + 1]
+            count -= newlines
+            yield block
+            if count <= 0:
+                return
@@ -1,8 +1,49 @@
-import os, stat, datetime
+import os, stat, datetime, heapq
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 
 from .base import BaseCommand
-from src.utils.format_output import format_table
+from src.utils.format_output import format_table, human_size, iter_table
+from src.utils.parser import get_option_value
+from src.utils.session import resolve
+from src.utils.stream import encode_lines
+from src.utils.walker import DEFAULT_WORKERS, entry_stat, walk_parallel
+
+HEADER = ['File name', 'File size', 'Last change time', 'Permissions']
+ALIGN = "<><<" # размер выравнивается по правому краю
+STREAM_SAMPLE_SIZE = 256 # по скольким строкам вычисляется ширина столбцов в потоковом режиме
+
+# ключи сортировки для пар (имя, stat) и порядок по умолчанию (True - по убыванию)
+SORT_KEYS = {
+    "name": (lambda item: item[0], False),
+    "size": (lambda item: item[1].st_size, True),
+    "time": (lambda item: item[1].st_mtime, True),
+}
+
+
+@lru_cache(maxsize=4096)
+def _format_minute(minute: int) -> str:
+    """
+    форматирование времени изменения с точностью до минуты
+    результат кэшируется, так как у файлов в одной директории время изменения обычно совпадает до минуты
+    Args:
+        minute (int): время в минутах от начала эпохи
+    Returns:
+        str: время в формате дд.мм.гг чч:мм
+    """
+    return datetime.datetime.fromtimestamp(minute * 60).strftime('%d.%m.%y %H:%M')
+
+
+def format_mtime(timestamp: float) -> str:
+    """
+    форматирование времени изменения файла через кэш по минутам
+    Args:
+        timestamp (float): время изменения в секундах от начала эпохи
+    Returns:
+        str: время в формате дд.мм.гг чч:мм
+    """
+    return _format_minute(int(timestamp // 60))
 
 
 class LsCommand(BaseCommand):
@@ -10,34 +51,218 @@ class LsCommand(BaseCommand):
     команда для вывода содержимого директории
 
     поддерживает простой и подробный вывод информации о файлах в директории
+    подробный вывод построен на os.scandir: для каждого элемента выполняется один stat
+    с флагом --stream строки выводятся по мере чтения директории без накопления всего списка,
+    ширина столбцов подробного вывода вычисляется по первым --sample=N строкам
+    флаг -R выводит содержимое поддиректорий, которые читаются параллельно в --workers=N потоках,
+    глубина ограничивается через --depth=N
+    сортировка: -S по размеру, -t по времени изменения, --sort=name|size|time, -r в обратном порядке
+    --top=N выводит только N первых элементов, выбирая их через кучу за O(n log N) без полной сортировки
+    флаг -h выводит размеры в читаемом виде (1.5K, 12M)
+    в конвейере простой и потоковый вывод передаются следующей команде по мере чтения директории
     """
     @property
     def name(self):
         return "ls"
 
     def execute(self, args, options):
+        path = self._directory(args)
+        sort = self._sort_name(options)
+        if 'R' in options:
+            self._print_recursive(path, options, Path(args[0]) if args else Path('.'))
+        elif sort is not None:
+            self._print_sorted(path, options, sort)
+        elif 'stream' in options:
+            self._print_stream(path, options)
+        elif 'l' in options:
+            print(format_table([HEADER, *self._detailed_rows(path, 'h' in options)], ALIGN))
+        else:
+            print('\n'.join(os.listdir(path)))
+
+    def stream(self, args, options, stdin=None):
+        """
+        ls в конвейере: простой и потоковый (--stream) вывод отдается по мере чтения директории,
+        остальные режимы (сортировка, -R, подробный вывод без --stream) выполняются целиком
+        """
+        path = self._directory(args)
+        if 'R' in options or self._sort_name(options) is not None or ('l' in options and 'stream' not in options):
+            yield from super().stream(args, options, stdin)
+        elif 'l' in options:
+            yield from encode_lines(iter_table(chain([HEADER], self._detailed_rows(path, 'h' in options)),
+                                               self._sample_size(options), ALIGN))
+        else:
+            with os.scandir(path) as entries:
+                yield from encode_lines(entry.name for entry in entries)
+
+    def _directory(self, args: list[str]) -> Path:
+        """
+        проверка пути до директории из аргументов
+        Returns:
+            Path: путь до директории относительно директории сеанса (по умолчанию - она сама)
+        """
         if len(args) > 1:
             raise SyntaxError(f"{self.name}: given more arguments than required")
         if args:
-            path = Path(args[0])
+            path = resolve(args[0])
         else:
-            path = Path('.')
+            path = resolve('.')
         if path.exists():
             if not path.is_file():
-                if 'l' in options:
-                    output_list = [['File name', 'File size', 'Last change time', 'Permissions'], ]
-                    for name in os.listdir(Path(path)):  # имя размер дата_изменения права_доступа
-                        file_path = Path(path, name)
-                        file_size = os.path.getsize(file_path)
-                        change_timestamp = os.path.getmtime(file_path)
-                        file_change_time = datetime.datetime.fromtimestamp(change_timestamp).strftime('%d.%m.%y %H:%M')
-                        permissions = stat.filemode(Path.stat(file_path).st_mode)
-                        output_list.append([name, file_size, file_change_time, permissions])
-                    print(format_table(output_list))
-
-                else:
-                    print('\n'.join(os.listdir(path)))
+                return path
             else:
                 raise NotADirectoryError(f"{self.name}: not a directory: {str(path).split('/')[-1]}")
         else:
             raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+
+    def _sample_size(self, options: list[str]) -> int:
+        """
+        количество строк для вычисления ширины столбцов потокового вывода (--sample=N)
+        """
+        try:
+            return int(get_option_value(options, "sample", STREAM_SAMPLE_SIZE))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid sample size")
+
+    def _sort_name(self, options: list[str]) -> str | None:
+        """
+        определение ключа сортировки по флагам
+        Args:
+            options (list[str]): флаги команды
+        Returns:
+            str | None: имя ключа из SORT_KEYS или None, если сортировка не нужна
+        """
+        sort = get_option_value(options, "sort")
+        if sort is None:
+            if 'S' in options:
+                sort = "size"
+            elif 't' in options:
+                sort = "time"
+            elif 'r' in options or get_option_value(options, "top") is not None:
+                sort = "name"
+        if sort is not None and sort not in SORT_KEYS:
+            raise SyntaxError(f"{self.name}: invalid sort key: {sort}")
+        return sort
+
+    def _print_sorted(self, path: Path, options: list[str], sort: str):
+        """
+        отсортированный вывод директории
+        используется stat, полученный при чтении директории, повторный stat для ключа не выполняется
+        при сортировке по имени без подробного вывода stat не нужен совсем
+        Args:
+            path (Path): путь до директории
+            options (list[str]): флаги команды
+            sort (str): ключ сортировки
+        """
+        try:
+            top = get_option_value(options, "top")
+            top = int(top) if top is not None else None
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid top value")
+        if top is not None and top < 0:
+            raise SyntaxError(f"{self.name}: invalid top value")
+
+        if sort == "name" and 'l' not in options:
+            entries = ((name, None) for name in os.listdir(path))
+        else:
+            entries = self._scan(path)
+        key, descending = SORT_KEYS[sort]
+        descending ^= 'r' in options
+
+        if top is not None:
+            # куча размера top: O(n log top) по времени и O(top) по памяти
+            selected = (heapq.nlargest if descending else heapq.nsmallest)(top, entries, key=key)
+        else:
+            selected = sorted(entries, key=key, reverse=descending)
+
+        if 'l' in options:
+            human = 'h' in options
+            print(format_table([HEADER, *(self._row(name, entry_stat, human) for name, entry_stat in selected)], ALIGN))
+        else:
+            print('\n'.join(name for name, _ in selected))
+
+    def _print_recursive(self, path: Path, options: list[str], shown: Path):
+        """
+        рекурсивный вывод содержимого директории и всех поддиректорий в порядке обхода в глубину
+        Args:
+            path (Path): путь до директории
+            options (list[str]): флаги команды
+            shown (Path): путь до директории в том виде, в котором он указан в аргументах (для заголовков)
+        """
+        try:
+            max_depth = get_option_value(options, "depth")
+            max_depth = int(max_depth) if max_depth is not None else None
+            workers = int(get_option_value(options, "workers", DEFAULT_WORKERS))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid depth or number of workers")
+        if (max_depth is not None and max_depth < 1) or workers < 1:
+            raise SyntaxError(f"{self.name}: invalid depth or number of workers")
+
+        detailed = 'l' in options # stat элементов получают потоки обхода
+        first = True
+        for dir_path, _, listing in walk_parallel(path, max_depth, workers, with_stat=detailed):
+            if not first:
+                print()
+            first = False
+            print(f"{shown / dir_path.relative_to(path)}:")
+            if listing is None:
+                print(f"{self.name}: access denied: {dir_path.name}")
+            elif detailed:
+                human = 'h' in options
+                print(format_table([HEADER, *(self._row(name, item_stat, human) for name, _, item_stat in listing)],
+                                   ALIGN))
+            else:
+                print('\n'.join(name for name, _ in listing))
+
+    def _print_stream(self, path: Path, options: list[str]):
+        """
+        потоковый вывод содержимого директории: память не зависит от количества элементов
+        Args:
+            path (Path): путь до директории
+            options (list[str]): флаги команды
+        """
+        if 'l' in options:
+            rows = chain([HEADER], self._detailed_rows(path, 'h' in options))
+            for line in iter_table(rows, self._sample_size(options), ALIGN):
+                print(line)
+        else:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    print(entry.name)
+
+    def _detailed_rows(self, path: Path, human: bool = False):
+        """
+        генератор строк подробного вывода: имя, размер, дата изменения, права доступа
+        Args:
+            path (Path): путь до директории
+            human (bool): выводить размер в читаемом виде (1.5K, 12M)
+        Yields:
+            list: строка таблицы
+        """
+        for name, entry_stat in self._scan(path):
+            yield self._row(name, entry_stat, human)
+
+    def _row(self, name: str, entry_stat: os.stat_result, human: bool = False) -> list:
+        """
+        строка подробного вывода для одного элемента
+        Args:
+            name (str): имя элемента
+            entry_stat (os.stat_result): stat элемента
+            human (bool): выводить размер в читаемом виде
+        Returns:
+            list: имя, размер, дата изменения, права доступа
+        """
+        size = human_size(entry_stat.st_size) if human else entry_stat.st_size
+        return [name, size, format_mtime(entry_stat.st_mtime), stat.filemode(entry_stat.st_mode)]
+
+    def _scan(self, path: Path):
+        """
+        генератор элементов директории с их stat
+        stat берется из DirEntry, который кэширует результат, поэтому на элемент приходится один системный вызов
+        Args:
+            path (Path): путь до директории
+        Yields:
+            tuple[str, os.stat_result]: имя элемента и его stat
+        """
+        with os.scandir(path) as entries:
+            for entry in entries:
+                yield entry.name, entry_stat(entry)
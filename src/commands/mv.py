@@ -1,29 +1,164 @@
-import shutil
+import errno, os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .base import BaseCommand
+from src.utils.fastcopy import move
+from src.utils.parser import expand_globs, get_option_value
+from src.utils.progress import Progress, progress_from_options
+from src.utils.ratelimit import RateLimiter, limiter_from_options, run_low_priority
+from src.utils.session import resolve
 
 
 class MvCommand(BaseCommand):
     """
     команда для перемещения файлов и директорий
+
+    принимает несколько источников и шаблоны: mv src1 src2 ... dir перемещает все источники в директорию
+    в пределах одной файловой системы перемещение - это переименование: устройство назначения определяется
+    один раз, источники на том же устройстве переименовываются подряд через os.rename без лишних проверок,
+    между файловыми системами данные копируются и исходник удаляется,
+    с флагом -j N (или --jobs=N) такие элементы переносятся параллельно в N потоках
+    для копирования действуют ограничения --bwlimit=SIZE и --iops=N,
+    --nice выполняет перемещение с наименьшим приоритетом процессора и ввода-вывода
+    прогресс копирования выводится в stderr (как у cp), счетчики последнего завершенного перемещения
+    доступны в self.progress (во время выполнения они локальны, поэтому фоновые задачи их не смешивают)
     """
+
+    def __init__(self):
+        self.progress: Progress | None = None
+
     @property
     def name(self):
         return "mv"
 
     def execute(self, args, options):
-        if len(args) > 2:
-            raise SyntaxError(f"{self.name}: given more arguments than required")
-        elif len(args) < 2:
+        if 'nice' in options:
+            return run_low_priority(self.execute, args, [option for option in options if option != 'nice'])
+        args = list(args)
+        try:
+            jobs = int(args.pop(0)) if 'j' in options and args else None
+            jobs = int(get_option_value(options, "jobs", jobs or 1))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid number of jobs")
+        if jobs < 1:
+            raise SyntaxError(f"{self.name}: invalid number of jobs")
+        try:
+            limiter = limiter_from_options(options)
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid bandwidth or iops limit")
+
+        if len(args) < 2:
             raise SyntaxError(f"{self.name}: given less arguments than required")
+        sources = [str(resolve(path)) for path in expand_globs(args[:-1])]
+        dst = resolve(args[-1])
+        if dst.is_dir():
+            if len(sources) == 1 and not os.path.lexists(sources[0]):
+                raise FileNotFoundError(f"{self.name}: no such file or directory: {sources[0].split('/')[-1]}")
+            self._move_into(sources, dst, jobs, limiter, options)
+        elif len(sources) > 1:
+            raise SyntaxError(f"{self.name}: given more arguments than required: "
+                              f"{str(dst).split('/')[-1]} is not a directory")
         else:
-            src = Path(args[0])
-            dst = Path(args[1])
+            src = Path(sources[0])
             if src.exists():
                 if dst.exists():
-                    shutil.move(src, dst)
+                    cross_device = os.lstat(src).st_dev != os.stat(dst).st_dev
+                    progress = progress_from_options(self.name, [src] if cross_device else [], options)
+                    try:
+                        move(src, dst, limiter, progress)
+                    finally:
+                        progress.finish()
+                        self.progress = progress
                 else:
                     raise FileNotFoundError(f"{self.name}: no such file or directory: {str(dst).split('/')[-1]}")
             else:
                 raise FileNotFoundError(f"{self.name}: no such file or directory: {str(src).split('/')[-1]}")
+
+    def _move_into(self, sources: list[str], dst: Path, jobs: int, limiter: RateLimiter | None,
+                   options: list[str]):
+        """
+        перемещение источников в директорию
+        устройство и содержимое назначения читаются один раз, устройство источников - один раз на каждую
+        исходную директорию, источники на том же устройстве переименовываются подряд относительно
+        открытого дескриптора назначения, остальные (и те, для которых переименование вернуло EXDEV)
+        копируются и удаляются в пуле потоков
+        ошибки отдельных элементов собираются и выводятся в конце, не прерывая перемещение остальных
+        Args:
+            sources (list[str]): исходные пути
+            dst (Path): директория назначения
+            jobs (int): количество потоков для перемещения между устройствами
+            limiter (RateLimiter | None): ограничитель скорости копирования
+            options (list[str]): флаги команды
+        Raises:
+            OSError: если часть элементов не удалось переместить (для одного источника - исходная ошибка)
+        """
+        dst_dev = os.stat(dst).st_dev
+        existing = set(os.listdir(dst)) # одна проверка занятых имен вместо stat на каждый элемент
+        parents = {} # дескриптор и устройство каждой исходной директории определяются один раз
+        errors = []
+        remote = []
+        dst_fd = os.open(dst, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            for source in sources:
+                name = os.path.basename(os.path.normpath(source))
+                try:
+                    if name in existing:
+                        raise FileExistsError(errno.EEXIST, "destination path already exists",
+                                              os.path.join(dst, name))
+                    parent = os.path.dirname(os.path.normpath(source))
+                    if parent not in parents:
+                        parent_fd = os.open(parent or ".", os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+                        parents[parent] = (parent_fd, os.fstat(parent_fd).st_dev)
+                    parent_fd, src_dev = parents[parent]
+                    if src_dev == dst_dev:
+                        try:
+                            # имена относительно открытых директорий: пути до них не разбираются заново
+                            os.rename(name, name, src_dir_fd=parent_fd, dst_dir_fd=dst_fd)
+                            existing.add(name)
+                            continue
+                        except OSError as e:
+                            if e.errno != errno.EXDEV: # источник - точка монтирования другого устройства
+                                raise
+                    existing.add(name)
+                    remote.append((source, dst / name))
+                except OSError as e:
+                    errors.append((source, e))
+        finally:
+            os.close(dst_fd)
+            for parent_fd, _ in parents.values():
+                os.close(parent_fd)
+
+        progress = progress_from_options(self.name, [source for source, _ in remote], options)
+        try:
+            if remote:
+                with ThreadPoolExecutor(max_workers=min(jobs, len(remote))) as pool:
+                    results = pool.map(lambda item: self._move_one(*item, limiter, progress), remote)
+                    errors.extend((source, error) for (source, _), error in zip(remote, results) if error)
+        finally:
+            progress.finish()
+            self.progress = progress
+
+        if len(sources) == 1 and errors:
+            raise errors[0][1]
+        if errors:
+            raise OSError(f"{self.name}: failed to move {len(errors)} items:\n"
+                          + "\n".join(f"{source}: {error.strerror or error}" for source, error in errors))
+
+    def _move_one(self, src: str, dst: Path, limiter: RateLimiter | None,
+                  progress: Progress | None = None) -> OSError | None:
+        """
+        перемещение одного элемента на другое устройство копированием и удалением, выполняется в потоке пула
+        Args:
+            src (str): исходный путь
+            dst (Path): путь назначения
+            limiter (RateLimiter | None): ограничитель скорости
+            progress (Progress | None): счетчики прогресса этого перемещения
+        Returns:
+            OSError | None: ошибка или None при успехе
+        """
+        try:
+            move(src, dst, limiter, progress)
+        except OSError as e:
+            return e
+        return None
@@ -1,6 +1,5 @@
-from pathlib import Path
-
 from .base import BaseCommand
+from src.utils.session import getcwd
 
 class PwdCommand(BaseCommand):
     """
@@ -11,4 +10,4 @@ class PwdCommand(BaseCommand):
         return "pwd"
 
     def execute(self, args, options):
-        print(Path.cwd())
+        print(getcwd())
@@ -1,40 +1,106 @@
-import shutil
+import os, stat
 from pathlib import Path
 
 from .base import BaseCommand
+from src.utils.format_output import human_size
+from src.utils.output import ask
+from src.utils.parser import expand_globs
+from src.utils.progress import Progress, progress_enabled, progress_from_options, scan_size
+from src.utils.session import resolve
+from src.utils.trash import TRASH_DIR, get_trash
 
 class RmCommand(BaseCommand):
     """
     команда для удаления файлов и директорий
 
-    перемещает файлы в корзину (.trash) вместо удаления
+    перемещает файлы в корзину вместо удаления: элементы на устройстве центральной корзины (.trash) -
+    в нее, остальные - в корзину .Trash-<uid> своей файловой системы, поэтому удаление не копирует данные
+    принимает несколько путей и шаблоны, шаблоны раскрываются один раз
     поддерживает рекурсивное удаление директорий
+    при удалении с -r или нескольких элементов выводится одно подтверждение с их количеством и объемом,
+    флаг -f удаляет без подтверждения, затем все элементы перемещаются в корзину одной группой
+    ошибки отдельных элементов выводятся в конце, не прерывая удаление остальных
+    если элемент все же приходится копировать в центральную корзину, то прогресс выводится в stderr (как у cp),
+    счетчики последнего завершенного удаления доступны в self.progress
     """
 
-    def __init__(self, trash_dir_path: str | Path = Path(__file__).parent.parent.parent / ".trash"):
-        self._trash_dir_path = trash_dir_path
+    def __init__(self, trash_dir_path: str | Path = TRASH_DIR):
+        self._trash = get_trash(trash_dir_path)
+        self.progress: Progress | None = None
 
     @property
     def name(self):
         return "rm"
 
     def execute(self, args, options):
-        if len(args) > 1:
-            raise SyntaxError(f"{self.name}: given more arguments than required")
-        elif len(args) < 1:
+        if len(args) < 1:
             raise SyntaxError(f"{self.name}: given less arguments than required")
-        else:
-            src = Path(args[0])
-            dst = self._trash_dir_path
-            if 'r' in options:
-                if src.exists():
-                    answer = input(f"{self.name}: are you sure you want to delete {src.name}: [Y/N]: ").lower()
-                    if answer == 'y':
-                        shutil.move(src, dst)
-                else:
-                    raise FileNotFoundError(f"{self.name}: no such file or directory: {str(src).split('/')[-1]}")
-            else:
-                if src.exists() and src.is_file():
-                    shutil.move(src, dst)
-                else:
-                    raise FileNotFoundError(f"{self.name}: {str(src).split('/')[-1]}: is a directory")
+        paths = [str(resolve(path)) for path in expand_globs(args)]
+        targets, errors = self._check(paths, 'r' in options)
+        if len(paths) == 1 and errors:
+            raise errors[0][1]
+
+        if targets and 'f' not in options and ('r' in options or len(targets) > 1):
+            size = scan_size(targets)[0]
+            what = Path(targets[0]).name if len(targets) == 1 else f"{len(targets)} items"
+            try:
+                answer = ask(f"{self.name}: are you sure you want to delete {what} ({human_size(size)}): [Y/N]: ")
+            except EOFError: # фоновая задача или закончившийся stdin: спросить нельзя, поэтому ничего не удаляется
+                raise OSError(f"{self.name}: cannot ask for confirmation without input, use -f")
+            if answer.lower() != 'y':
+                targets = []
+
+        if targets:
+            errors.extend(self._remove(targets, options))
+        if errors:
+            raise OSError(f"{self.name}: failed to remove {len(errors)} items:\n"
+                          + "\n".join(f"{path}: {error.strerror}" if error.strerror else str(error)
+                                      for path, error in errors))
+
+    def _check(self, paths: list[str], recursive: bool) -> tuple[list[str], list[tuple[str, OSError]]]:
+        """
+        проверка путей перед удалением
+        Args:
+            paths (list[str]): пути после раскрытия шаблонов
+            recursive (bool): разрешено ли удалять директории
+        Returns:
+            tuple[list[str], list[tuple[str, OSError]]]: пути, которые можно удалить, и ошибки остальных
+        """
+        targets = []
+        errors = []
+        for path in paths:
+            name = os.path.basename(os.path.normpath(path))
+            try:
+                mode = os.lstat(path).st_mode
+            except FileNotFoundError:
+                errors.append((path, FileNotFoundError(f"{self.name}: no such file or directory: {name}")))
+                continue
+            if stat.S_ISDIR(mode) and not recursive:
+                errors.append((path, FileNotFoundError(f"{self.name}: {name}: is a directory")))
+                continue
+            targets.append(path)
+        return targets, errors
+
+    def _remove(self, targets: list[str], options: list[str]) -> list[tuple[str, OSError]]:
+        """
+        перемещение элементов в корзины их файловых систем одной группой
+        объем подсчитывается для прогресса, только если он выводится и только для элементов,
+        которые будут копироваться в корзину на другом устройстве
+        Args:
+            targets (list[str]): удаляемые пути
+            options (list[str]): флаги команды
+        Returns:
+            list[tuple[str, OSError]]: ошибки элементов, которые не удалось переместить
+        """
+        copied = []
+        if progress_enabled(options):
+            copied = [path for path in targets
+                      if os.stat(self._trash.root_for(path)).st_dev != os.lstat(path).st_dev]
+        progress = progress_from_options(self.name, copied, options) # локально: задачи делят экземпляр команды
+        try:
+            _, errors = self._trash.put_many(targets, progress)
+        finally:
+            progress.finish()
+            self.progress = progress
+        self._trash.maintain() # при превышении квоты старые элементы удаляются в фоне
+        return errors
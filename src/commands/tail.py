@@ -0,0 +1,112 @@
+import os, time
+
+from .base import BaseCommand
+from src.utils.output import write_bytes
+from src.utils.parser import get_option_value
+from src.utils.session import open_file, resolve
+
+BLOCK_SIZE = 64 * 1024 # размер блока чтения
+DEFAULT_LINES = 10
+FOLLOW_INTERVAL = 0.5 # период опроса файла в режиме -f в секундах
+
+
+class TailCommand(BaseCommand):
+    """
+    команда для вывода последних строк файла
+
+    файл читается блоками с конца, поэтому время работы зависит от размера вывода, а не файла
+    с флагом -f после вывода ожидает дописывания файла, опрашивая его размер раз в --interval секунд
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self._block_size = block_size
+
+    @property
+    def name(self):
+        return "tail"
+
+    def execute(self, args, options):
+        args = list(args)
+        try:
+            count = int(args.pop(0)) if 'n' in options and args else DEFAULT_LINES
+            count = int(get_option_value(options, "lines", count))
+            interval = float(get_option_value(options, "interval", FOLLOW_INTERVAL))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid number of lines or interval")
+        if count < 0 or interval <= 0:
+            raise SyntaxError(f"{self.name}: invalid number of lines or interval")
+        if len(args) > 1:
+            raise SyntaxError(f"{self.name}: given more arguments than required")
+        elif len(args) < 1:
+            raise SyntaxError(f"{self.name}: given less arguments than required")
+
+        path = resolve(args[0])
+        if path.exists():
+            if os.access(path, os.R_OK):
+                if path.is_file():
+                    with open_file(args[0], 'rb') as file:
+                        self._write_tail(file, count)
+                        if 'f' in options:
+                            self._follow(file, interval)
+                else:
+                    raise FileNotFoundError(f"{self.name}: not a file: {str(path).split('/')[-1]}")
+            else:
+                raise PermissionError(f"{self.name}: access denied")
+        else:
+            raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+
+    def _write_tail(self, file, count: int):
+        """
+        вывод последних count строк: блоки читаются от конца файла, пока не наберется count переводов строки
+        после выполнения позиция файла находится в его конце
+        Args:
+            file: открытый на чтение бинарный файл
+            count (int): количество строк
+        """
+        end = file.seek(0, os.SEEK_END)
+        if count == 0 or end == 0:
+            return
+        file.seek(end - 1)
+        # завершающий перевод строки не начинает новую строку, поэтому нужен лишний
+        target = count + 1 if file.read(1) == b'\n' else count
+
+        position = end
+        blocks = []
+        newlines = 0
+        while position > 0 and newlines < target:
+            size = min(self._block_size, position)
+            position -= size
+            file.seek(position)
+            block = file.read(size)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+        data = b''.join(reversed(blocks))
+
+        start = 0
+        if newlines >= target:
+            start = len(data)
+            for _ in range(target):
+                start = data.rindex(b'\n', 0, start)
+            start += 1
+        write_bytes(data[start:])
+        file.seek(end)
+
+    def _follow(self, file, interval: float):
+        """
+        вывод данных, дописываемых в файл, до прерывания через Ctrl+C
+        между проверками поток спит, поэтому нагрузка на процессор отсутствует
+        при усечении файла вывод продолжается с его начала
+        Args:
+            file: открытый на чтение бинарный файл, позиция в конце выведенных данных
+            interval (float): период опроса в секундах
+        """
+        try:
+            while True:
+                time.sleep(interval)
+                size = os.fstat(file.fileno()).st_size
+                if size < file.tell(): # файл был усечен
+                    file.seek(0)
+                while block := file.read(self._block_size):
+                    write_bytes(block)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,133 @@
+import datetime
+from pathlib import Path
+
+from .base import BaseCommand
+from src.utils.format_output import format_table, human_size
+from src.utils.parser import get_option_value, parse_size
+from src.utils.session import resolve
+from src.utils.trash import COMPRESSORS, TRASH_DIR, get_trash
+
+HEADER = ['Deletion time', 'Size', 'Original path']
+ALIGN = "<><"
+
+
+class TrashCommand(BaseCommand):
+    """
+    команда для работы с корзиной
+
+    trash list выводит элементы корзины в порядке удаления (флаг -h - размеры в читаемом виде),
+    trash restore <path>... возвращает последние удаленные элементы с этими исходными путями
+    элементы ищутся по индексу корзины, содержимое корзины не читается
+    trash quota [--size=SIZE] [--days=N] задает квоту (0 - без ограничения) или выводит текущую:
+    при превышении старейшие элементы удаляются окончательно в фоновом потоке
+    trash compress [--method=gzip|lzma|none] [--level=N] [--min-size=SIZE] включает сжатие удаляемых файлов
+    в фоновом потоке или выводит текущие настройки сжатия
+    """
+
+    def __init__(self, trash_dir_path: str | Path = TRASH_DIR):
+        self._trash = get_trash(trash_dir_path)
+
+    @property
+    def name(self):
+        return "trash"
+
+    def execute(self, args, options):
+        if not args:
+            raise SyntaxError(f"{self.name}: given less arguments than required")
+        action, paths = args[0], args[1:]
+        if action == "list":
+            if paths:
+                raise SyntaxError(f"{self.name}: given more arguments than required")
+            self._list('h' in options)
+        elif action == "restore":
+            if not paths:
+                raise SyntaxError(f"{self.name}: given less arguments than required")
+            for path in paths:
+                entry = self._trash.find(str(resolve(path)))
+                if entry is None:
+                    raise FileNotFoundError(f"{self.name}: not in trash: {path}")
+                self._trash.restore(entry)
+        elif action == "quota":
+            if paths:
+                raise SyntaxError(f"{self.name}: given more arguments than required")
+            self._quota(options)
+        elif action == "compress":
+            if paths:
+                raise SyntaxError(f"{self.name}: given more arguments than required")
+            self._compress(options)
+        else:
+            raise SyntaxError(f"{self.name}: unknown action: {action}")
+
+    def _quota(self, options: list[str]):
+        """
+        изменение квоты корзины по флагам --size и --days или вывод текущей квоты и размера корзины
+        Args:
+            options (list[str]): флаги команды
+        """
+        size = get_option_value(options, "size")
+        days = get_option_value(options, "days")
+        if size is None and days is None:
+            config = self._trash.config()
+            max_size = human_size(config["max_size"]) if config["max_size"] is not None else "unlimited"
+            max_age = f"{config['max_age'] / 86400:g} days" if config["max_age"] is not None else "unlimited"
+            print(f"{self.name}: size {human_size(self._trash.total_size)} of {max_size}, max age {max_age}")
+            return
+        values = {}
+        try:
+            if size is not None:
+                values["max_size"] = parse_size(size) or None
+            if days is not None:
+                values["max_age"] = float(days) * 86400 or None
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid quota")
+        if any(value is not None and value < 0 for value in values.values()):
+            raise SyntaxError(f"{self.name}: invalid quota")
+        self._trash.configure(**values)
+        self._trash.maintain()
+
+    def _compress(self, options: list[str]):
+        """
+        изменение настроек сжатия по флагам --method, --level и --min-size или вывод текущих настроек
+        Args:
+            options (list[str]): флаги команды
+        """
+        method = get_option_value(options, "method")
+        level = get_option_value(options, "level")
+        min_size = get_option_value(options, "min-size")
+        config = self._trash.config()
+        if method is None and level is None and min_size is None:
+            if config["compression"] is None:
+                print(f"{self.name}: compression off")
+            else:
+                print(f"{self.name}: compression {config['compression']}, level {config['compression_level']}, "
+                      f"min size {human_size(config['compression_min_size'])}")
+            return
+        values = {}
+        if method is not None:
+            if method != "none" and method not in COMPRESSORS:
+                raise SyntaxError(f"{self.name}: unknown compression method: {method}")
+            values["compression"] = None if method == "none" else method
+        try:
+            if level is not None:
+                values["compression_level"] = int(level)
+            if min_size is not None:
+                values["compression_min_size"] = parse_size(min_size)
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid compression settings")
+        compression = values.get("compression", config["compression"])
+        level = values.get("compression_level", config["compression_level"])
+        if compression is not None and level not in COMPRESSORS[compression][2]:
+            raise SyntaxError(f"{self.name}: invalid compression level: {level}")
+        self._trash.configure(**values)
+
+    def _list(self, human: bool):
+        """
+        вывод таблицы элементов корзины
+        Args:
+            human (bool): выводить размеры в читаемом виде
+        """
+        rows = [[datetime.datetime.fromtimestamp(entry.time).strftime('%d.%m.%y %H:%M'),
+                 human_size(entry.size) if human else entry.size, entry.path]
+                for entry in self._trash.entries()]
+        if rows:
+            print(format_table([HEADER, *rows], ALIGN))
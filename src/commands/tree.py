@@ -0,0 +1,70 @@
+from contextlib import closing
+from pathlib import Path
+
+from .base import BaseCommand
+from src.utils.parser import get_option_value
+from src.utils.session import resolve
+from src.utils.walker import DEFAULT_WORKERS, descends, walk_parallel
+
+
+class TreeCommand(BaseCommand):
+    """
+    команда для вывода дерева директорий
+
+    директории читаются параллельно в --workers=N потоках, вывод отсортирован по имени и не зависит от порядка чтения
+    глубина ограничивается через --depth=N
+    """
+    @property
+    def name(self):
+        return "tree"
+
+    def execute(self, args, options):
+        if len(args) > 1:
+            raise SyntaxError(f"{self.name}: given more arguments than required")
+        shown = Path(args[0]) if args else Path('.') # корень выводится так, как указан в аргументах
+        path = resolve(shown)
+        try:
+            max_depth = get_option_value(options, "depth")
+            max_depth = int(max_depth) if max_depth is not None else None
+            workers = int(get_option_value(options, "workers", DEFAULT_WORKERS))
+        except ValueError:
+            raise SyntaxError(f"{self.name}: invalid depth or number of workers")
+        if (max_depth is not None and max_depth < 1) or workers < 1:
+            raise SyntaxError(f"{self.name}: invalid depth or number of workers")
+
+        if path.exists():
+            if not path.is_file():
+                counts = [0, 0] # количество директорий и файлов
+                print(shown)
+                with closing(walk_parallel(path, max_depth, workers)) as listings:
+                    self._print_level(listings, "", max_depth, counts)
+                print(f"\n{counts[0]} directories, {counts[1]} files")
+            else:
+                raise NotADirectoryError(f"{self.name}: not a directory: {str(path).split('/')[-1]}")
+        else:
+            raise FileNotFoundError(f"{self.name}: no such file or directory: {str(path).split('/')[-1]}")
+
+    def _print_level(self, listings, prefix: str, max_depth: int | None, counts: list[int]):
+        """
+        вывод одной директории дерева
+        обход walk_parallel идет в глубину в том же порядке, что и вывод,
+        поэтому содержимое очередной поддиректории - следующий элемент обхода
+        Args:
+            listings: генератор walk_parallel
+            prefix (str): отступ с линиями родительских уровней
+            max_depth (int | None): максимальное количество выводимых уровней
+            counts (list[int]): счетчики директорий и файлов
+        """
+        _, depth, listing = next(listings)
+        if listing is None:
+            print(f"{prefix}[access denied]")
+            return
+        for i, (name, is_dir) in enumerate(listing):
+            last = i == len(listing) - 1
+            print(f"{prefix}{'└── ' if last else '├── '}{name}")
+            if is_dir:
+                counts[0] += 1
+                if descends(depth, max_depth):
+                    self._print_level(listings, prefix + ('    ' if last else '│   '), max_depth, counts)
+            else:
+                counts[1] += 1
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from .base import BaseCommand
+from src.utils.trash import TRASH_DIR, get_trash
+
+
+class UndoCommand(BaseCommand):
+    """
+    команда отмены последнего удаления
+
+    возвращает из корзины все элементы, удаленные последним вызовом rm, по исходным путям
+    """
+
+    def __init__(self, trash_dir_path: str | Path = TRASH_DIR):
+        self._trash = get_trash(trash_dir_path)
+
+    @property
+    def name(self):
+        return "undo"
+
+    def execute(self, args, options):
+        if args:
+            raise SyntaxError(f"{self.name}: given more arguments than required")
+        entries = self._trash.last_batch()
+        if not entries:
+            raise FileNotFoundError(f"{self.name}: trash is empty")
+        for entry in entries:
+            self._trash.restore(entry)
+            print(f"{self.name}: restored {entry.path}")
@@ -1,17 +1,45 @@
-import importlib
+import os
+from collections.abc import Iterable
 from pathlib import Path
 
 from commands.base import BaseCommand
 from src.utils.error_decorator import error_handler
-from src.utils.parser import parse_object
+from src.utils.parser import parse_object, split_background, split_pipeline
+from src.utils.registry import CommandRegistry, discover_commands
+from src.utils.session import Session, activate, current_session
+from src.utils.stream import write_chunks
 
 
 
 class ShellCore:
-    def __init__(self, logger):
+    def __init__(self, logger, max_jobs: int | None = None, cwd: str | os.PathLike | None = None):
         self.logger = logger
-        self.current_dir = Path.cwd()
-        self.commands = {}
+        # рабочая директория ядра: команды разрешают пути относительно нее, а не директории процесса,
+        # поэтому несколько ядер и фоновые задачи работают в одном процессе с разными директориями
+        self.session = Session(cwd)
+        self.commands = CommandRegistry() # имя -> команда, модули команд загружаются при первом вызове
+        # встроенные команды, которым нужно состояние ядра
+        self.builtins = {"set": self._set, "jobs": self._jobs_list, "wait": self._wait, "kill": self._kill}
+        self.errexit = False # set -e: остановить пакетное выполнение на первой ошибке
+        self.max_jobs = max_jobs # сколько фоновых задач выполняется одновременно, None - по умолчанию
+        self._jobs = None
+
+    @property
+    def jobs(self):
+        """
+        фоновые задачи (JobManager), пул потоков создается при первой фоновой задаче
+        """
+        if self._jobs is None:
+            from src.utils.jobs import DEFAULT_MAX_JOBS, JobManager # не замедляет запуск оболочки
+            self._jobs = JobManager(self.max_jobs or DEFAULT_MAX_JOBS)
+        return self._jobs
+
+    @property
+    def current_dir(self) -> Path:
+        """
+        текущая директория ядра
+        """
+        return Path(self.session.path)
 
     def register_command(self, command: BaseCommand):
         """
@@ -23,44 +51,61 @@ class ShellCore:
 
     def auto_discover_commands(self, commands_folder : str = "commands"):
         """
-        автоматически находит и добавляет все команды из папки commands кроме base.py в словарь с командами
+        автоматически находит все команды из папки commands кроме base.py и добавляет их в словарь с командами
+        модули команд не импортируются: в словарь записывается, из какого модуля загрузить команду,
+        модуль импортируется при первом выполнении команды (см. CommandRegistry)
         Args:
             commands_folder (str): путь до папки с командами
         """
         commands_dir = Path(__file__).parent / commands_folder # путь к папке с командами
-        commands_path = Path(commands_dir) # создание универсального пути для любой ос
-
-        for file_path in commands_path.iterdir(): # итерация по файлам в директории
-            # проверка, что это Python файл и не абстрактный класс или __init__.py
-            if file_path.suffix == ".py" and file_path.name not in ["__init__.py", "base.py"]:
-                module_name = file_path.stem  # имя модуля без расширения
 
-                # импот модуля команды
-                module = importlib.import_module(f".{module_name}", package=commands_folder)
+        for name, (module, class_name) in discover_commands(commands_dir, commands_folder).items():
+            self.commands.add_lazy(name, module, class_name) # добавление в словарь без импорта
 
-                # поиск всех классы в модуле, которые являются командами
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    # проверка на класс, наследование от абстрактного класса и что это не он
-                    if isinstance(attr, type) and issubclass(attr, BaseCommand) and attr != BaseCommand:
-                        command_instance = attr()
-                        self.register_command(command_instance) # добавление в словарь
-
-    @error_handler() # декоратор для логирования ошибок
-    def execute_command(self, command: str):
+    @error_handler(failure_result=1) # декоратор для логирования ошибок
+    def execute_command(self, command: str) -> int:
         """
         функция которая выполняет команду поданную на вход:
         1) парсинг строки на имя команды, аргументы и флаги
-        2) проверка на наличие команды в словаре
+        2) проверка на наличие команды во встроенных командах ядра и в словаре
+           (строка вида cmd1 | cmd2 выполняется как конвейер)
         3) логирование о выполнении данной команды
         4) выполнение команды через функцию класса команды
         если команды нет в словаре, то сообщение об ошибке
+        команда выполняется в директории ядра (в фоновой задаче - в директории задачи)
+        Args:
+            command (str): строка с командой
+        Returns:
+            int: код завершения: 0 - успешно, 1 - ошибка
+        """
+        session = current_session()
+        with activate(self.session if session is None else session):
+            return self._execute(command)
+
+    def _execute(self, command: str) -> int:
+        """
+        выполнение команды в активном сеансе (см. execute_command)
         Args:
             command (str): строка с командой
+        Returns:
+            int: код завершения
         """
+        command, background = split_background(command)
+        if background:
+            self._submit(command)
+            return 0
+        pipeline = split_pipeline(command)
+        if len(pipeline) > 1:
+            self.logger.info(command[:-1])
+            self._execute_pipeline([parse_object(part) for part in pipeline])
+            return 0
         command_params = parse_object(command)
 
-        if command_params["command_name"] in self.commands:
+        if command_params["command_name"] in self.builtins:
+            self.logger.info(command[:-1])
+            status = self.builtins[command_params["command_name"]](command_params["arguments"], command_params["options"])
+            return status or 0
+        elif command_params["command_name"] in self.commands:
             self.logger.info(command[:-1])
             self.commands[command_params["command_name"]].execute(command_params["arguments"], command_params["options"])
         elif command_params["command_name"] == '':
@@ -68,3 +113,155 @@ class ShellCore:
         else:
             self.logger.info(command[:-1])
             raise SyntaxError(f"{command_params["command_name"]}: unknown command")
+        return 0
+
+    def _execute_pipeline(self, pipeline: list[dict]):
+        """
+        выполнение конвейера: поток вывода каждой команды (BaseCommand.stream) передается на вход следующей,
+        поток последней команды выводится в stdout
+        данные запрашиваются последней командой по одному блоку, поэтому команды работают поочередно
+        и промежуточный вывод не накапливается, а после завершения все потоки закрываются,
+        так что команда, которой больше не нужны данные (head), останавливает предыдущие
+        Args:
+            pipeline (list[dict]): разобранные команды конвейера
+        """
+        for command_params in pipeline:
+            if command_params["command_name"] == '':
+                raise SyntaxError("syntax error near unexpected token '|'")
+            if command_params["command_name"] not in self.commands:
+                raise SyntaxError(f"{command_params["command_name"]}: unknown command")
+
+        stages = []
+        chunks = None
+        try:
+            for command_params in pipeline:
+                command = self.commands[command_params["command_name"]]
+                chunks = command.stream(command_params["arguments"], command_params["options"], chunks)
+                stages.append(chunks)
+            write_chunks(chunks)
+        finally:
+            for stage in reversed(stages):
+                close = getattr(stage, "close", None)
+                if close is not None:
+                    close()
+
+    def _submit(self, command: str):
+        """
+        запуск команды (или конвейера) в фоне, выводит номер задачи
+        задача выполняется в копии сеанса ядра: ее директория - текущая директория ядра на момент запуска,
+        а cd в задаче не меняет директорию ядра; встроенные команды ядра в фоне не выполняются
+        Args:
+            command (str): строка команды без &
+        """
+        for part in split_pipeline(command):
+            name = parse_object(part)["command_name"]
+            if name == '':
+                raise SyntaxError("syntax error near unexpected token '&'")
+            if name in self.builtins:
+                raise SyntaxError(f"{name}: cannot run in background")
+        session = self.session.copy()
+
+        def run() -> int:
+            try:
+                with activate(session):
+                    return self.execute_command(command)
+            finally:
+                session.close()
+
+        job = self.jobs.submit(command.rstrip('\n'), run, session.path)
+        print(f"[{job.id}]")
+
+    def _jobs_list(self, args: list[str], options: list[str]):
+        """
+        встроенная команда jobs: список фоновых задач с состоянием, кодом завершения и директорией
+        """
+        if args:
+            raise SyntaxError("jobs: given more arguments than required")
+        for job in self.jobs.jobs():
+            state = job.state if job.status is None or job.state == "killed" else f"{job.state} ({job.status})"
+            print(f"[{job.id}] {state}  {job.command}  (cwd: {job.cwd})")
+
+    def _wait(self, args: list[str], options: list[str]) -> int:
+        """
+        встроенная команда wait [id...]: ожидание задач (по умолчанию всех) и вывод их перехваченного вывода,
+        завершенные задачи удаляются из списка
+        Returns:
+            int: код завершения последней указанной задачи, без аргументов - 0
+        """
+        status = 0
+        for job in self._find_jobs("wait", args) if args else self.jobs.jobs():
+            status = self.jobs.wait(job)
+            write_chunks([job.output.getvalue()])
+            if job.state != "done":
+                print(f"[{job.id}] {job.state}  {job.command}")
+        return status if args else 0
+
+    def _kill(self, args: list[str], options: list[str]):
+        """
+        встроенная команда kill id...: остановка фоновых задач
+        """
+        if not args:
+            raise SyntaxError("kill: given less arguments than required")
+        for job in self._find_jobs("kill", args):
+            self.jobs.kill(job)
+
+    def _find_jobs(self, name: str, args: list[str]) -> list:
+        """
+        поиск задач по номерам (допускается запись %N)
+        Args:
+            name (str): имя встроенной команды для сообщения об ошибке
+            args (list[str]): номера задач
+        Returns:
+            list[Job]: задачи
+        """
+        jobs = []
+        for arg in args:
+            try:
+                job = self.jobs.get(int(arg.removeprefix('%')))
+            except ValueError:
+                job = None
+            if job is None:
+                raise SyntaxError(f"{name}: no such job: {arg}")
+            jobs.append(job)
+        return jobs
+
+    def wait_jobs(self):
+        """
+        ожидание всех фоновых задач с выводом их результата (перед завершением оболочки)
+        """
+        if self._jobs is not None:
+            self._wait([], [])
+            self._jobs.shutdown()
+
+    def execute_script(self, lines: Iterable[str]) -> int:
+        """
+        пакетное выполнение команд без приглашения
+        пустые строки и комментарии (#) пропускаются, после set -e выполнение останавливается на первой ошибке
+        Args:
+            lines (Iterable[str]): строки с командами
+        Returns:
+            int: код завершения последней выполненной команды
+        """
+        status = 0
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            status = self.execute_command(line if line.endswith('\n') else line + '\n')
+            if status and self.errexit:
+                break
+        return status
+
+    def _set(self, args: list[str], options: list[str]):
+        """
+        встроенная команда set: set -e включает остановку пакетного выполнения на первой ошибке, set +e выключает
+        Args:
+            args (list[str]): аргументы (+e)
+            options (list[str]): флаги (e)
+        """
+        if options == ['e'] and not args:
+            self.errexit = True
+        elif args == ['+e'] and not options:
+            self.errexit = False
+        else:
+            raise SyntaxError("set: usage: set -e | set +e")
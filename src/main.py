@@ -3,30 +3,99 @@ from pathlib import Path
 
 from utils.console_info import get_info
 from src.core import ShellCore
-from utils.logger import get_logger
+from utils.logger import BATCH_LOG_CAPACITY, get_logger
+from utils.output import batch_stdout
 
+USAGE = "usage: main.py [-e] [-j N] [-c command | script]"
 
-def run():
+
+def run(argv: list[str] | None = None) -> int:
     """
     главная функция которая запускает ядро, логгер и принимает ввод
+    если передан -c или файл сценария, или stdin не терминал, то команды выполняются в пакетном режиме
+    Args:
+        argv (list[str] | None): аргументы командной строки, по умолчанию sys.argv[1:]
+    Returns:
+        int: код завершения
     """
+    argv = sys.argv[1:] if argv is None else argv
+    errexit = False # -e: то же, что set -e в начале сценария
+    max_jobs = None # -j N: сколько фоновых задач выполняется одновременно
+    commands = script = None
+    while argv:
+        if argv[0] == "-e":
+            errexit = True
+            argv = argv[1:]
+        elif argv[0] == "-j" and len(argv) > 1 and argv[1].isdigit() and int(argv[1]) > 0:
+            max_jobs = int(argv[1])
+            argv = argv[2:]
+        elif argv[0] == "-c" and len(argv) == 2:
+            commands = argv[1]
+            argv = []
+        elif not argv[0].startswith("-") and len(argv) == 1:
+            script = argv[0]
+            argv = []
+        else:
+            print(USAGE, file=sys.stderr)
+            return 2
+    batch = commands is not None or script is not None or not sys.stdin.isatty()
+
     # инициализация логера и сообщение о старте
-    logger = get_logger(Path(__file__).parent.parent / "shell.log")
+    logger = get_logger(Path(__file__).parent.parent / "shell.log", BATCH_LOG_CAPACITY if batch else 0)
     logger.info("start")
 
     # инициализация ядра и поиск доступных команд
-    core = ShellCore(logger)
+    core = ShellCore(logger, max_jobs)
     core.auto_discover_commands()
+    core.errexit = errexit
+
+    if batch:
+        if commands is not None:
+            return run_batch(core, commands.splitlines())
+        if script is not None:
+            try:
+                file = open(script, encoding="utf-8")
+            except OSError as e:
+                print(f"{script}: {e.strerror}", file=sys.stderr)
+                return 1
+            with file:
+                return run_batch(core, file)
+        return run_batch(core, sys.stdin)
 
     # основной цикл в котором считывается команда и передается в ядро
     try:
-        print(f"{get_info()}", end=' ') # приглашение командного интерпретатора
+        print(f"{get_info(core.current_dir)}", end=' ') # приглашение командного интерпретатора
         for line in sys.stdin:
             core.execute_command(line) # выполнить команду из считанной строки
-            print(f"{get_info()}", end=' ') # приглашение командного интерпретатора
+            print(f"{get_info(core.current_dir)}", end=' ') # приглашение командного интерпретатора
+        core.wait_jobs() # конец ввода: дождаться фоновых задач и вывести их результат
     except KeyboardInterrupt:
         logger.info("exit")
+    return 0
+
+
+def run_batch(core: ShellCore, lines) -> int:
+    """
+    пакетное выполнение команд без приглашения
+    вывод накапливается в большом буфере и записывается пачками, остаток - при завершении
+    перед завершением ожидаются фоновые задачи, их вывод добавляется в конце
+    Args:
+        core (ShellCore): ядро
+        lines: строки с командами
+    Returns:
+        int: код завершения последней выполненной команды
+    """
+    stdout = sys.stdout
+    stdout.flush()
+    sys.stdout = batch_stdout(stdout)
+    try:
+        status = core.execute_script(lines)
+        core.wait_jobs()
+        return status
+    finally:
+        sys.stdout.close() # запись остатка буфера
+        sys.stdout = stdout
 
 
 if __name__ == "__main__":
-    run()
+    sys.exit(run())
@@ -2,16 +2,18 @@ import os
 from pathlib import Path
 
 
-def get_info() -> str:
+def get_info(cwd: str | os.PathLike | None = None) -> str:
     """
     функция для получения данных приглашения командного интерпретатора
+    Args:
+        cwd (str | os.PathLike | None): директория сеанса оболочки, по умолчанию текущая директория процесса
     Returns:
         str: строка с данными об имени пользователя и устройства и о текущей директории
     """
 
     username = os.getlogin() # имя пользователя
     hostname = os.uname().nodename # имя устройства
-    current_dir = Path.cwd() # текущая директория
+    current_dir = Path.cwd() if cwd is None else Path(cwd) # текущая директория
 
     return f"{username}@{hostname} {str(current_dir).split('/')[-1]} #"
 
@@ -1,13 +1,13 @@
 from functools import wraps
 
 
-def error_handler():
+def error_handler(failure_result=None):
     """
     декоратор для обработки ошибок в функциях с логированием
     перехватывает исключения в декорируемой функции, выводит их в консольи записывает в логгер
 
     Args:
-        logger: объект логгера для записи ошибок
+        failure_result: значение, которое возвращает обертка при ошибке
 
     Returns:
         function: декоратор для обертывания функций
@@ -27,7 +27,7 @@ def error_handler():
             обертка функции
 
             Returns:
-                результат выполнения оригинальной функции
+                результат выполнения оригинальной функции или failure_result при ошибке
             """
 
             # попытка выполнить функцию
@@ -35,9 +35,10 @@ def error_handler():
                 return func(*args, **kwargs)
 
             # обработка ошибок
-            except (FileNotFoundError, NotADirectoryError, PermissionError, SyntaxError) as e:
+            except (OSError, SyntaxError) as e: # FileNotFoundError, PermissionError и т.д. - подклассы OSError
                 print(e) # вывод ошибки в консоль
                 args[0].logger.error(e)  # запись в лог
+                return failure_result
 
         return wrapper
     return decorator
\ No newline at end of file
@@ -0,0 +1,298 @@
+import errno
+import json
+import os
+import shutil
+import sys
+
+from src.utils.progress import Progress
+from src.utils.ratelimit import RateLimiter
+
+try:
+    import fcntl
+except ImportError: # windows
+    fcntl = None
+
+FICLONE = 0x40049409 # ioctl клонирования файла (reflink) в linux
+CHUNK_SIZE = 64 * 1024 * 1024 # сколько байт копируется за один системный вызов
+REFLINK_MODES = ("auto", "always", "never")
+RESUME_CHUNK_SIZE = 256 * 1024 * 1024 # размер блока между контрольными точками возобновляемого копирования
+
+# ошибки copy_file_range, после которых нужно перейти на обычное копирование
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+def copy_file(src: str | os.PathLike, dst: str | os.PathLike, reflink: str = "auto",
+              chunk_size: int = CHUNK_SIZE, limiter: RateLimiter | None = None,
+              progress: Progress | None = None) -> str:
+    """
+    копирование файла с метаданными (как shutil.copy2) силами ядра
+    1) reflink через ioctl FICLONE: на btrfs/XFS копия разделяет блоки с оригиналом и создается мгновенно
+    2) os.copy_file_range: данные копируются внутри ядра без передачи в python
+    3) при отсутствии поддержки - pread/pwrite блоками
+    дыры разреженных файлов (SEEK_DATA/SEEK_HOLE) не копируются, поэтому копия остается разреженной
+    Args:
+        src (str | os.PathLike): путь до исходного файла
+        dst (str | os.PathLike): путь до копии или до директории, в которую нужно скопировать файл
+        reflink (str): auto - попробовать reflink, always - только reflink, never - не использовать reflink
+        chunk_size (int): сколько байт копировать за один системный вызов
+        limiter (RateLimiter | None): ограничитель скорости, None - без ограничения
+        progress (Progress | None): счетчики прогресса, в которые добавляются скопированные байты
+    Returns:
+        str: использованный способ: reflink, copy_file_range или read_write
+    Raises:
+        shutil.SameFileError: если src и dst - один и тот же файл
+        OSError: если reflink=always, а файловая система не поддерживает reflink (dst при этом не меняется)
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    existed = os.path.exists(dst)
+    if existed and os.path.samefile(src, dst): # открытие dst на запись обрезало бы исходный файл
+        raise shutil.SameFileError(f"{str(src)!r} and {str(dst)!r} are the same file")
+    # dst открывается без обрезки: reflink заменяет содержимое целиком, а при ошибке копия не остается пустой
+    with open(src, 'rb') as fsrc, open(os.open(dst, os.O_WRONLY | os.O_CREAT, 0o666), 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        if reflink != "never" and _reflink(in_fd, out_fd):
+            method = "reflink"
+            if progress is not None:
+                progress.add(os.fstat(in_fd).st_size)
+        elif reflink == "always":
+            if not existed:
+                os.unlink(dst)
+            raise OSError(errno.EOPNOTSUPP, "reflink is not supported", str(dst))
+        else:
+            os.ftruncate(out_fd, 0) # старые данные dst не должны остаться в дырах копии
+            method = _copy_data(in_fd, out_fd, os.fstat(in_fd).st_size, chunk_size, limiter, progress)
+    shutil.copystat(src, dst)
+    return method
+
+
+def _reflink(in_fd: int, out_fd: int) -> bool:
+    """
+    попытка клонировать файл через FICLONE
+    Returns:
+        bool: True если файл клонирован
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(out_fd, FICLONE, in_fd)
+    except OSError:
+        return False
+    return True
+
+
+def _data_segments(fd: int, size: int):
+    """
+    генератор участков файла с данными (без дыр) через SEEK_DATA/SEEK_HOLE
+    если файловая система их не поддерживает, то весь файл - один участок
+    Args:
+        fd (int): дескриптор файла
+        size (int): размер файла
+    Yields:
+        tuple[int, int]: начало и конец участка
+    """
+    if not hasattr(os, "SEEK_DATA"):
+        if size:
+            yield 0, size
+        return
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(fd, offset, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno != errno.ENXIO: # ENXIO - после offset данных нет, только дыра
+                yield offset, size
+            return
+        end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+        yield start, end
+        offset = end
+
+
+def copy_range(in_fd: int, out_fd: int, offset: int, end: int, chunk_size: int,
+               method: str | None = None, limiter: RateLimiter | None = None,
+               progress: Progress | None = None) -> tuple[int, str]:
+    """
+    копирование участка [offset, end) с теми же смещениями в копии
+    сначала через os.copy_file_range, при отсутствии поддержки - через pread/pwrite
+    с ограничителем скорости блоки уменьшаются до его размера блока, и перед каждым блоком ожидаются токены
+    Args:
+        in_fd (int): дескриптор исходного файла
+        out_fd (int): дескриптор копии
+        offset (int): начало участка
+        end (int): конец участка
+        chunk_size (int): сколько байт копировать за один системный вызов
+        method (str | None): способ, выбранный на предыдущем участке, None - определить заново
+        limiter (RateLimiter | None): ограничитель скорости, None - без ограничения
+        progress (Progress | None): счетчики прогресса, обновляются после каждого блока
+    Returns:
+        tuple[int, str]: до какого смещения скопированы данные (меньше end, если файл укоротился)
+                         и использованный способ: copy_file_range или read_write
+    """
+    if method is None:
+        method = "copy_file_range" if hasattr(os, "copy_file_range") else "read_write"
+    if limiter is not None:
+        chunk_size = min(chunk_size, limiter.chunk_size)
+    while offset < end:
+        count = min(chunk_size, end - offset)
+        if limiter is not None:
+            limiter.consume(count)
+        if method == "copy_file_range":
+            try:
+                copied = os.copy_file_range(in_fd, out_fd, count, offset, offset)
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS:
+                    raise
+                method = "read_write" # файловая система не поддерживает, продолжаем с того же места
+        if method == "read_write":
+            data = memoryview(os.pread(in_fd, count, offset))
+            copied = 0
+            while copied < len(data):
+                copied += os.pwrite(out_fd, data[copied:], offset + copied)
+        if copied == 0: # файл укоротился во время копирования
+            break
+        offset += copied
+        if progress is not None:
+            progress.add(copied)
+    return offset, method
+
+
+def _copy_data(in_fd: int, out_fd: int, size: int, chunk_size: int, limiter: RateLimiter | None = None,
+               progress: Progress | None = None) -> str:
+    """
+    копирование участков с данными с теми же смещениями, дыры остаются дырами
+    Returns:
+        str: использованный способ: copy_file_range или read_write
+    """
+    method = "copy_file_range" if hasattr(os, "copy_file_range") else "read_write"
+    copied = 0
+    for start, end in _data_segments(in_fd, size):
+        reached, method = copy_range(in_fd, out_fd, start, end, chunk_size, method, limiter, progress)
+        copied += reached - start
+    if progress is not None and copied < size:
+        progress.add(size - copied) # дыры не копируются, но входят в размер файла
+    os.ftruncate(out_fd, size) # дыра в конце файла не создается записью, поэтому размер задается явно
+    return method
+
+
+def copy_file_resumable(src: str | os.PathLike, dst: str | os.PathLike,
+                        chunk_size: int = RESUME_CHUNK_SIZE, limiter: RateLimiter | None = None,
+                        progress: Progress | None = None) -> int:
+    """
+    копирование большого файла, которое можно продолжить после прерывания
+    данные пишутся блоками во временный файл <dst>.part, после каждого блока он сбрасывается на диск,
+    а в файл контрольной точки <dst>.part.ckpt записывается смещение, до которого копия верна
+    при повторном запуске для того же неизмененного источника последний блок копии сверяется с источником,
+    и копирование продолжается с контрольной точки (при расхождении - с начала)
+    после завершения временный файл атомарно переименовывается в dst
+    Args:
+        src (str | os.PathLike): путь до исходного файла
+        dst (str | os.PathLike): путь до копии или до директории, в которую нужно скопировать файл
+        chunk_size (int): размер блока между контрольными точками
+        limiter (RateLimiter | None): ограничитель скорости, None - без ограничения
+        progress (Progress | None): счетчики прогресса, уже скопированная часть учитывается сразу
+    Returns:
+        int: смещение, с которого продолжено копирование (0 - копирование с начала)
+    Raises:
+        OSError: если исходный файл изменился во время копирования
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    part = f"{dst}.part"
+    checkpoint = f"{part}.ckpt"
+    src_stat = os.stat(src)
+    # источник считается тем же, если совпадают путь, размер и время изменения
+    state = {"source": os.path.abspath(src), "size": src_stat.st_size, "mtime_ns": src_stat.st_mtime_ns}
+    offset = _load_checkpoint(checkpoint, state, part)
+
+    with open(src, 'rb') as fsrc, open(part, 'r+b' if offset else 'wb') as fpart:
+        in_fd, out_fd = fsrc.fileno(), fpart.fileno()
+        if offset and not _tail_matches(in_fd, out_fd, offset, chunk_size):
+            offset = 0
+        resumed = offset
+        if progress is not None:
+            progress.add(resumed)
+        os.ftruncate(out_fd, offset) # данные после контрольной точки могли быть записаны не полностью
+
+        method = None
+        while offset < state["size"]:
+            end = min(offset + chunk_size, state["size"])
+            reached, method = copy_range(in_fd, out_fd, offset, end, CHUNK_SIZE, method, limiter, progress)
+            if reached < end:
+                raise OSError(errno.EIO, "source file changed during copy", str(src))
+            os.fsync(out_fd) # контрольная точка записывается только после того, как блок на диске
+            offset = end
+            _save_checkpoint(checkpoint, {**state, "offset": offset})
+
+    shutil.copystat(src, part)
+    os.replace(part, dst)
+    os.unlink(checkpoint)
+    return resumed
+
+
+def _load_checkpoint(checkpoint: str, state: dict, part: str) -> int:
+    """
+    чтение контрольной точки
+    Returns:
+        int: смещение, с которого можно продолжить, или 0, если точка отсутствует или относится к другому файлу
+    """
+    try:
+        with open(checkpoint) as file:
+            saved = json.load(file)
+        offset = int(saved["offset"])
+        if any(saved.get(key) != value for key, value in state.items()) or os.path.getsize(part) < offset:
+            return 0
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+    return offset
+
+
+def _save_checkpoint(checkpoint: str, state: dict):
+    """
+    атомарная запись контрольной точки через временный файл и os.replace
+    """
+    tmp = f"{checkpoint}.tmp"
+    with open(tmp, 'w') as file:
+        json.dump(state, file)
+    os.replace(tmp, checkpoint)
+
+
+def _tail_matches(in_fd: int, out_fd: int, offset: int, chunk_size: int) -> bool:
+    """
+    сверка последнего скопированного блока копии с источником перед продолжением
+    Returns:
+        bool: True если блок совпадает
+    """
+    start = max(offset - chunk_size, 0)
+    position = start
+    while position < offset:
+        count = min(CHUNK_SIZE, offset - position)
+        if os.pread(in_fd, count, position) != os.pread(out_fd, count, position):
+            return False
+        position += count
+    return True
+
+
+def move(src: str | os.PathLike, dst: str | os.PathLike, limiter: RateLimiter | None = None,
+         progress: Progress | None = None) -> bool:
+    """
+    перемещение как shutil.move: переименование, а если оно невозможно (другое устройство) - копирование
+    через copy_file с ограничением скорости и учетом прогресса, затем удаление исходника
+    Args:
+        src (str | os.PathLike): исходный путь
+        dst (str | os.PathLike): путь назначения или директория, в которую нужно переместить
+        limiter (RateLimiter | None): ограничитель скорости копирования
+        progress (Progress | None): счетчики прогресса копирования
+    Returns:
+        bool: True если элемент перемещен переименованием, без копирования данных
+    """
+    copied = False
+
+    def copy(source, target):
+        nonlocal copied
+        copied = True
+        copy_file(source, target, limiter=limiter, progress=progress)
+        if progress is not None:
+            progress.add(files=1)
+
+    shutil.move(src, dst, copy_function=copy)
+    return not copied
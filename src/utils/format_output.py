@@ -1,10 +1,77 @@
-def format_table(data: list[list[str]]) -> str:
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice
+from operator import itemgetter
+
+SIZE_UNITS = "KMGTPE"
+NUMBER_TYPES = {int, float}
+BLOCK_ROWS = 8192 # сколько строк таблицы склеивается за раз
+
+
+def human_size(size: int) -> str:
+    """
+    перевод размера в байтах в короткую запись с двоичным суффиксом (512, 1.5K, 12M)
+
+    Args:
+        size (int): размер в байтах
+
+    Returns:
+        str: размер в читаемом виде
+    """
+    if size < 1024:
+        return str(size)
+    value = float(size)
+    for unit in SIZE_UNITS:
+        value /= 1024
+        if value < 1024 or unit == SIZE_UNITS[-1]:
+            return f"{value:.1f}{unit}" if value < 10 else f"{value:.0f}{unit}"
+
+
+def _row_template(rows: Sequence[Sequence], align: str | None) -> str:
+    """
+    построение шаблона строки таблицы вида "%-10s %5s" за один проход по каждому столбцу
+    ячейки не переводятся в строки заранее: для строковых столбцов длина берется напрямую,
+    для целочисленных - по максимуму и минимуму, остальные переводятся в строку только для подсчета длины
+
+    Args:
+        rows (Sequence[Sequence]): строки таблицы, первая строка - заголовок
+        align (str | None): строка из символов '<' и '>' для каждого столбца,
+            по умолчанию столбец из чисел (кроме заголовка) выравнивается по правому краю
+
+    Returns:
+        str: шаблон для оператора %
+    """
+    specs = []
+    for i, header in enumerate(rows[0]):
+        types = set(map(type, map(itemgetter(i), islice(rows, 1, None))))
+        if types == {str}:
+            width = max(len(str(header)), max(map(len, map(itemgetter(i), islice(rows, 1, None)))))
+        elif types == {int}:
+            # длина записи целого числа максимальна у максимума или у отрицательного минимума
+            width = max(len(str(header)), len(str(max(map(itemgetter(i), islice(rows, 1, None))))),
+                        len(str(min(map(itemgetter(i), islice(rows, 1, None))))))
+        else:
+            width = max(map(len, map(str, map(itemgetter(i), rows))))
+
+        if align is not None:
+            right = align[i] == '>'
+        else:
+            right = bool(types) and types <= NUMBER_TYPES
+        specs.append(f"%{width}s" if right else f"%-{width}s")
+    return " ".join(specs)
+
+
+def format_table(data: list[list], align: str | None = None) -> str:
     """
     форматирует данные в виде таблицы без разделителей
     чтобы ширина каждого столбца была равна наибольшей длине в этом столбце
 
+    ширина каждого столбца вычисляется за один проход, затем каждая строка форматируется одним шаблоном,
+    строки склеиваются блоками, поэтому список всех строк таблицы в памяти не хранится
+
     Args:
-        data (list[list[str]]): список списков, где каждый вложенный список - строка таблицы
+        data (list[list]): список списков, где каждый вложенный список - строка таблицы
+        align (str | None): выравнивание столбцов ('<' или '>' на каждый столбец),
+            по умолчанию числовые столбцы выравниваются по правому краю, остальные по левому
 
     Returns:
         str: отформатированная таблица в виде строки
@@ -12,21 +79,33 @@ def format_table(data: list[list[str]]) -> str:
     if not data:
         return ""
 
-    # максимальная длина для каждого столбца
-    num_columns = len(data[0])
-    column_widths = [0] * num_columns
-    for row in data:
-        for i, cell in enumerate(row):
-            column_widths[i] = max(column_widths[i], len(str(cell)))
-
-    # форматирование таблицы
-    formatted_lines = []
-    for row in data:
-        formatted_cells = []
-        for i, cell in enumerate(row):
-            # выравнивание каждой ячейки по левому краю с учетом ширины через ljust
-            formatted_cell = str(cell).ljust(column_widths[i])
-            formatted_cells.append(formatted_cell)
-        formatted_lines.append(" ".join(formatted_cells))
-
-    return "\n".join(formatted_lines)
+    lines = map(_row_template(data, align).__mod__, map(tuple, data))
+    blocks = []
+    while block := list(islice(lines, BLOCK_ROWS)):
+        blocks.append("\n".join(block))
+    return "\n".join(blocks)
+
+
+def iter_table(rows: Iterable[list], sample_size: int = 256, align: str | None = None) -> Iterator[str]:
+    """
+    потоковое форматирование таблицы построчно
+    ширина столбцов вычисляется по первым sample_size строкам, остальные строки выводятся сразу,
+    поэтому в памяти хранится только выборка, а первая строка появляется до обработки всех данных
+    ячейки длиннее вычисленной ширины не обрезаются
+
+    Args:
+        rows (Iterable[list]): строки таблицы, первая строка - заголовок
+        sample_size (int): количество строк для вычисления ширины столбцов
+        align (str | None): выравнивание столбцов, по умолчанию определяется по выборке
+
+    Yields:
+        str: отформатированная строка таблицы
+    """
+    rows = iter(rows)
+    sample = list(islice(rows, max(sample_size, 1)))
+    if not sample:
+        return
+
+    template = _row_template(sample, align)
+    for row in chain(sample, rows):
+        yield template % tuple(row)
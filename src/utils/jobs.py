@@ -0,0 +1,176 @@
+import ctypes
+import io
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.output import detach_stdin
+from src.utils.stream import output_stream, redirect_output
+
+DEFAULT_MAX_JOBS = 4 # сколько фоновых задач выполняется одновременно
+
+
+class JobKilled(BaseException):
+    """
+    исключение, которое kill вызывает в потоке выполняемой задачи
+    наследуется от BaseException, чтобы обработчики ошибок команд его не перехватывали
+    """
+
+
+class Job:
+    """
+    фоновая задача: команда, директория, в которой она запущена, перехваченный вывод и код завершения
+    state: queued, running, done, failed или killed
+    """
+    __slots__ = ("id", "command", "cwd", "state", "status", "output", "future", "_thread_id", "_killed")
+
+    def __init__(self, id: int, command: str, cwd: str):
+        self.id = id
+        self.command = command
+        self.cwd = cwd
+        self.state = "queued"
+        self.status = None # код завершения, None - задача не завершена
+        self.output = io.BytesIO() # вывод задачи
+        self.future = None
+        self._thread_id = None # поток, в котором выполняется задача
+        self._killed = False
+
+
+class JobManager:
+    """
+    фоновые задачи оболочки в пуле потоков с ограничением количества одновременно выполняемых задач
+
+    вывод каждой задачи перехватывается в ее буфер (stdout перенаправляется только в потоке задачи),
+    stdin для задачи закрыт, поэтому команды, задающие вопрос (rm -r без -f), в фоне завершаются ошибкой,
+    kill отменяет задачу в очереди, а в выполняемой задаче вызывает исключение JobKilled
+    (исключение возникает между инструкциями python, поэтому текущий системный вызов сначала завершается)
+    """
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS):
+        self._pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs = {} # id -> задача, в порядке запуска
+        self._last_id = 0
+
+    def submit(self, command: str, func: Callable[[], int], cwd: str) -> Job:
+        """
+        запуск команды в фоне
+        Args:
+            command (str): строка команды (для вывода в jobs)
+            func (Callable[[], int]): функция, выполняющая команду и возвращающая код завершения
+            cwd (str): директория, в которой выполняется задача (для вывода в jobs)
+        Returns:
+            Job: задача
+        """
+        with self._lock:
+            self._last_id += 1
+            job = Job(self._last_id, command, cwd)
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        """
+        Returns:
+            Job | None: задача с номером job_id или None
+        """
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """
+        Returns:
+            list[Job]: задачи в порядке запуска
+        """
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self) -> bool:
+        """
+        Returns:
+            bool: True если есть незавершенные задачи
+        """
+        return any(job.status is None for job in self.jobs())
+
+    def wait(self, job: Job) -> int:
+        """
+        ожидание завершения задачи и удаление ее из списка
+        Args:
+            job (Job): задача
+        Returns:
+            int: код завершения
+        """
+        try:
+            job.future.result()
+        except BaseException: # задача отменена в очереди
+            pass
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        return job.status
+
+    def kill(self, job: Job):
+        """
+        остановка задачи: задача в очереди отменяется, в выполняемой задаче вызывается JobKilled
+        Args:
+            job (Job): задача
+        """
+        with self._lock:
+            if job.status is not None or job._killed:
+                return
+            job._killed = True
+            if job.future.cancel():
+                job.state, job.status = "killed", 1
+            elif job._thread_id is not None:
+                _raise_in_thread(job._thread_id, JobKilled)
+
+    def shutdown(self, wait: bool = True):
+        """
+        остановка пула, при wait=True - после завершения всех задач
+        """
+        self._pool.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[[], int]):
+        """
+        выполнение задачи в потоке пула с перехватом вывода
+        """
+        with self._lock:
+            if job._killed:
+                job.state, job.status = "killed", 1
+                return
+            job._thread_id = threading.get_ident()
+            job.state = "running"
+        stream = output_stream(job.output)
+        status, state = 1, "failed"
+        try:
+            try:
+                with redirect_output(stream), detach_stdin(): # задача не читает stdin оболочки
+                    status = func()
+                state = "done" if status == 0 else "failed"
+            finally:
+                self._detach(job)
+        except JobKilled:
+            self._detach(job)
+            state = "killed"
+        except Exception as e: # непредвиденная ошибка команды не должна теряться в пуле
+            stream.write(f"{e}\n")
+        stream.flush()
+        stream.detach()
+        with self._lock:
+            job.state, job.status = state, status
+
+    def _detach(self, job: Job):
+        """
+        отвязка задачи от потока: после нее kill не вызывает исключение в этом потоке,
+        а еще не сработавшее исключение JobKilled отменяется
+        """
+        with self._lock:
+            if job._thread_id is not None and job._killed:
+                _raise_in_thread(job._thread_id, None)
+            job._thread_id = None
+
+
+def _raise_in_thread(thread_id: int, exception: type[BaseException] | None):
+    """
+    асинхронный вызов исключения в потоке через PyThreadState_SetAsyncExc, None отменяет ожидающее исключение
+    """
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id),
+                                               ctypes.py_object(exception) if exception is not None else None)
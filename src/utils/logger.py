@@ -1,14 +1,19 @@
 import logging
+import logging.handlers
 import pathlib
 
+BATCH_LOG_CAPACITY = 1024 # сколько записей лога накапливается в пакетном режиме перед записью в файл
 
-def get_logger(file: pathlib.Path) -> logging.Logger:
+
+def get_logger(file: pathlib.Path, capacity: int = 0) -> logging.Logger:
     """
     создает и настраивает логгер с записью в указанный файл
     если логгер уже был создан, то возвращаяется имеющийся
 
     Args:
         file (pathlib.Path): путь к файлу с логами
+        capacity (int): если больше 0, то записи накапливаются в памяти и пишутся в файл пачками
+            по capacity записей (ошибки - сразу), остаток записывается при завершении программы
 
     Returns:
         logging.Logger: настроенный логгер
@@ -26,6 +31,9 @@ def get_logger(file: pathlib.Path) -> logging.Logger:
         handler = logging.FileHandler(file) # создание обработчика для записи логов
         handler.setFormatter(formatter) # установка форматтера
 
+        if capacity > 0:
+            handler = logging.handlers.MemoryHandler(capacity, flushLevel=logging.ERROR, target=handler)
+
         logger.addHandler(handler) # добавление обработчика к логгеру
         logger.setLevel(logging.INFO) # установка уровеня логирования - обработка сообщений уровня INFO и выше
 
@@ -0,0 +1,132 @@
+import contextlib
+import io
+import os
+import sys
+from contextvars import ContextVar
+
+
+def write_bytes(data: bytes):
+    """
+    запись байтов в stdout без декодирования
+    если stdout подменен текстовым потоком без бинарного буфера, то байты декодируются
+    Args:
+        data (bytes): данные для вывода
+    """
+    output = getattr(sys.stdout, "buffer", None)
+    if output is None:
+        sys.stdout.write(data.decode(errors="replace"))
+        return
+    sys.stdout.flush() # текст, ранее записанный через print, должен оказаться перед байтами
+    output.write(data)
+    output.flush()
+
+
+BATCH_BUFFER_SIZE = 1024 * 1024 # сколько байт накапливается перед записью в пакетном режиме
+
+
+class BatchBuffer(io.BufferedIOBase):
+    """
+    бинарный буфер вывода для пакетного режима
+    данные накапливаются в памяти и записываются в дескриптор одним системным вызовом при достижении порога
+    или при вызове drain, flush ничего не записывает, поэтому команды, сбрасывающие stdout после каждого вывода,
+    не приводят к системному вызову на каждую строку
+    fileno не поддерживается, чтобы вывод в обход буфера (os.sendfile) не нарушил порядок данных
+    """
+
+    def __init__(self, fd: int, threshold: int = BATCH_BUFFER_SIZE):
+        super().__init__()
+        self._fd = fd
+        self._threshold = threshold
+        self._pending = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = len(data)
+        if len(self._pending) + size < self._threshold:
+            self._pending += data
+        else:
+            self.drain()
+            if size < self._threshold:
+                self._pending += data
+            else:
+                self._write_all(memoryview(data).cast("B")) # большой блок пишется сразу, без копирования
+        return size
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """
+        запись накопленных данных в дескриптор
+        """
+        if self._pending:
+            self._write_all(memoryview(self._pending))
+            self._pending.clear()
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.drain()
+            finally:
+                super().close()
+
+    def _write_all(self, data: memoryview):
+        with data:
+            written = 0
+            while written < len(data):
+                written += os.write(self._fd, data[written:])
+
+
+def batch_stdout(stream=None, threshold: int = BATCH_BUFFER_SIZE) -> io.TextIOWrapper:
+    """
+    создание текстового stdout поверх BatchBuffer с той же кодировкой, что у stream
+    Args:
+        stream: исходный stdout, по умолчанию sys.stdout
+        threshold (int): порог записи в байтах
+    Returns:
+        io.TextIOWrapper: новый stdout, перед завершением его нужно закрыть или вызвать buffer.drain()
+    """
+    stream = sys.stdout if stream is None else stream
+    return io.TextIOWrapper(BatchBuffer(stream.fileno(), threshold), encoding=stream.encoding,
+                            errors=stream.errors, newline=None)
+
+
+_stdin_attached: ContextVar[bool] = ContextVar("stdin_attached", default=True)
+
+
+@contextlib.contextmanager
+def detach_stdin():
+    """
+    команды внутри блока не читают stdin оболочки (фоновые задачи): для них stdin сразу закончился,
+    иначе вопрос ушел бы в перехваченный вывод задачи, а ответом стала бы следующая команда пользователя
+    """
+    token = _stdin_attached.set(False)
+    try:
+        yield
+    finally:
+        _stdin_attached.reset(token)
+
+
+def ask(question: str) -> str:
+    """
+    вопрос пользователю с чтением ответа из stdin
+    вопрос выводится в stderr (как у rm -i в bash), поэтому не попадает в конвейер и не задерживается
+    в буфере пакетного режима, а накопленный пакетным режимом вывод записывается перед вопросом
+    Args:
+        question (str): текст вопроса
+    Returns:
+        str: ответ пользователя
+    Raises:
+        EOFError: если stdin закончился или отключен (detach_stdin)
+    """
+    if not _stdin_attached.get():
+        raise EOFError
+    sys.stdout.flush()
+    drain = getattr(getattr(sys.stdout, "buffer", None), "drain", None)
+    if drain is not None: # BatchBuffer: flush ничего не записывает
+        drain()
+    sys.stderr.write(question)
+    sys.stderr.flush()
+    return input()
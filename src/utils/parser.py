@@ -1,21 +1,37 @@
+import glob
+import os
+import re
 import shlex
 
+from src.utils.session import current_session
+
+QUOTING_CHARS = frozenset("'\"\\") # символы, при которых нужен разбор через shlex
+# разделители shlex; str.split делит еще и по другим пробельным символам (\x0b, \x0c, неразрывный пробел)
+WHITESPACE = re.compile(r"[ \t\r\n]+")
+
 
 def parse_object(string: str) -> dict:
     """
     парсер для команд
     выделяет имя команды, аргументы (поддержка ввода через пробел в кавычках) и флаги
+    короткие флаги (-lr) разбиваются на отдельные символы, длинные (--text, --top=20) сохраняются целиком
     Args:
         string (str): строка, содержащая команду
     Returns:
         dict: словарь из трех элементов: имя команды (str), аргументы (list[str]), флаги (list[str])
     """
-    tokens = shlex.split(string) # разделение по пробелам вне кавычек
+    if QUOTING_CHARS.isdisjoint(string):
+        # без кавычек и экранирования shlex.split только делит строку по своим разделителям
+        tokens = [token for token in WHITESPACE.split(string) if token]
+    else:
+        tokens = shlex.split(string) # разделение по пробелам вне кавычек
     if tokens:
         args = [] # список для аргументов
         options = [] # список для флагов
         for token in tokens[1:]:
-            if token[0] == '-': # проверка на флаг
+            if token.startswith('--') and len(token) > 2: # проверка на длинный флаг
+                options.append(token[2:])
+            elif token[0] == '-': # проверка на флаг
                 for option in token[1:]:
                     options.append(option)
             else:
@@ -23,3 +39,124 @@ def parse_object(string: str) -> dict:
         command_params = {"command_name": tokens[0], "arguments": args, "options": options}
         return command_params
     return {"command_name": '', "arguments": [], "options": []}
+
+
+def _unquoted(string: str, char: str) -> list[int]:
+    """
+    позиции символа char вне кавычек и без экранирования
+    Args:
+        string (str): строка
+        char (str): искомый символ
+    Returns:
+        list[int]: позиции символа
+    """
+    positions = []
+    quote = None # открытая кавычка
+    escaped = False
+    for i, current in enumerate(string):
+        if escaped:
+            escaped = False
+        elif current == '\\' and quote != "'":
+            escaped = True
+        elif quote is not None:
+            if current == quote:
+                quote = None
+        elif current in "'\"":
+            quote = current
+        elif current == char:
+            positions.append(i)
+    return positions
+
+
+def split_pipeline(string: str) -> list[str]:
+    """
+    разбиение строки на команды конвейера по символам | вне кавычек и без экранирования
+    Args:
+        string (str): строка с командами
+    Returns:
+        list[str]: строки отдельных команд (одна, если конвейера нет)
+    """
+    if '|' not in string:
+        return [string]
+    parts = []
+    start = 0
+    for i in _unquoted(string, '|'):
+        parts.append(string[start:i])
+        start = i + 1
+    parts.append(string[start:])
+    return parts
+
+
+def split_background(string: str) -> tuple[str, bool]:
+    """
+    отделение признака фонового выполнения: & в конце строки вне кавычек
+    Args:
+        string (str): строка с командой
+    Returns:
+        tuple[str, bool]: строка без & (с переводом строки, если он был) и True, если команду нужно выполнить в фоне
+    """
+    stripped = string.rstrip()
+    if not stripped.endswith('&') or len(stripped) - 1 not in _unquoted(stripped, '&'):
+        return string, False
+    return stripped[:-1].rstrip() + string[len(stripped):], True
+
+
+def get_option_value(options: list[str], name: str, default: str | None = None) -> str | None:
+    """
+    получение значения длинного флага вида --name=value
+    если флаг указан несколько раз, то используется последнее значение
+    Args:
+        options (list[str]): список флагов команды
+        name (str): имя флага без --
+        default (str | None): значение по умолчанию, если флаг не указан
+    Returns:
+        str | None: значение флага или значение по умолчанию
+    """
+    prefix = f"{name}="
+    for option in reversed(options):
+        if option.startswith(prefix):
+            return option[len(prefix):]
+    return default
+
+
+def parse_size(value: str) -> int:
+    """
+    перевод строки с размером (например 512, 64K, 50M, 1G) в количество байт
+    суффиксы двоичные: K = 1024, M = 1024 ** 2, G = 1024 ** 3, допускается окончание B
+    Args:
+        value (str): строка с размером
+    Returns:
+        int: размер в байтах
+    Raises:
+        ValueError: если строка не является размером
+    """
+    units = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    number = value.strip().upper().removesuffix('B')
+    suffix = number[-1:] if number[-1:] in units else ''
+    size = float(number[:len(number) - len(suffix)]) * units[suffix]
+    if size < 0:
+        raise ValueError(f"negative size: {value}")
+    return int(size)
+
+
+def expand_globs(patterns: list[str]) -> list[str]:
+    """
+    раскрытие шаблонов (*, ?, [...]) в отсортированный список путей
+    аргументы без шаблонов и шаблоны без совпадений возвращаются как есть,
+    чтобы команда сама сообщила об отсутствующем файле
+    относительные шаблоны раскрываются в директории активного сеанса (пути остаются относительными)
+    Args:
+        patterns (list[str]): аргументы команды
+    Returns:
+        list[str]: список путей в порядке аргументов
+    """
+    session = current_session()
+    root_dir = None if session is None else session.path
+    paths = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = glob.glob(pattern, root_dir=None if os.path.isabs(pattern) else root_dir)
+            paths.extend(sorted(matches) or [pattern])
+        else:
+            paths.append(pattern)
+    return paths
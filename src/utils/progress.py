@@ -0,0 +1,178 @@
+import os
+import stat
+import sys
+import threading
+import time
+
+from src.utils.format_output import human_size
+
+RENDER_INTERVAL = 0.5 # как часто (в секундах) обновляется строка прогресса
+
+
+class Progress:
+    """
+    счетчики выполнения долгой операции: байты и файлы, текущая скорость и оставшееся время
+
+    счетчики потокобезопасны, поэтому один объект обновляется всеми потоками копирования
+    если вывод включен, строка прогресса перерисовывается в stderr не чаще раза в interval секунд,
+    первая строка появляется только через interval, поэтому быстрые операции ничего не выводят
+    """
+
+    def __init__(self, label: str, total_bytes: int | None = None, total_files: int | None = None,
+                 stream=None, interval: float = RENDER_INTERVAL, enabled: bool = False):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.total_files = total_files
+        self.bytes_done = 0
+        self.files_done = 0
+        self._stream = stream if stream is not None else sys.stderr
+        self._interval = interval
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._started = self._window_started = time.monotonic()
+        self._window_bytes = 0
+        self._rate = None
+        self._rendered = False
+
+    @property
+    def elapsed(self) -> float:
+        """время с начала операции в секундах"""
+        return time.monotonic() - self._started
+
+    @property
+    def rate(self) -> float:
+        """
+        текущая скорость в байтах в секунду (за последний интервал), до первого интервала - средняя
+        """
+        if self._rate is not None:
+            return self._rate
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """оставшееся время в секундах или None, если общий объем неизвестен"""
+        rate = self.rate
+        if self.total_bytes is None or rate <= 0:
+            return None
+        return max(self.total_bytes - self.bytes_done, 0) / rate
+
+    def add(self, size: int = 0, files: int = 0):
+        """
+        учет выполненной работы
+        Args:
+            size (int): сколько байт обработано
+            files (int): сколько файлов завершено
+        """
+        with self._lock:
+            self.bytes_done += size
+            self.files_done += files
+            now = time.monotonic()
+            if now - self._window_started >= self._interval:
+                self._rate = (self.bytes_done - self._window_bytes) / (now - self._window_started)
+                self._window_started = now
+                self._window_bytes = self.bytes_done
+                if self._enabled:
+                    self._render()
+
+    def finish(self):
+        """
+        вывод итоговой строки, если строка прогресса уже выводилась (повторный вызов ничего не выводит)
+        """
+        with self._lock:
+            if self._rendered:
+                self._render()
+                self._stream.write("\n")
+                self._stream.flush()
+                self._rendered = False
+
+    def format(self) -> str:
+        """
+        строка прогресса, например "cp: 1.2G/4.0G (30%), 120/400 files, 45M/s, ETA 1:02"
+        Returns:
+            str: строка прогресса
+        """
+        parts = [human_size(self.bytes_done)]
+        if self.total_bytes is not None:
+            percent = self.bytes_done * 100 // self.total_bytes if self.total_bytes else 100
+            parts[0] += f"/{human_size(self.total_bytes)} ({percent}%)"
+        files = f"{self.files_done}/{self.total_files}" if self.total_files is not None else str(self.files_done)
+        parts.append(f"{files} files")
+        parts.append(f"{human_size(int(self.rate))}/s")
+        eta = self.eta
+        if eta is not None:
+            minutes, seconds = divmod(int(eta), 60)
+            parts.append(f"ETA {minutes}:{seconds:02d}")
+        return f"{self.label}: " + ", ".join(parts)
+
+    def _render(self):
+        """
+        перерисовка строки прогресса на месте (вызывается под блокировкой)
+        """
+        self._stream.write("\r" + self.format() + "\033[K")
+        self._stream.flush()
+        self._rendered = True
+
+
+def scan_size(paths) -> tuple[int, int]:
+    """
+    предварительный подсчет объема и количества обычных файлов (ссылки не разыменовываются)
+    Args:
+        paths: пути до файлов и директорий
+    Returns:
+        tuple[int, int]: общий размер в байтах и количество файлов
+    """
+    total_bytes = total_files = 0
+    stack = []
+    for path in paths:
+        try:
+            info = os.lstat(path)
+        except OSError:
+            continue
+        if stat.S_ISDIR(info.st_mode):
+            stack.append(os.fspath(path))
+        elif stat.S_ISREG(info.st_mode):
+            total_bytes += info.st_size
+            total_files += 1
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_bytes += entry.stat(follow_symlinks=False).st_size
+                        total_files += 1
+        except OSError:
+            continue
+    return total_bytes, total_files
+
+
+def progress_enabled(options: list[str]) -> bool:
+    """
+    включен ли вывод прогресса: флагом --progress или, если stderr - терминал, по умолчанию (--no-progress выключает)
+    Args:
+        options (list[str]): флаги команды
+    Returns:
+        bool: True если прогресс выводится
+    """
+    return 'progress' in options or ('no-progress' not in options and sys.stderr.isatty())
+
+
+def progress_from_options(label: str, paths, options: list[str]) -> Progress:
+    """
+    создание счетчиков прогресса для команды
+    вывод включается как в progress_enabled, объем подсчитывается заранее только для вывода,
+    --no-scan пропускает подсчет: тогда не выводятся процент и оставшееся время
+    Args:
+        label (str): имя команды для строки прогресса
+        paths: исходные пути операции
+        options (list[str]): флаги команды
+    Returns:
+        Progress: счетчики прогресса
+    """
+    enabled = progress_enabled(options)
+    total_bytes = total_files = None
+    if enabled and 'no-scan' not in options:
+        total_bytes, total_files = scan_size(paths)
+    return Progress(label, total_bytes, total_files, enabled=enabled)
@@ -0,0 +1,113 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+
+from src.utils.parser import get_option_value, parse_size
+
+BURST_SECONDS = 0.1 # какой объем (в секундах работы на пределе) можно выполнить без ожидания
+
+
+class RateLimiter:
+    """
+    ограничитель скорости ввода-вывода по алгоритму token bucket
+
+    ограничивает байты в секунду и, если задано, количество операций в секунду
+    потокобезопасен: один ограничитель делится между всеми потоками копирования,
+    поэтому предел действует на суммарную скорость
+    """
+
+    def __init__(self, bytes_per_second: int | None = None, ops_per_second: int | None = None):
+        self.bytes_per_second = bytes_per_second
+        self.ops_per_second = ops_per_second
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+        # запас токенов в начале позволяет не ждать первую операцию
+        self._bytes = self._bytes_capacity = bytes_per_second * BURST_SECONDS if bytes_per_second else 0
+        self._ops = self._ops_capacity = max(ops_per_second * BURST_SECONDS, 1) if ops_per_second else 0
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        размер блока, при котором ожидание распределяется равномерно (около 10 блоков в секунду)
+        """
+        if not self.bytes_per_second:
+            return 64 * 1024 * 1024
+        return max(int(self.bytes_per_second * BURST_SECONDS), 4096)
+
+    def consume(self, size: int):
+        """
+        учет одной операции размером size байт, при превышении предела поток спит
+        токены могут уйти в минус: тогда ожидание равно времени, за которое долг будет восполнен,
+        поэтому средняя скорость точно соответствует пределу при любом размере блоков
+        Args:
+            size (int): размер операции в байтах
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last
+            self._last = now
+            wait = 0.0
+            if self.bytes_per_second:
+                self._bytes = min(self._bytes + elapsed * self.bytes_per_second, self._bytes_capacity) - size
+                if self._bytes < 0:
+                    wait = -self._bytes / self.bytes_per_second
+            if self.ops_per_second:
+                self._ops = min(self._ops + elapsed * self.ops_per_second, self._ops_capacity) - 1
+                if self._ops < 0:
+                    wait = max(wait, -self._ops / self.ops_per_second)
+        if wait > 0:
+            time.sleep(wait)
+
+
+def limiter_from_options(options: list[str]) -> RateLimiter | None:
+    """
+    создание ограничителя по флагам --bwlimit=SIZE (байт в секунду) и --iops=N
+    Args:
+        options (list[str]): флаги команды
+    Returns:
+        RateLimiter | None: ограничитель или None, если ограничения не заданы
+    Raises:
+        ValueError: если значение флага некорректно
+    """
+    bwlimit = get_option_value(options, "bwlimit")
+    iops = get_option_value(options, "iops")
+    if bwlimit is None and iops is None:
+        return None
+    bytes_per_second = parse_size(bwlimit) if bwlimit is not None else None
+    ops_per_second = int(iops) if iops is not None else None
+    if (bytes_per_second is not None and bytes_per_second < 1) or (ops_per_second is not None and ops_per_second < 1):
+        raise ValueError("limit must be positive")
+    return RateLimiter(bytes_per_second, ops_per_second)
+
+
+def run_low_priority(func, *args, **kwargs):
+    """
+    выполнение функции в отдельном потоке с наименьшим приоритетом (nice 19)
+    в linux приоритет задается для потока, и созданные им потоки его наследуют,
+    а планировщики ввода-вывода CFQ/BFQ выводят приоритет ввода-вывода из nice,
+    поэтому приоритет остальной программы не меняется
+    на других системах функция выполняется как обычно
+    Returns:
+        результат функции
+    """
+    if not sys.platform.startswith("linux") or not hasattr(os, "setpriority"):
+        return func(*args, **kwargs)
+
+    result = {}
+    context = contextvars.copy_context() # сеанс оболочки (директория) переходит в новый поток
+
+    def target():
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+            result["value"] = context.run(func, *args, **kwargs)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, name="low-priority-io")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
@@ -0,0 +1,206 @@
+import importlib
+import os
+import threading
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+
+MANIFEST_NAME = "commands.manifest" # файл манифеста в __pycache__ папки команд
+MANIFEST_VERSION = "1"
+EXCLUDED_MODULES = {"__init__", "base"}
+
+
+class CommandRegistry(MutableMapping):
+    """
+    словарь команд ядра с отложенной загрузкой
+
+    кроме готовых экземпляров команд хранит для каждого имени модуль и класс команды,
+    модуль импортируется и команда создается только при первом обращении к ней,
+    поэтому запуск оболочки не зависит от количества команд и их зависимостей
+    загрузка выполняется под блокировкой: фоновые задачи обращаются к командам из потоков пула
+    """
+
+    def __init__(self):
+        self._commands = {} # имя -> экземпляр команды
+        self._lazy = {} # имя -> (модуль, класс), еще не загруженные команды
+        self._lock = threading.RLock()
+
+    def add_lazy(self, name: str, module: str, class_name: str):
+        """
+        регистрация команды без импорта ее модуля
+        Args:
+            name (str): имя команды
+            module (str): полное имя модуля с командой
+            class_name (str): имя класса команды в модуле
+        """
+        with self._lock:
+            self._commands.pop(name, None)
+            self._lazy[name] = (module, class_name)
+
+    def __getitem__(self, name: str):
+        command = self._commands.get(name)
+        if command is not None:
+            return command
+        with self._lock:
+            if name not in self._commands: # команду мог загрузить другой поток, пока этот ждал блокировку
+                if name not in self._lazy:
+                    raise KeyError(name)
+                module, class_name = self._lazy[name]
+                self._commands[name] = getattr(importlib.import_module(module), class_name)()
+                del self._lazy[name]
+            return self._commands[name]
+
+    def __setitem__(self, name: str, command):
+        with self._lock:
+            self._lazy.pop(name, None)
+            self._commands[name] = command
+
+    def __delitem__(self, name: str):
+        if name in self._lazy:
+            del self._lazy[name]
+        else:
+            del self._commands[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._commands or name in self._lazy
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._commands
+        yield from self._lazy
+
+    def __len__(self) -> int:
+        return len(self._commands) + len(self._lazy)
+
+
+def discover_commands(commands_dir: str | Path, package: str) -> dict[str, tuple[str, str]]:
+    """
+    поиск команд в папке без импорта модулей
+    результат хранится в манифесте __pycache__/commands.manifest вместе со временем изменения папки и всех модулей,
+    при совпадении времен команды читаются из манифеста, иначе модули разбираются заново через ast
+    Args:
+        commands_dir (str | Path): путь до папки с командами
+        package (str): имя пакета с командами для импорта
+    Returns:
+        dict[str, tuple[str, str]]: имя команды -> (полное имя модуля, имя класса)
+    """
+    commands_dir = Path(commands_dir)
+    manifest = commands_dir / "__pycache__" / MANIFEST_NAME
+    key, modules = _manifest_key(commands_dir, package)
+    commands = _read_manifest(manifest, key)
+    if commands is None:
+        commands = {}
+        for stem in modules:
+            module = f"{package}.{stem}"
+            for name, class_name in _scan_module(commands_dir / f"{stem}.py", module):
+                commands[name] = (module, class_name)
+        if not manifest.parent.is_dir():
+            try:
+                os.mkdir(manifest.parent)
+            except OSError:
+                pass
+            key = _manifest_key(commands_dir, package)[0] # создание __pycache__ изменило время папки
+        _write_manifest(manifest, key, commands)
+    return commands
+
+
+def _manifest_key(commands_dir: Path, package: str) -> tuple[str, list[str]]:
+    """
+    ключ манифеста из времени изменения папки и модулей команд
+    Returns:
+        tuple[str, list[str]]: ключ и отсортированные имена модулей
+    """
+    mtimes = [f"{os.stat(commands_dir).st_mtime_ns}"]
+    modules = []
+    with os.scandir(commands_dir) as entries:
+        for entry in entries:
+            stem, suffix = os.path.splitext(entry.name)
+            if suffix == ".py" and stem not in EXCLUDED_MODULES:
+                modules.append(stem)
+                mtimes.append(f"{entry.name}:{entry.stat().st_mtime_ns}")
+    return " ".join([MANIFEST_VERSION, package, *sorted(mtimes)]), sorted(modules)
+
+
+def _read_manifest(manifest: Path, key: str) -> dict[str, tuple[str, str]] | None:
+    """
+    чтение манифеста: первая строка - ключ, остальные - "имя модуль класс"
+    Returns:
+        dict[str, tuple[str, str]] | None: команды или None, если манифеста нет или он устарел
+    """
+    try:
+        with open(manifest, encoding="utf-8") as file:
+            if file.readline().rstrip("\n") != key:
+                return None
+            commands = {}
+            for line in file:
+                name, module, class_name = line.split()
+                commands[name] = (module, class_name)
+    except (OSError, ValueError):
+        return None
+    return commands
+
+
+def _write_manifest(manifest: Path, key: str, commands: dict[str, tuple[str, str]]):
+    """
+    атомарная запись манифеста через временный файл, ошибки записи (папка только для чтения) игнорируются
+    """
+    tmp = manifest.with_name(f"{manifest.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding="utf-8") as file:
+            file.write(key + "\n")
+            for name, (module, class_name) in commands.items():
+                file.write(f"{name} {module} {class_name}\n")
+        os.replace(tmp, manifest)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _scan_module(path: Path, module: str) -> list[tuple[str, str]]:
+    """
+    поиск классов команд в исходном коде модуля
+    командой считается класс со свойством name, которое возвращает строку;
+    если имя команды нельзя определить по исходному коду, то модуль импортируется
+    Args:
+        path (Path): путь до файла модуля
+        module (str): полное имя модуля
+    Returns:
+        list[tuple[str, str]]: пары (имя команды, имя класса)
+    """
+    import ast # нужен только при обновлении манифеста
+
+    found = []
+    tree = ast.parse(path.read_bytes(), str(path))
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = {base.id if isinstance(base, ast.Name) else getattr(base, "attr", None) for base in node.bases}
+        name = None
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef) and item.name == "name":
+                returns = item.body[-1] if item.body else None
+                if isinstance(returns, ast.Return) and isinstance(returns.value, ast.Constant) \
+                        and isinstance(returns.value.value, str):
+                    name = returns.value.value
+        if name is not None:
+            found.append((name, node.name))
+        elif "BaseCommand" in bases:
+            return _import_module_commands(module) # имя вычисляется во время выполнения
+    return found
+
+
+def _import_module_commands(module: str) -> list[tuple[str, str]]:
+    """
+    поиск команд импортом модуля и созданием экземпляров, как при обычной загрузке
+    Returns:
+        list[tuple[str, str]]: пары (имя команды, имя класса)
+    """
+    from commands.base import BaseCommand
+
+    found = []
+    imported = importlib.import_module(module)
+    for attr in vars(imported).values():
+        if isinstance(attr, type) and issubclass(attr, BaseCommand) and attr is not BaseCommand \
+                and attr.__module__ == module:
+            found.append((attr().name, attr.__name__))
+    return found
@@ -0,0 +1,140 @@
+import contextlib
+import os
+from contextvars import ContextVar
+from pathlib import Path
+
+# флаги дескриптора директории: O_PATH не требует права на чтение директории
+DIR_FLAGS = getattr(os, "O_PATH", os.O_RDONLY) | getattr(os, "O_DIRECTORY", 0)
+
+
+class Session:
+    """
+    виртуальная рабочая директория сеанса оболочки
+
+    вместо os.chdir, который меняет директорию всего процесса, каждый сеанс (ядро, фоновая задача) хранит
+    свою директорию: путь и открытый дескриптор, поэтому несколько сеансов работают в одном процессе
+    файлы открываются относительно дескриптора (openat через dir_fd), для остальных операций
+    относительный путь переводится в абсолютный через resolve
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = os.path.abspath(os.getcwd() if path is None else path)
+        self.fd = os.open(self.path, DIR_FLAGS) if os.open in os.supports_dir_fd else None
+        self._close = os.close # дескриптор закрывается той же реализацией os, которой открыт
+
+    def resolve(self, path: str | os.PathLike) -> str:
+        """
+        путь относительно директории сеанса
+        Args:
+            path (str | os.PathLike): путь
+        Returns:
+            str: абсолютный путь (абсолютный путь возвращается без изменений)
+        """
+        return os.path.join(self.path, path)
+
+    def chdir(self, path: str | os.PathLike):
+        """
+        смена директории сеанса
+        путь меняется логически, как cd в bash (.. после перехода по ссылке ведет к родителю ссылки),
+        и дескриптор открывается по тому же нормализованному пути, поэтому resolve и open_file
+        всегда указывают на одну директорию
+        Args:
+            path (str | os.PathLike): путь до директории
+        Raises:
+            FileNotFoundError: если пути нет
+            NotADirectoryError: если путь - не директория
+        """
+        target = os.path.normpath(self.resolve(path))
+        if self.fd is not None:
+            fd = os.open(target, DIR_FLAGS)
+            self._close(self.fd)
+            self.fd = fd
+        elif not os.path.isdir(target):
+            raise NotADirectoryError(f"not a directory: {path}")
+        self.path = target
+
+    def opener(self, path: str, flags: int) -> int:
+        """
+        функция открытия для open(..., opener=session.opener): относительный путь открывается от дескриптора сеанса
+        """
+        if self.fd is None:
+            return os.open(self.resolve(path), flags, 0o666)
+        return os.open(path, flags, 0o666, dir_fd=self.fd)
+
+    def copy(self) -> "Session":
+        """
+        новый сеанс в той же директории (для фоновой задачи), смена директории в нем не влияет на исходный
+        """
+        return Session(self.path)
+
+    def close(self):
+        """
+        закрытие дескриптора директории
+        """
+        if self.fd is not None:
+            self._close(self.fd)
+            self.fd = None
+
+    def __del__(self):
+        self.close()
+
+
+_current: ContextVar[Session | None] = ContextVar("session", default=None)
+
+
+@contextlib.contextmanager
+def activate(session: Session):
+    """
+    выполнение команд в директории сеанса: в этом потоке resolve, open_file и getcwd используют сеанс
+    Args:
+        session (Session): сеанс
+    """
+    token = _current.set(session)
+    try:
+        yield session
+    finally:
+        _current.reset(token)
+
+
+def current_session() -> Session | None:
+    """
+    Returns:
+        Session | None: активный сеанс потока или None, если команда выполняется вне ядра
+    """
+    return _current.get()
+
+
+def resolve(path: str | os.PathLike) -> Path:
+    """
+    путь относительно директории активного сеанса, без сеанса - путь без изменений (директория процесса)
+    Args:
+        path (str | os.PathLike): путь из аргументов команды
+    Returns:
+        Path: путь для операций с файловой системой
+    """
+    session = _current.get()
+    return Path(path) if session is None else Path(session.resolve(path))
+
+
+def open_file(path: str | os.PathLike, mode: str = 'rb', **kwargs):
+    """
+    open относительно директории активного сеанса через дескриптор директории (openat)
+    Args:
+        path (str | os.PathLike): путь из аргументов команды
+        mode (str): режим открытия
+    Returns:
+        открытый файл
+    """
+    session = _current.get()
+    if session is None:
+        return open(path, mode, **kwargs)
+    return open(path, mode, opener=session.opener, **kwargs)
+
+
+def getcwd() -> str:
+    """
+    Returns:
+        str: директория активного сеанса или текущая директория процесса
+    """
+    session = _current.get()
+    return os.getcwd() if session is None else session.path
@@ -0,0 +1,131 @@
+import contextlib
+import io
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+
+STREAM_CHUNK_SIZE = 64 * 1024 # примерный размер блока, в который склеиваются строки вывода
+
+
+def join_lines(lines: Iterable[bytes], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    склейка строк в блоки примерно по chunk_size байт, чтобы по конвейеру не передавался каждый элемент отдельно
+    Args:
+        lines (Iterable[bytes]): строки вместе с переводами строк
+        chunk_size (int): размер блока
+    Yields:
+        bytes: блок строк
+    """
+    block = []
+    size = 0
+    for line in lines:
+        block.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b''.join(block)
+            block.clear()
+            size = 0
+    if block:
+        yield b''.join(block)
+
+
+def encode_lines(lines: Iterable[str], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    перевод текстовых строк вывода в блоки байт (как при выводе через print)
+    Args:
+        lines (Iterable[str]): строки без переводов строк
+        chunk_size (int): размер блока
+    Yields:
+        bytes: блок строк
+    """
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    return join_lines((f"{line}\n".encode(encoding, "surrogateescape") for line in lines), chunk_size)
+
+
+def write_chunks(chunks: Iterable[bytes]):
+    """
+    вывод потока блоков байт в stdout по мере их получения
+    Args:
+        chunks (Iterable[bytes]): блоки байт
+    """
+    output = getattr(sys.stdout, "buffer", None)
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk.decode(errors="replace"))
+        sys.stdout.flush()
+        return
+    sys.stdout.flush() # текст, ранее записанный через print, должен оказаться перед байтами
+    for chunk in chunks:
+        output.write(chunk)
+        output.flush()
+
+
+class _ThreadLocalStdout:
+    """
+    подмена sys.stdout, которая направляет вывод потока в его собственный поток вывода (redirect_output),
+    а вывод остальных потоков - в исходный stdout
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "stream", None) or self._default
+
+    def __getattr__(self, name: str):
+        return getattr(self._target(), name)
+
+
+_install_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def redirect_output(stream):
+    """
+    перенаправление stdout текущего потока в stream, вывод других потоков не затрагивается
+    (в отличие от contextlib.redirect_stdout), поэтому фоновые задачи и конвейеры не смешивают вывод
+    Args:
+        stream: текстовый поток вывода
+    """
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        proxy = sys.stdout
+    previous = getattr(proxy._local, "stream", None)
+    proxy._local.stream = stream
+    try:
+        yield stream
+    finally:
+        proxy._local.stream = previous
+
+
+def output_stream(buffer: io.BytesIO) -> io.TextIOWrapper:
+    """
+    текстовый поток поверх буфера байт с кодировкой stdout, print и запись байт в .buffer попадают в один буфер
+    Args:
+        buffer (io.BytesIO): буфер
+    Returns:
+        io.TextIOWrapper: поток вывода
+    """
+    return io.TextIOWrapper(buffer, encoding=getattr(sys.stdout, "encoding", None) or "utf-8",
+                            errors="surrogateescape", write_through=True)
+
+
+def capture_output(func: Callable, *args) -> bytes:
+    """
+    выполнение функции с перехватом всего, что она выводит в stdout (через print или в бинарный буфер)
+    Args:
+        func (Callable): функция
+        *args: аргументы функции
+    Returns:
+        bytes: вывод функции
+    """
+    buffer = io.BytesIO()
+    stdout = output_stream(buffer)
+    with redirect_output(stdout):
+        func(*args)
+    stdout.flush()
+    output = buffer.getvalue()
+    stdout.detach()
+    return output
@@ -0,0 +1,658 @@
+import contextlib
+import errno
+import gzip
+import json
+import logging
+import lzma
+import os
+import shutil
+import stat
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from src.utils.fastcopy import move
+from src.utils.progress import Progress, scan_size
+
+try:
+    import fcntl
+except ImportError: # windows
+    fcntl = None
+
+TRASH_DIR = Path(__file__).parent.parent.parent / ".trash" # центральная корзина по умолчанию
+INDEX_NAME = ".index.jsonl" # журнал корзины в центральной корзине
+CONFIG_NAME = ".config.json" # настройки корзины (квота) в центральной корзине
+LOCK_NAME = ".index.lock" # файл межпроцессной блокировки журнала
+COMPACT_MIN_RECORDS = 1024 # с какого числа устаревших записей журнал переписывается
+JOURNAL_BATCH = 1024 # сколько записей о перемещении дописывается в журнал за раз
+COMPRESSION_LEVEL = 6 # уровень сжатия по умолчанию
+COMPRESSION_MIN_SIZE = 1024 * 1024 # файлы меньше этого размера не сжимаются
+# способы сжатия: функция открытия архива, расширение имени и допустимые уровни
+COMPRESSORS = {
+    "gzip": (lambda path, mode, level: gzip.open(path, mode, compresslevel=level), ".gz", range(1, 10)),
+    "lzma": (lambda path, mode, level: lzma.open(path, mode, preset=level), ".xz", range(0, 10)),
+}
+
+
+class TrashEntry:
+    """
+    запись индекса корзины: откуда и когда удален элемент, его размер и имя в корзине
+    """
+    __slots__ = ("id", "path", "root", "name", "time", "size", "batch", "compression")
+
+    def __init__(self, id: int, path: str, root: str, name: str, time: float, size: int, batch: int,
+                 compression: str | None = None):
+        self.id = id
+        self.path = path # исходный абсолютный путь
+        self.root = root # директория корзины, в которой хранится элемент
+        self.name = name # уникальное имя в этой корзине
+        self.time = time
+        self.size = size
+        self.batch = batch # элементы, удаленные одной командой, имеют общий номер
+        self.compression = compression # способ сжатия файла в корзине, None - хранится как есть
+
+    @property
+    def stored(self) -> Path:
+        """путь до элемента в корзине"""
+        return Path(self.root) / self.name
+
+    def record(self) -> dict:
+        """запись для журнала"""
+        return {"op": "add", **{key: getattr(self, key) for key in self.__slots__}}
+
+
+class Trash:
+    """
+    корзина, в которую команды перемещают удаляемые элементы
+
+    у каждой файловой системы своя корзина, поэтому удаление - это всегда переименование без копирования данных:
+    для элементов на устройстве центральной корзины используется она, для остальных - директория
+    .Trash-<uid> в точке монтирования их файловой системы (как в спецификации корзины XDG)
+    точка монтирования определяется по смене st_dev при подъеме к корню один раз для каждого устройства
+    если корзину на файловой системе создать нельзя (например, нет прав на запись в точку монтирования),
+    то элемент копируется в центральную корзину
+
+    все удаления записываются в журнал .index.jsonl центральной корзины (одна строка json на операцию,
+    запись только дописывается в конец), по нему в памяти строится индекс по исходному пути,
+    поэтому поиск элемента не читает содержимое корзины
+    перед каждой операцией дочитываются только новые строки журнала, поэтому несколько процессов
+    видят изменения друг друга, а запись в журнал и его перезапись выполняются под flock
+    когда устаревших записей становится больше, чем актуальных, журнал переписывается
+    команды одного процесса используют общий объект корзины (get_trash), чтобы восстановление,
+    удаление по квоте и сжатие одного элемента не выполнялись одновременно
+
+    квота (max_size - суммарный размер, max_age - возраст в секундах) хранится в .config.json,
+    при превышении старейшие элементы удаляются окончательно
+    размер корзины ведется в индексе по записям журнала, корзина не обходится целиком:
+    файлы учитываются при удалении, размер директорий считается фоновым потоком
+    фоновый поток также удаляет элементы сверх квоты, поэтому rm остается переименованием,
+    поток запускается при появлении работы и завершается, когда очередь пуста
+
+    если в настройках задано сжатие (compression: gzip или lzma), то фоновый поток после переименования сжимает
+    файлы не меньше compression_min_size с уровнем compression_level, при восстановлении файл распаковывается
+    размер элемента в индексе - занимаемое им место, поэтому после сжатия квота учитывает размер архива
+    """
+
+    def __init__(self, root: str | Path = TRASH_DIR):
+        self.root = Path(root)
+        self._roots = {} # устройство -> директория корзины на нем
+        self._lock = threading.RLock()
+        self._entries = {} # id -> TrashEntry в порядке удаления
+        self._by_path = {} # исходный путь -> id записей по возрастанию
+        self._total_size = 0
+        self._dead = 0 # количество устаревших записей в журнале
+        self._index_state = None # (st_ino, сколько байт журнала прочитано)
+        self._last_id = 0
+        self._jobs = deque() # очередь фоновой работы
+        self._worker = None
+        self._evicting = set() # id записей, которые сейчас удаляются по квоте
+
+    @property
+    def index_path(self) -> Path:
+        """путь до журнала корзины"""
+        return self.root / INDEX_NAME
+
+    @property
+    def total_size(self) -> int:
+        """суммарный размер элементов в корзине"""
+        with self._lock:
+            self._sync()
+            return self._total_size
+
+    def root_for(self, path: str | Path) -> Path:
+        """
+        корзина на той же файловой системе, что и путь
+        Args:
+            path (str | Path): удаляемый путь
+        Returns:
+            Path: директория корзины (центральная, если на этом устройстве корзину создать нельзя)
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        device = os.stat(parent).st_dev
+        root = self._roots.get(device)
+        if root is None:
+            os.makedirs(self.root, exist_ok=True)
+            if os.stat(self.root).st_dev == device:
+                root = self.root
+            else:
+                root = self._mount_trash(parent, device)
+            self._roots[device] = root
+        return root
+
+    def _mount_trash(self, directory: str, device: int) -> Path:
+        """
+        создание корзины .Trash-<uid> в точке монтирования файловой системы директории
+        Args:
+            directory (str): абсолютный путь до директории на этой файловой системе
+            device (int): st_dev файловой системы
+        Returns:
+            Path: корзина файловой системы или центральная, если создать ее не удалось
+        """
+        mount = directory
+        while (upper := os.path.dirname(mount)) != mount and os.stat(upper).st_dev == device:
+            mount = upper
+        root = Path(mount) / f".Trash-{os.getuid() if hasattr(os, 'getuid') else 0}"
+        try:
+            os.makedirs(root, mode=0o700, exist_ok=True)
+            if os.stat(root).st_dev != device: # точка монтирования определена неверно (например, bind mount)
+                return self.root
+        except OSError:
+            return self.root
+        return root
+
+    def put(self, path: str | Path, progress: Progress | None = None, batch: int | None = None) -> TrashEntry:
+        """
+        перемещение элемента в корзину его файловой системы и запись в журнал
+        Args:
+            path (str | Path): удаляемый путь
+            progress (Progress | None): счетчики прогресса, если данные приходится копировать
+            batch (int | None): номер группы удаления (для undo), None - новая группа из одного элемента
+        Returns:
+            TrashEntry: запись о перемещенном элементе
+        Raises:
+            OSError: если элемент не удалось переместить
+        """
+        entries, errors = self.put_many([path], progress, batch)
+        if errors:
+            raise errors[0][1]
+        return entries[0]
+
+    def put_many(self, paths: list[str | Path], progress: Progress | None = None,
+                 batch: int | None = None) -> tuple[list[TrashEntry], list[tuple[str, OSError]]]:
+        """
+        перемещение группы элементов в корзину одной операцией (для undo они образуют одну группу)
+        журнал дочитывается один раз, корзина определяется один раз для каждой исходной директории,
+        записи дописываются в журнал блоками по JOURNAL_BATCH, а не по одной
+        если имя в корзине занято, к нему добавляется номер записи (name.~id~)
+        ошибки отдельных элементов не прерывают перемещение остальных
+        Args:
+            paths (list[str | Path]): удаляемые пути
+            progress (Progress | None): счетчики прогресса, если данные приходится копировать
+            batch (int | None): номер группы удаления, None - новая группа
+        Returns:
+            tuple[list[TrashEntry], list[tuple[str, OSError]]]: записи перемещенных элементов и ошибки
+        """
+        entries = []
+        errors = []
+        records = []
+        directories = []
+        roots = {} # исходная директория -> корзина
+        with self._lock:
+            self._sync()
+            batch = batch if batch is not None else self._new_id()
+            try:
+                for path in paths:
+                    source = os.path.abspath(path)
+                    try:
+                        parent = os.path.dirname(source)
+                        root = roots.get(parent)
+                        if root is None:
+                            root = roots[parent] = self.root_for(source)
+                        info = os.lstat(source)
+                        entry_id = self._new_id()
+                        name = os.path.basename(source)
+                        if os.path.lexists(root / name):
+                            name = f"{name}.~{entry_id}~"
+                        directory = stat.S_ISDIR(info.st_mode)
+                        # размер директории считается в фоне, чтобы не обходить ее во время удаления
+                        entry = TrashEntry(entry_id, source, str(root), name, time.time(),
+                                           0 if directory else info.st_size, batch)
+                        try:
+                            os.rename(source, entry.stored)
+                        except OSError as e:
+                            if e.errno != errno.EXDEV: # элемент - точка монтирования, переименовать его нельзя
+                                raise
+                            move(source, entry.stored, progress=progress)
+                    except OSError as e:
+                        errors.append((str(path), e))
+                        continue
+                    entries.append(entry)
+                    records.append(entry.record())
+                    if directory:
+                        directories.append(entry)
+                    if len(records) >= JOURNAL_BATCH:
+                        self._append(records)
+                        records = []
+            finally:
+                if records: # перемещенные элементы записываются и при прерывании
+                    self._append(records)
+        for entry in directories:
+            self._submit(lambda entry=entry: self._measure(entry))
+        config = self.config()
+        if config["compression"] is not None:
+            directories = set(directories)
+            for entry in entries:
+                if entry not in directories and entry.size >= config["compression_min_size"]:
+                    self._submit(lambda entry=entry: self._compress(entry, config["compression"],
+                                                                    config["compression_level"]))
+        return entries, errors
+
+    def new_batch(self) -> int:
+        """
+        номер для группы элементов, удаляемых одной командой
+        Returns:
+            int: номер группы
+        """
+        with self._lock:
+            return self._new_id()
+
+    def find(self, path: str | Path) -> TrashEntry | None:
+        """
+        последняя запись об удалении элемента с этим исходным путем
+        Args:
+            path (str | Path): исходный путь
+        Returns:
+            TrashEntry | None: запись или None, если такого элемента в корзине нет
+        """
+        with self._lock:
+            self._sync()
+            ids = self._by_path.get(os.path.abspath(path))
+            return self._entries[ids[-1]] if ids else None
+
+    def entries(self) -> list[TrashEntry]:
+        """
+        все записи корзины в порядке удаления
+        Returns:
+            list[TrashEntry]: записи
+        """
+        with self._lock:
+            self._sync()
+            return list(self._entries.values())
+
+    def last_batch(self) -> list[TrashEntry]:
+        """
+        записи последней группы удаления, которая еще есть в корзине
+        Returns:
+            list[TrashEntry]: записи группы (пустой список, если корзина пуста)
+        """
+        with self._lock:
+            self._sync()
+            if not self._entries:
+                return []
+            batch = self._entries[next(reversed(self._entries))].batch
+            return [entry for entry in self._entries.values() if entry.batch == batch]
+
+    def restore(self, entry: TrashEntry) -> Path:
+        """
+        возвращение элемента по исходному пути
+        Args:
+            entry (TrashEntry): запись корзины
+        Returns:
+            Path: восстановленный путь
+        Raises:
+            FileExistsError: если исходный путь занят
+        """
+        with self._lock:
+            if entry.id in self._evicting:
+                raise FileNotFoundError(errno.ENOENT, "removed from trash by quota", entry.path)
+            if os.path.lexists(entry.path):
+                raise FileExistsError(errno.EEXIST, "file already exists", entry.path)
+            os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+            if entry.compression is not None:
+                self._decompress(entry)
+            else:
+                try:
+                    os.rename(entry.stored, entry.path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV: # элемент был скопирован в центральную корзину с другого устройства
+                        raise
+                    move(entry.stored, entry.path)
+            self._append([{"op": "del", "id": entry.id}])
+            return Path(entry.path)
+
+    def _compress(self, entry: TrashEntry, compression: str, level: int):
+        """
+        сжатие файла в корзине (в фоновом потоке)
+        архив пишется во временный файл без блокировки, затем под блокировкой, если элемент все еще в корзине,
+        переименовывается на место и исходный файл удаляется, поэтому восстановление во время сжатия безопасно
+        Args:
+            entry (TrashEntry): запись корзины
+            compression (str): способ сжатия
+            level (int): уровень сжатия
+        """
+        open_archive, suffix, _ = COMPRESSORS[compression]
+        source = entry.stored
+        tmp = source.with_name(f"{entry.name}{suffix}.tmp")
+        try:
+            with open(source, 'rb') as fsrc, open_archive(tmp, 'wb', level) as fdst:
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+            shutil.copystat(source, tmp)
+            with self._lock:
+                self._sync()
+                if entry.id not in self._entries or entry.id in self._evicting or entry.compression is not None:
+                    os.unlink(tmp)
+                    return
+                name = f"{entry.name}{suffix}"
+                if os.path.lexists(source.with_name(name)):
+                    name = f"{entry.name}.~{entry.id}~{suffix}"
+                os.replace(tmp, source.with_name(name))
+                os.unlink(source)
+                self._append([{"op": "compress", "id": entry.id, "name": name, "compression": compression,
+                               "size": os.lstat(source.with_name(name)).st_size}])
+        except BaseException:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _decompress(self, entry: TrashEntry):
+        """
+        восстановление сжатого файла: распаковка во временный файл рядом с исходным путем,
+        затем атомарное переименование и удаление архива
+        Args:
+            entry (TrashEntry): запись корзины со сжатым файлом
+        """
+        open_archive = COMPRESSORS[entry.compression][0]
+        tmp = f"{entry.path}.restore.tmp"
+        try:
+            with open_archive(entry.stored, 'rb', None) as fsrc, open(tmp, 'xb') as fdst:
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+            shutil.copystat(entry.stored, tmp)
+            os.replace(tmp, entry.path)
+        except BaseException:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            raise
+        os.unlink(entry.stored)
+
+    def _new_id(self) -> int:
+        """
+        уникальный возрастающий номер записи на основе времени в наносекундах
+        """
+        self._last_id = max(time.time_ns(), self._last_id + 1)
+        return self._last_id
+
+    def config(self) -> dict:
+        """
+        настройки корзины
+        Returns:
+            dict: max_size (байты) и max_age (секунды), None - без ограничения,
+                  compression (gzip, lzma или None), compression_level и compression_min_size (байты)
+        """
+        config = {"max_size": None, "max_age": None, "compression": None,
+                  "compression_level": COMPRESSION_LEVEL, "compression_min_size": COMPRESSION_MIN_SIZE}
+        try:
+            with open(self.root / CONFIG_NAME) as file:
+                config.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+        return config
+
+    def configure(self, **values):
+        """
+        изменение настроек корзины (атомарная запись через временный файл)
+        Args:
+            **values: новые значения настроек
+        """
+        config = {**self.config(), **values}
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.root / f"{CONFIG_NAME}.tmp"
+        with open(tmp, 'w') as file:
+            json.dump(config, file)
+        os.replace(tmp, self.root / CONFIG_NAME)
+
+    def maintain(self):
+        """
+        проверка квоты за O(1) по размеру из индекса и времени старейшего элемента,
+        при превышении удаление старейших элементов ставится в очередь фонового потока
+        """
+        config = self.config()
+        if config["max_size"] is None and config["max_age"] is None:
+            return
+        with self._lock:
+            self._sync()
+            if self._over_quota(config, self._total_size, next(iter(self._entries.values()), None)):
+                self._submit(self._evict)
+
+    def wait(self):
+        """
+        ожидание завершения фоновой работы
+        """
+        while (worker := self._worker) is not None and worker.is_alive():
+            worker.join()
+
+    def _over_quota(self, config: dict, total_size: int, oldest: TrashEntry | None) -> bool:
+        """
+        превышена ли квота при данном размере корзины и старейшем элементе
+        """
+        if oldest is None:
+            return False
+        if config["max_size"] is not None and total_size > config["max_size"]:
+            return True
+        return config["max_age"] is not None and oldest.time < time.time() - config["max_age"]
+
+    def _submit(self, job):
+        """
+        постановка работы в очередь фонового потока (поток запускается, если не работает)
+        поток не фоновый в смысле daemon: при выходе из программы начатая работа завершается
+        """
+        with self._lock:
+            self._jobs.append(job)
+            if self._worker is None or not self._worker.is_alive(): # поток мог завершиться аварийно
+                self._worker = threading.Thread(target=self._work, name="trash-worker")
+                self._worker.start()
+
+    def _work(self):
+        """
+        цикл фонового потока: выполняет работу, пока очередь не опустеет
+        ошибка одной работы не останавливает поток, иначе следующие работы в очереди не выполнились бы
+        """
+        try:
+            while True:
+                with self._lock:
+                    if not self._jobs:
+                        self._worker = None # под блокировкой: _submit после этого запустит новый поток
+                        return
+                    job = self._jobs.popleft()
+                try:
+                    job()
+                except OSError: # элемент мог быть восстановлен или удален вручную
+                    pass
+                except Exception: # ошибка сжатия (LZMAError, EOFError) или непредвиденная ошибка
+                    logging.getLogger(__name__).exception("trash: background job failed")
+        finally:
+            with self._lock:
+                if self._worker is threading.current_thread():
+                    self._worker = None
+
+    def _measure(self, entry: TrashEntry):
+        """
+        подсчет размера директории в корзине и запись его в журнал (в фоновом потоке)
+        """
+        size = scan_size([entry.stored])[0]
+        with self._lock:
+            self._sync()
+            if entry.id in self._entries:
+                self._append([{"op": "size", "id": entry.id, "size": size}])
+        self.maintain()
+
+    def _evict(self):
+        """
+        окончательное удаление старейших элементов, пока квота превышена (в фоновом потоке)
+        записи выбираются под блокировкой, данные удаляются без нее, чтобы не задерживать rm
+        """
+        config = self.config()
+        with self._lock:
+            self._sync()
+            total_size = self._total_size
+            victims = []
+            for entry in self._entries.values(): # в порядке удаления, старейшие первыми
+                if entry.id in self._evicting:
+                    continue
+                if not self._over_quota(config, total_size, entry):
+                    break
+                victims.append(entry)
+                total_size -= entry.size
+            self._evicting.update(entry.id for entry in victims)
+        try:
+            for entry in victims:
+                if os.path.isdir(entry.stored) and not os.path.islink(entry.stored):
+                    shutil.rmtree(entry.stored, ignore_errors=True)
+                elif os.path.lexists(entry.stored):
+                    os.unlink(entry.stored)
+        finally:
+            with self._lock:
+                self._append([{"op": "del", "id": entry.id} for entry in victims])
+                self._evicting.difference_update(entry.id for entry in victims)
+
+    def _apply(self, record: dict):
+        """
+        применение записи журнала к индексу в памяти
+        """
+        if record["op"] == "add":
+            entry = TrashEntry(**{key: record[key] for key in TrashEntry.__slots__ if key in record})
+            self._entries[entry.id] = entry
+            self._by_path.setdefault(entry.path, []).append(entry.id)
+            self._total_size += entry.size
+            self._last_id = max(self._last_id, entry.id)
+        elif record["op"] == "size":
+            entry = self._entries.get(record["id"])
+            if entry is not None:
+                self._total_size += record["size"] - entry.size
+                entry.size = record["size"]
+                self._dead += 1 # при перезаписи журнала размер входит в запись добавления
+        elif record["op"] == "compress":
+            entry = self._entries.get(record["id"])
+            if entry is not None:
+                self._total_size += record["size"] - entry.size
+                entry.size = record["size"]
+                entry.name = record["name"]
+                entry.compression = record["compression"]
+                self._dead += 1
+        elif record["op"] == "del":
+            entry = self._entries.pop(record["id"], None)
+            if entry is not None:
+                ids = self._by_path[entry.path]
+                ids.remove(entry.id)
+                if not ids:
+                    del self._by_path[entry.path]
+                self._total_size -= entry.size
+                self._dead += 2 # запись добавления и запись удаления
+
+    def _sync(self):
+        """
+        чтение новых строк журнала (весь журнал - при первом вызове или если он был переписан)
+        """
+        try:
+            info = os.stat(self.index_path)
+        except FileNotFoundError:
+            if self._index_state is not None:
+                self._reset()
+            return
+        if self._index_state is None or self._index_state[0] != info.st_ino or info.st_size < self._index_state[1]:
+            self._reset()
+            self._index_state = (info.st_ino, 0)
+        offset = self._index_state[1]
+        if info.st_size == offset:
+            return
+        with open(self.index_path, 'rb') as file:
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1 # незаконченная строка дочитывается при следующем вызове
+        for line in data[:end].splitlines():
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except ValueError: # строка, оборванная при аварийном завершении, удаляется при перезаписи журнала
+                    self._dead += 1
+                    continue
+                self._apply(record)
+        self._index_state = (info.st_ino, offset + end)
+
+    def _reset(self):
+        """
+        очистка индекса в памяти
+        """
+        self._entries.clear()
+        self._by_path.clear()
+        self._total_size = 0
+        self._dead = 0
+        self._index_state = None
+
+    def _append(self, records: list[dict]):
+        """
+        дописывание записей в журнал и их применение через чтение журнала,
+        чтобы не пропустить записи других процессов, добавленные между операциями
+        если журнал заканчивается оборванной строкой, записи начинаются с новой строки
+        """
+        os.makedirs(self.root, exist_ok=True)
+        data = "".join(json.dumps(record) + "\n" for record in records).encode()
+        with self._journal_lock():
+            with open(self.index_path, 'a+b') as file:
+                if file.seek(0, os.SEEK_END) > 0:
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        data = b"\n" + data
+                file.write(data)
+            self._sync()
+            if self._dead >= COMPACT_MIN_RECORDS and self._dead > len(self._entries):
+                self._compact()
+
+    @contextlib.contextmanager
+    def _journal_lock(self):
+        """
+        межпроцессная блокировка журнала через flock на отдельном файле
+        (журнал заменяется при перезаписи, поэтому блокировка на нем самом не работала бы)
+        """
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.root / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd) # закрытие снимает блокировку
+
+    def _compact(self):
+        """
+        перезапись журнала только актуальными записями через временный файл и os.replace
+        выполняется под блокировкой журнала после его дочитывания, поэтому записи других процессов не теряются
+        """
+        tmp = self.root / f"{INDEX_NAME}.tmp"
+        with open(tmp, 'w') as file:
+            file.write("".join(json.dumps(entry.record()) + "\n" for entry in self._entries.values()))
+        os.replace(tmp, self.index_path)
+        self._dead = 0
+        info = os.stat(self.index_path)
+        self._index_state = (info.st_ino, info.st_size)
+
+
+_instances = {} # абсолютный путь центральной корзины -> общий объект Trash
+_instances_lock = threading.Lock()
+
+
+def get_trash(root: str | Path = TRASH_DIR) -> Trash:
+    """
+    общий для процесса объект корзины: блокировки, фоновый поток и индекс в памяти не дублируются
+    Args:
+        root (str | Path): путь до центральной корзины
+    Returns:
+        Trash: объект корзины
+    """
+    key = os.path.abspath(root)
+    with _instances_lock:
+        trash = _instances.get(key)
+        if trash is None:
+            trash = _instances[key] = Trash(root)
+        return trash
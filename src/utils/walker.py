@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from collections.abc import Iterator
+
+DEFAULT_WORKERS = 8
+
+
+def descends(depth: int, max_depth: int | None) -> bool:
+    """
+    проверка, нужно ли выводить содержимое поддиректорий директории на глубине depth
+    Args:
+        depth (int): глубина директории (корень - 0)
+        max_depth (int | None): максимальное количество выводимых уровней, None - без ограничения
+    Returns:
+        bool: True если поддиректории будут прочитаны
+    """
+    return max_depth is None or depth + 1 < max_depth
+
+
+def entry_stat(entry: os.DirEntry) -> os.stat_result:
+    """
+    stat элемента директории: для ссылки - stat цели, для битой ссылки - stat самой ссылки
+    """
+    try:
+        return entry.stat()
+    except FileNotFoundError: # битая символическая ссылка
+        return entry.stat(follow_symlinks=False)
+
+
+def _scan(pool: ThreadPoolExecutor, path: Path, depth: int, max_depth: int | None, with_stat: bool = False):
+    """
+    чтение одной директории в потоке пула
+    сразу после чтения в пул отправляются ее поддиректории, поэтому обход идет на полной скорости,
+    не дожидаясь вывода
+    Args:
+        pool (ThreadPoolExecutor): пул потоков обхода
+        path (Path): путь до директории
+        depth (int): глубина директории
+        max_depth (int | None): максимальное количество выводимых уровней
+        with_stat (bool): добавить к каждому элементу его stat (выполняется в этом же потоке пула)
+    Returns:
+        tuple: отсортированный список (имя, является_директорией[, stat]) или None при ошибке доступа,
+               и список (путь, future) для поддиректорий
+    """
+    try:
+        with os.scandir(path) as entries:
+            # символические ссылки на директории не раскрываются, чтобы не попасть в цикл
+            if with_stat:
+                listing = sorted((entry.name, entry.is_dir(follow_symlinks=False), entry_stat(entry))
+                                 for entry in entries)
+            else:
+                listing = sorted((entry.name, entry.is_dir(follow_symlinks=False)) for entry in entries)
+    except OSError:
+        return None, []
+
+    children = []
+    if descends(depth, max_depth):
+        for name, is_dir, *_ in listing:
+            if is_dir:
+                children.append((path / name, pool.submit(_scan, pool, path / name, depth + 1, max_depth, with_stat)))
+    return listing, children
+
+
+def walk_parallel(root: str | Path, max_depth: int | None = None, workers: int = DEFAULT_WORKERS,
+                  with_stat: bool = False) -> Iterator[tuple[Path, int, list[tuple] | None]]:
+    """
+    параллельный обход дерева директорий через os.scandir в пуле потоков (scandir отпускает GIL)
+    директории читаются одновременно, но выдаются в детерминированном порядке:
+    обход в глубину, элементы каждой директории отсортированы по имени
+    Args:
+        root (str | Path): корень обхода
+        max_depth (int | None): максимальное количество выводимых уровней, None - без ограничения
+        workers (int): количество потоков
+        with_stat (bool): получать stat каждого элемента в потоках пула (для подробного вывода)
+    Yields:
+        tuple: путь до директории, ее глубина и отсортированный список (имя, является_директорией),
+               с with_stat=True - (имя, является_директорией, stat),
+               вместо списка None, если директорию не удалось прочитать
+    """
+    root = Path(root)
+    pool = ThreadPoolExecutor(max_workers=max(workers, 1))
+    try:
+        stack = [(root, 0, pool.submit(_scan, pool, root, 0, max_depth, with_stat))]
+        while stack:
+            path, depth, future = stack.pop()
+            listing, children = future.result()
+            yield path, depth, listing
+            stack.extend((child, depth + 1, child_future) for child, child_future in reversed(children))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
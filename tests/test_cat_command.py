@@ -1,5 +1,5 @@
+import os
 import pytest
-from unittest.mock import patch
 
 from commands.cat import CatCommand
 
@@ -30,22 +30,101 @@ class TestCatCommand:
         """Тест имени команды"""
         assert command.name == "cat"
 
-    def test_cat_file_successfully(self, command, setup_filesystem):
+    def test_cat_file_successfully(self, command, setup_filesystem, capsysbinary):
         """Тест: успешный вывод содержимого файла"""
-        with patch('builtins.print') as mock_print:
-            command.execute(["test/file1.txt"], [])
+        command.execute(["test/file1.txt"], [])
 
-            # Проверяем, что содержимое файла было выведено
-            mock_print.assert_called_once_with("Hello, World!\nThis is file1.")
+        # Проверяем, что содержимое файла было выведено без изменений
+        assert capsysbinary.readouterr().out == b"Hello, World!\nThis is file1."
 
-    def test_cat_empty_file(self, command, setup_filesystem):
+    def test_cat_empty_file(self, command, setup_filesystem, capsysbinary):
         """Тест: вывод пустого файла"""
-        with patch('builtins.print') as mock_print:
-            command.execute(["/test/empty.txt"], [])
+        command.execute(["/test/empty.txt"], [])
 
-            # Проверяем, что была выведена пустая строка
-            mock_print.assert_called_once_with("")
+        # Проверяем, что ничего не было выведено
+        assert capsysbinary.readouterr().out == b""
 
+    def test_cat_text_mode(self, command, setup_filesystem, capsys):
+        """Тест: вывод содержимого файла через текстовый stdout с флагом --text"""
+        command.execute(["/test/file2.txt"], ["text"])
+
+        assert capsys.readouterr().out == "Content of file2"
+
+    def test_cat_reads_in_chunks(self, setup_filesystem, capsysbinary):
+        """Тест: файл больше размера блока выводится полностью"""
+        setup_filesystem.create_file("/test/big.txt", contents="0123456789" * 100)
+        command = CatCommand(chunk_size=7)
+
+        command.execute(["/test/big.txt"], [])
+
+        assert capsysbinary.readouterr().out == b"0123456789" * 100
+
+    # pyfakefs не потокобезопасен, поэтому тесты с пулом предварительного чтения работают с настоящими файлами
+    @pytest.fixture
+    def real_files(self, tmp_path):
+        """Фикстура с файлами во временной директории"""
+        (tmp_path / "file1.txt").write_text("Hello, World!\nThis is file1.")
+        (tmp_path / "file2.txt").write_text("Content of file2")
+        (tmp_path / "empty.txt").write_text("")
+        return tmp_path
+
+    def test_cat_multiple_files(self, command, real_files, capsysbinary):
+        """Тест: несколько файлов выводятся подряд в порядке аргументов"""
+        command.execute([str(real_files / name) for name in ("file2.txt", "empty.txt", "file1.txt")], [])
+
+        assert capsysbinary.readouterr().out == b"Content of file2Hello, World!\nThis is file1."
+
+    def test_cat_glob_pattern(self, command, real_files, capsysbinary):
+        """Тест: шаблон раскрывается в отсортированный список файлов"""
+        command.execute([str(real_files / "file*.txt")], [])
+
+        assert capsysbinary.readouterr().out == b"Hello, World!\nThis is file1.Content of file2"
+
+    def test_cat_order_is_deterministic_with_small_budget(self, tmp_path, capsysbinary):
+        """Тест: порядок вывода сохраняется при любой глубине и бюджете предварительного чтения"""
+        paths = []
+        for i in range(30):
+            (tmp_path / f"{i:02}.txt").write_text(f"<{i}>" * (i + 1))
+            paths.append(str(tmp_path / f"{i:02}.txt"))
+        command = CatCommand(chunk_size=3)
+
+        command.execute(paths, ["prefetch=4", "budget=10"])
+
+        expected = "".join(f"<{i}>" * (i + 1) for i in range(30)).encode()
+        assert capsysbinary.readouterr().out == expected
+
+    def test_cat_missing_file_among_many_raises_error(self, command, real_files, capsysbinary):
+        """Тест: несуществующий файл среди нескольких вызывает FileNotFoundError после вывода предыдущих"""
+        paths = [str(real_files / name) for name in ("file2.txt", "missing.txt", "file1.txt")]
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: no such file or directory: missing.txt"):
+            command.execute(paths, [])
+
+        assert capsysbinary.readouterr().out == b"Content of file2"
+
+    def test_cat_invalid_prefetch_raises_error(self, command, setup_filesystem):
+        """Тест: некорректная глубина предварительного чтения вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["/test/file1.txt"], ["prefetch=many"])
+
+    def test_cat_sendfile_to_pipe(self, tmp_path):
+        """Тест: копирование файла в канал средствами ядра"""
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(b"abc" * 1000)
+        command = CatCommand(chunk_size=512)
+
+        read_fd, write_fd = os.pipe()
+        try:
+            with open(file_path, 'rb') as file, open(write_fd, 'wb', closefd=False) as output:
+                assert command._sendfile(file, output)
+            os.close(write_fd)
+            with open(read_fd, 'rb') as reader:
+                assert reader.read() == b"abc" * 1000
+        finally:
+            for fd in (read_fd, write_fd):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
 
     def test_cat_nonexistent_file_raises_error(self, command, setup_filesystem):
         """Тест: вывод несуществующего файла вызывает FileNotFoundError"""
@@ -1,8 +1,12 @@
+import sys
+import threading
+
 import pytest
 from unittest.mock import Mock, patch
 
 
 from core import ShellCore  # замените your_module на актуальный путь
+from src.utils.registry import MANIFEST_NAME, CommandRegistry, discover_commands
 
 
 class TestShellCore:
@@ -74,3 +78,100 @@ class TestShellCore:
         assert "test_command" in shell_core.commands
         assert shell_core.commands["test_command"] == mock_command
 
+
+    def test_auto_discover_does_not_import_commands(self, shell_core):
+        """Тест: поиск команд не импортирует их модули, модуль загружается при первом вызове команды"""
+        sys.modules.pop("commands.tree", None)
+
+        shell_core.auto_discover_commands()
+
+        assert {"cat", "ls", "rm", "tree"} <= set(shell_core.commands)
+        assert "tree" in shell_core.commands
+        assert "commands.tree" not in sys.modules
+        assert shell_core.commands["tree"].name == "tree"
+        assert "commands.tree" in sys.modules
+
+    def test_manifest_is_reused_until_commands_change(self, tmp_path):
+        """Тест: манифест читается повторно без разбора модулей и обновляется при изменении папки команд"""
+        (tmp_path / "hello.py").write_text(
+            "class HelloCommand:\n    @property\n    def name(self):\n        return 'hello'\n")
+
+        assert discover_commands(tmp_path, "pkg") == {"hello": ("pkg.hello", "HelloCommand")}
+        assert (tmp_path / "__pycache__" / MANIFEST_NAME).exists()
+        with patch("src.utils.registry._scan_module") as scan_module:
+            assert discover_commands(tmp_path, "pkg") == {"hello": ("pkg.hello", "HelloCommand")}
+        scan_module.assert_not_called()
+
+        (tmp_path / "bye.py").write_text(
+            "class ByeCommand:\n    @property\n    def name(self):\n        return 'bye'\n")
+        assert discover_commands(tmp_path, "pkg") == {"bye": ("pkg.bye", "ByeCommand"),
+                                                      "hello": ("pkg.hello", "HelloCommand")}
+
+    def test_lazy_command_is_loaded_once_from_threads(self, tmp_path, monkeypatch):
+        """Тест: два потока, одновременно обращающиеся к незагруженной команде, получают один экземпляр"""
+        (tmp_path / "slow_command.py").write_text(
+            "import time\ntime.sleep(0.2)\n\nclass SlowCommand:\n    name = 'slow'\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        registry = CommandRegistry()
+        registry.add_lazy("slow", "slow_command", "SlowCommand")
+        results, errors = [], []
+
+        def load():
+            try:
+                results.append(registry["slow"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=load) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sys.modules.pop("slow_command", None)
+
+        assert errors == []
+        assert len(results) == 2 and results[0] is results[1]
+
+    def test_execute_command_returns_status(self, shell_core, mock_command):
+        """Тест: код завершения 0 при успехе и 1 при ошибке"""
+        shell_core.register_command(mock_command)
+
+        assert shell_core.execute_command("test_command\n") == 0
+        with patch('builtins.print'):
+            assert shell_core.execute_command("missing\n") == 1
+
+    def test_arguments_split_like_shlex(self, shell_core, mock_command):
+        """Тест: строка без кавычек делится только по пробелам, табуляции и переводам строк, как в shlex"""
+        shell_core.register_command(mock_command)
+
+        shell_core.execute_command("test_command  report\xa0final.txt\tform\x0cfeed -l\n")
+
+        mock_command.execute.assert_called_once_with(["report\xa0final.txt", "form\x0cfeed"], ["l"])
+
+    def test_execute_script_skips_comments_and_blank_lines(self, shell_core, mock_command):
+        """Тест: пакетное выполнение пропускает пустые строки и комментарии и не выводит пустых строк"""
+        shell_core.register_command(mock_command)
+
+        with patch('builtins.print') as mock_print:
+            status = shell_core.execute_script(["#!/bin/shell\n", "\n", "test_command a\n", "test_command b"])
+
+        assert status == 0
+        assert mock_command.execute.call_count == 2
+        mock_print.assert_not_called()
+
+    def test_set_e_stops_script_on_error(self, shell_core, mock_command):
+        """Тест: после set -e выполнение останавливается на первой ошибке, set +e возвращает обычный режим"""
+        shell_core.register_command(mock_command)
+        mock_command.execute.side_effect = [None, OSError("failed"), None]
+
+        with patch('builtins.print'):
+            assert shell_core.execute_script(["test_command\n", "test_command\n", "test_command\n"]) == 0
+            assert mock_command.execute.call_count == 3
+
+            mock_command.execute.side_effect = [OSError("failed"), None]
+            status = shell_core.execute_script(["set -e\n", "test_command\n", "test_command\n"])
+        assert status == 1
+        assert mock_command.execute.call_count == 4
+
+        shell_core.execute_command("set +e\n")
+        assert not shell_core.errexit
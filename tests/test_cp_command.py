@@ -1,7 +1,14 @@
+import errno
+import os
+import shutil
+import threading
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 from commands.cp import CpCommand
+from src.utils import fastcopy
+from src.utils.fastcopy import copy_file, copy_file_resumable
 
 
 class TestCpCommand:
@@ -111,3 +118,372 @@ class TestCpCommand:
             command.execute(["source/dir1", "target"], [])
 
 
+    # pyfakefs не потокобезопасен, поэтому параллельное копирование проверяется на настоящих файлах
+    @pytest.fixture
+    def real_tree(self, tmp_path):
+        """Фикстура с деревом файлов во временной директории"""
+        source = tmp_path / "source" / "dir1"
+        (source / "subdir" / "deeper").mkdir(parents=True)
+        (source / "subfile1.txt").write_text("subcontent1")
+        (source / "subdir" / "deepfile.txt").write_text("deep content")
+        for i in range(20):
+            (source / "subdir" / "deeper" / f"file{i}.txt").write_text(f"content {i}")
+        os.utime(source / "subfile1.txt", (1_000_000, 1_000_000))
+        (tmp_path / "target").mkdir()
+        return tmp_path
+
+    def test_copy_directory_in_parallel(self, command, real_tree):
+        """Тест: параллельное рекурсивное копирование с -j N"""
+        source = real_tree / "source" / "dir1"
+        target = real_tree / "target" / "dir1"
+
+        command.execute(["4", str(source), str(real_tree / "target")], ['r', 'j'])
+
+        assert (target / "subfile1.txt").read_text() == "subcontent1"
+        assert (target / "subdir" / "deepfile.txt").read_text() == "deep content"
+        assert sorted(p.name for p in (target / "subdir" / "deeper").iterdir()) == \
+            sorted(f"file{i}.txt" for i in range(20))
+        # метаданные сохраняются, как у copy2
+        assert (target / "subfile1.txt").stat().st_mtime == 1_000_000
+
+    def test_copy_directory_in_parallel_with_jobs_option(self, command, real_tree):
+        """Тест: количество потоков задается через --jobs=N"""
+        command.execute([str(real_tree / "source" / "dir1"), str(real_tree / "target")], ['r', "jobs=2"])
+
+        assert (real_tree / "target" / "dir1" / "subdir" / "deeper" / "file19.txt").read_text() == "content 19"
+
+    def test_copy_in_parallel_aggregates_errors(self, command, real_tree):
+        """Тест: ошибки отдельных файлов собираются, остальные файлы копируются"""
+        original_copy2 = shutil.copy2
+
+        def failing_copy2(src, dst):
+            if str(src).endswith("file3.txt") or str(src).endswith("file7.txt"):
+                raise PermissionError(13, "Permission denied")
+            return original_copy2(src, dst)
+
+        with patch("commands.cp.shutil.copy2", failing_copy2):
+            with pytest.raises(OSError, match="failed to copy 2 items") as exc_info:
+                command.execute(["3", str(real_tree / "source" / "dir1"), str(real_tree / "target")], ['r', 'j'])
+
+        assert "file3.txt: Permission denied" in str(exc_info.value)
+        deeper = real_tree / "target" / "dir1" / "subdir" / "deeper"
+        assert len(list(deeper.iterdir())) == 18
+
+    def test_copy_in_parallel_keeps_symlinks(self, command, tmp_path):
+        """Тест: ссылка на директорию и битая ссылка копируются ссылками, остальные элементы после них копируются"""
+        source = tmp_path / "src"
+        (source / "sub").mkdir(parents=True)
+        (source / "a").write_text("a")
+        (source / "sub" / "inner.txt").write_text("inner")
+        (source / "zz").write_text("zz")
+        (source / "dir_link").symlink_to(source / "sub")
+        (source / "broken").symlink_to(tmp_path / "missing")
+        (tmp_path / "dst").mkdir()
+
+        for options in (['r', "jobs=2"], ['r', 'update']):
+            command.execute([str(source), str(tmp_path / "dst")], options)
+
+        target = tmp_path / "dst" / "src"
+        assert os.readlink(target / "dir_link") == str(source / "sub")
+        assert os.readlink(target / "broken") == str(tmp_path / "missing")
+        assert (target / "a").read_text() == "a"
+        assert (target / "zz").read_text() == "zz"
+        assert (target / "sub" / "inner.txt").read_text() == "inner"
+
+    def test_invalid_jobs_raises_error(self, command):
+        """Тест: некорректное количество потоков вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["zero", "src", "dst"], ['r', 'j'])
+
+    def test_kernel_copy_preserves_content_and_metadata(self, tmp_path):
+        """Тест: копирование силами ядра сохраняет содержимое и время изменения"""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+        os.utime(source, (1_000_000, 1_000_000))
+
+        method = copy_file(source, tmp_path / "copy.bin", reflink="never", chunk_size=1024 * 1024)
+
+        assert method in ("copy_file_range", "read_write")
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+        assert (tmp_path / "copy.bin").stat().st_mtime == 1_000_000
+
+    def test_kernel_copy_into_directory(self, tmp_path):
+        """Тест: если назначение - директория, то файл копируется в нее под своим именем"""
+        (tmp_path / "file.txt").write_text("content")
+        (tmp_path / "target").mkdir()
+
+        copy_file(tmp_path / "file.txt", tmp_path / "target")
+
+        assert (tmp_path / "target" / "file.txt").read_text() == "content"
+
+    def test_kernel_copy_keeps_holes_of_sparse_file(self, tmp_path):
+        """Тест: дыры разреженного файла не заполняются при копировании"""
+        source = tmp_path / "sparse.img"
+        with open(source, "wb") as file:
+            file.truncate(16 * 1024 * 1024)
+            file.seek(8 * 1024 * 1024)
+            file.write(b"data" * 1024)
+        if source.stat().st_blocks * 512 >= source.stat().st_size:
+            pytest.skip("файловая система не поддерживает разреженные файлы")
+
+        copy_file(source, tmp_path / "copy.img", reflink="never")
+
+        copy_stat = (tmp_path / "copy.img").stat()
+        assert copy_stat.st_size == 16 * 1024 * 1024
+        assert copy_stat.st_blocks * 512 < 1024 * 1024
+        assert (tmp_path / "copy.img").read_bytes() == source.read_bytes()
+
+    def test_kernel_copy_falls_back_when_copy_file_range_unsupported(self, tmp_path):
+        """Тест: при ошибке copy_file_range копирование продолжается через pread/pwrite"""
+        source = tmp_path / "file.bin"
+        source.write_bytes(b"abc" * 100000)
+
+        with patch("os.copy_file_range", side_effect=OSError(errno.EXDEV, "cross-device")):
+            method = copy_file(source, tmp_path / "copy.bin", reflink="never")
+
+        assert method == "read_write"
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+    def test_reflink_always_without_support_raises_error(self, command, tmp_path):
+        """Тест: --reflink=always на файловой системе без reflink вызывает OSError"""
+        (tmp_path / "file.txt").write_text("content")
+
+        with patch("src.utils.fastcopy._reflink", return_value=False):
+            with pytest.raises(OSError, match="reflink is not supported"):
+                command.execute([str(tmp_path / "file.txt"), str(tmp_path / "copy.txt")], ["reflink=always"])
+
+    def test_copy_file_to_itself_keeps_source(self, command, tmp_path):
+        """Тест: копирование большого файла в его же директорию вызывает SameFileError и не обрезает файл"""
+        data = os.urandom(2 * 1024 * 1024)
+        (tmp_path / "big.bin").write_bytes(data)
+
+        with pytest.raises(shutil.SameFileError):
+            command.execute([str(tmp_path / "big.bin"), str(tmp_path)], [])
+        with pytest.raises(shutil.SameFileError):
+            copy_file(tmp_path / "big.bin", tmp_path / "big.bin", reflink="never")
+
+        assert (tmp_path / "big.bin").read_bytes() == data
+
+    def test_reflink_always_without_support_keeps_destination(self, tmp_path):
+        """Тест: неудачный --reflink=always не обрезает существующую копию и не создает пустую"""
+        (tmp_path / "file.txt").write_text("new content")
+        (tmp_path / "copy.txt").write_text("old copy")
+
+        with patch("src.utils.fastcopy._reflink", return_value=False):
+            with pytest.raises(OSError, match="reflink is not supported"):
+                copy_file(tmp_path / "file.txt", tmp_path / "copy.txt", reflink="always")
+            with pytest.raises(OSError, match="reflink is not supported"):
+                copy_file(tmp_path / "file.txt", tmp_path / "missing.txt", reflink="always")
+
+        assert (tmp_path / "copy.txt").read_text() == "old copy"
+        assert not (tmp_path / "missing.txt").exists()
+        copy_file(tmp_path / "file.txt", tmp_path / "copy.txt", reflink="never")
+        assert (tmp_path / "copy.txt").read_text() == "new content"
+
+    def test_reflink_auto_uses_clone_when_supported(self, tmp_path):
+        """Тест: при поддержке reflink файл клонируется без копирования данных"""
+        (tmp_path / "file.txt").write_text("content")
+
+        with patch("src.utils.fastcopy._reflink", return_value=True):
+            method = copy_file(tmp_path / "file.txt", tmp_path / "copy.txt")
+
+        assert method == "reflink"
+
+    def test_invalid_reflink_mode_raises_error(self, command):
+        """Тест: неизвестный режим reflink вызывает SyntaxError"""
+        with pytest.raises(SyntaxError, match=f"{command.name}: invalid reflink mode: sometimes"):
+            command.execute(["src", "dst"], ["reflink=sometimes"])
+
+    def test_sync_copies_only_changed_files(self, command, real_tree):
+        """Тест: --update копирует только новые и измененные файлы и выводит итог"""
+        source = real_tree / "source" / "dir1"
+        target = real_tree / "target"
+        command.execute([str(source), str(target)], ['r'])
+
+        (source / "subfile1.txt").write_text("changed content")
+        (source / "new.txt").write_text("new")
+        with patch('builtins.print') as mock_print, \
+                patch.object(command, "_copy_one", wraps=command._copy_one) as mock_copy:
+            command.execute([str(source), str(target)], ['r', "update"])
+
+        copied = sorted(Path(call.args[0]).name for call in mock_copy.call_args_list)
+        assert copied == ["new.txt", "subfile1.txt"]
+        assert (target / "dir1" / "subfile1.txt").read_text() == "changed content"
+        assert (target / "dir1" / "new.txt").read_text() == "new"
+        summary = mock_print.call_args[0][0]
+        assert "copied 2 files (18)" in summary
+        assert "skipped 21 files" in summary
+
+    def test_sync_with_checksum_compares_content(self, command, real_tree):
+        """Тест: --checksum пропускает файлы с тем же содержимым и копирует измененные при том же размере"""
+        source = real_tree / "source" / "dir1"
+        target = real_tree / "target"
+        command.execute([str(source), str(target)], ['r'])
+        os.utime(source / "subdir" / "deepfile.txt", (2_000_000, 2_000_000))
+        (target / "dir1" / "subfile1.txt").write_text("SUBCONTENT1")
+
+        with patch('builtins.print'), patch.object(command, "_copy_one", wraps=command._copy_one) as mock_copy:
+            command.execute([str(source), str(target)], ['r', "sync", "checksum", "jobs=4"])
+
+        assert [Path(call.args[0]).name for call in mock_copy.call_args_list] == ["subfile1.txt"]
+        assert (target / "dir1" / "subfile1.txt").read_text() == "subcontent1"
+
+    def test_sync_with_delete_removes_extra_items(self, command, real_tree):
+        """Тест: --delete удаляет элементы назначения, которых нет в источнике"""
+        source = real_tree / "source" / "dir1"
+        target = real_tree / "target"
+        command.execute([str(source), str(target)], ['r'])
+        (target / "dir1" / "extra.txt").write_text("extra")
+        (target / "dir1" / "subdir" / "extra_dir").mkdir()
+
+        with patch('builtins.print') as mock_print:
+            command.execute([str(source), str(target)], ['r', "update", "delete"])
+
+        assert not (target / "dir1" / "extra.txt").exists()
+        assert not (target / "dir1" / "subdir" / "extra_dir").exists()
+        assert (target / "dir1" / "subfile1.txt").exists()
+        assert "deleted 2 items" in mock_print.call_args[0][0]
+
+    def test_resumable_copy(self, command, tmp_path):
+        """Тест: --resume копирует файл блоками и не оставляет временных файлов"""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(100_000))
+
+        command.execute([str(source), str(tmp_path / "copy.bin")], ["resume", "chunk-size=16K"])
+
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["big.bin", "copy.bin"]
+
+    def test_resumable_copy_continues_after_interruption(self, command, tmp_path):
+        """Тест: прерванное копирование продолжается с контрольной точки"""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(100_000))
+        calls = []
+        original_copy_range = fastcopy.copy_range
+
+        def interrupted_copy_range(*args):
+            calls.append(args[2])
+            if len(calls) == 3 and interrupt:
+                raise KeyboardInterrupt
+            return original_copy_range(*args)
+
+        interrupt = True
+        with patch("src.utils.fastcopy.copy_range", interrupted_copy_range):
+            with pytest.raises(KeyboardInterrupt):
+                copy_file_resumable(source, tmp_path / "copy.bin", chunk_size=16_000)
+        assert not (tmp_path / "copy.bin").exists()
+        assert (tmp_path / "copy.bin.part.ckpt").exists()
+
+        calls.clear()
+        interrupt = False
+        with patch("src.utils.fastcopy.copy_range", interrupted_copy_range), patch('builtins.print') as mock_print:
+            command.execute([str(source), str(tmp_path / "copy.bin")], ["resume", "chunk-size=16000"])
+
+        assert calls[0] == 32_000
+        assert "resumed big.bin" in mock_print.call_args[0][0]
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+        assert not (tmp_path / "copy.bin.part").exists()
+
+    def test_resumable_copy_restarts_when_tail_chunk_differs(self, tmp_path):
+        """Тест: если последний блок копии не совпадает с источником, копирование начинается заново"""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(50_000))
+        with patch("src.utils.fastcopy.copy_range", side_effect=[(10_000, "read_write"), KeyboardInterrupt]):
+            with pytest.raises(KeyboardInterrupt):
+                copy_file_resumable(source, tmp_path / "copy.bin", chunk_size=10_000)
+        with open(tmp_path / "copy.bin.part", "r+b") as part:
+            part.write(b"corrupted")
+
+        resumed = copy_file_resumable(source, tmp_path / "copy.bin", chunk_size=10_000)
+
+        assert resumed == 0
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+    def test_resumable_copy_restarts_when_source_changed(self, tmp_path):
+        """Тест: контрольная точка другого содержимого источника не используется"""
+        source = tmp_path / "big.bin"
+        source.write_bytes(os.urandom(50_000))
+        original_copy_range = fastcopy.copy_range
+
+        def interrupted_copy_range(*args):
+            if args[2] > 0: # прерывание после первого блока
+                raise KeyboardInterrupt
+            return original_copy_range(*args)
+
+        with patch("src.utils.fastcopy.copy_range", interrupted_copy_range):
+            with pytest.raises(KeyboardInterrupt):
+                copy_file_resumable(source, tmp_path / "copy.bin", chunk_size=10_000)
+        source.write_bytes(os.urandom(60_000))
+
+        assert copy_file_resumable(source, tmp_path / "copy.bin", chunk_size=10_000) == 0
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+    def test_bandwidth_limit_throttles_copy_in_chunks(self, command, tmp_path):
+        """Тест: с --bwlimit даже маленький файл копируется блоками через ограничитель"""
+        source = tmp_path / "file.bin"
+        source.write_bytes(os.urandom(50_000))
+
+        with patch("src.utils.ratelimit.RateLimiter.consume", autospec=True) as consume:
+            command.execute([str(source), str(tmp_path / "copy.bin")], ["bwlimit=100K"])
+
+        # блок ограничителя - 0.1 секунды работы на пределе (10 КБ)
+        assert [call.args[1] for call in consume.call_args_list] == [10240] * 4 + [9040]
+        assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+    def test_parallel_copy_shares_one_limiter(self, command, real_tree):
+        """Тест: все потоки параллельного копирования используют один ограничитель"""
+        with patch("src.utils.ratelimit.RateLimiter.consume", autospec=True) as consume:
+            command.execute([str(real_tree / "source" / "dir1"), str(real_tree / "target")],
+                            ["r", "jobs=4", "bwlimit=1M"])
+
+        assert len({id(call.args[0]) for call in consume.call_args_list}) == 1
+        assert (real_tree / "target" / "dir1" / "subdir" / "deepfile.txt").exists()
+
+    def test_invalid_bandwidth_limit_raises_error(self, command):
+        """Тест: некорректный --bwlimit вызывает SyntaxError"""
+        with pytest.raises(SyntaxError, match="invalid bandwidth"):
+            command.execute(["a", "b"], ["bwlimit=fast"])
+
+    def test_progress_counters_after_copy(self, command, real_tree):
+        """Тест: после копирования счетчики прогресса содержат объем и количество файлов"""
+        command.execute([str(real_tree / "source" / "dir1"), str(real_tree / "target")], ["r", "jobs=2", "progress"])
+
+        assert command.progress.files_done == command.progress.total_files == 22
+        assert command.progress.bytes_done == command.progress.total_bytes
+
+    def test_progress_counts_kernel_copy_chunks(self, command, tmp_path):
+        """Тест: при копировании силами ядра байты учитываются по блокам"""
+        source = tmp_path / "file.bin"
+        source.write_bytes(os.urandom(50_000))
+
+        command.execute([str(source), str(tmp_path / "copy.bin")], ["bwlimit=100K", "no-progress"])
+
+        assert command.progress.bytes_done == 50_000
+        assert command.progress.files_done == 1
+        assert command.progress.total_bytes is None
+
+    def test_concurrent_runs_keep_own_progress(self, command, tmp_path):
+        """Тест: одновременные копирования одним экземпляром команды (фоновые задачи) не смешивают счетчики"""
+        (tmp_path / "a.txt").write_bytes(b"a" * 10)
+        (tmp_path / "b.txt").write_bytes(b"b" * 20)
+        started, release = threading.Event(), threading.Event()
+        real_copy2 = shutil.copy2
+
+        def copy2(src, dst):
+            if str(src).endswith("a.txt"):
+                started.set()
+                release.wait(5)
+            return real_copy2(src, dst)
+
+        with patch("commands.cp.shutil.copy2", copy2):
+            thread = threading.Thread(target=command.execute,
+                                      args=([str(tmp_path / "a.txt"), str(tmp_path / "a2.txt")], ["no-progress"]))
+            thread.start()
+            assert started.wait(5)
+            command.execute([str(tmp_path / "b.txt"), str(tmp_path / "b2.txt")], ["no-progress"])
+            second = command.progress
+            release.set()
+            thread.join()
+
+        assert (second.files_done, second.bytes_done) == (1, 20)
+        assert (command.progress.files_done, command.progress.bytes_done) == (1, 10)
@@ -0,0 +1,51 @@
+import itertools
+
+from src.utils.format_output import format_table, human_size, iter_table
+
+
+class TestFormatOutput:
+    """Тесты для форматирования таблиц"""
+
+    def test_format_table_empty(self):
+        """Тест: пустые данные дают пустую строку"""
+        assert format_table([]) == ""
+
+    def test_format_table_column_widths(self):
+        """Тест: ширина столбца равна наибольшей длине ячейки в нем"""
+        table = format_table([["name", "kind"], ["a", "file"], ["long_name", "dir"]])
+
+        assert table == "name      kind\na         file\nlong_name dir "
+
+    def test_format_table_numeric_columns_right_aligned(self):
+        """Тест: числовые столбцы выравниваются по правому краю"""
+        table = format_table([["name", "size"], ["a", 5], ["b", 12345]])
+
+        assert table.split("\n") == ["name  size", "a        5", "b    12345"]
+
+    def test_format_table_explicit_alignment(self):
+        """Тест: выравнивание можно задать явно"""
+        table = format_table([["name", "size"], ["a", "1.5K"], ["b", "12M"]], align="<>")
+
+        assert table.split("\n") == ["name size", "a    1.5K", "b     12M"]
+
+    def test_iter_table_matches_format_table(self):
+        """Тест: потоковая таблица совпадает с обычной, если выборка содержит все строки"""
+        data = [["name", "size", "mode"], ["a.txt", 1, "-rw"], ["bb.txt", 100, "drwx"]]
+
+        assert "\n".join(iter_table(data)) == format_table(data)
+
+    def test_iter_table_yields_before_consuming_all_rows(self):
+        """Тест: потоковая таблица выдает первую строку, прочитав только выборку"""
+        rows = (["name", i] for i in itertools.count())
+        lines = iter_table(rows, sample_size=3)
+
+        assert next(lines) == "name 0"
+        assert list(itertools.islice(lines, 4)) == ["name 1", "name 2", "name 3", "name 4"]
+
+    def test_human_size(self):
+        """Тест: перевод размера в читаемый вид"""
+        assert human_size(0) == "0"
+        assert human_size(1023) == "1023"
+        assert human_size(1536) == "1.5K"
+        assert human_size(50 * 1024 ** 2) == "50M"
+        assert human_size(3 * 1024 ** 3) == "3.0G"
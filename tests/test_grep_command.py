@@ -0,0 +1,67 @@
+import pytest
+
+from commands.grep import GrepCommand
+
+
+class TestGrepCommand:
+    """Тесты для команды grep"""
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return GrepCommand()
+
+    @pytest.fixture
+    def setup_filesystem(self, fs):
+        """Фикстура для настройки тестовой файловой системы"""
+        fs.create_file("/test/words.txt", contents="apple\nBanana\ncherry\napricot")
+        fs.create_file("/test/other.txt", contents="pear\napple pie\n")
+        fs.create_dir("/test/directory")
+        return fs
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "grep"
+
+    def test_grep_matching_lines(self, command, setup_filesystem, capsysbinary):
+        """Тест: выводятся строки, подходящие под регулярное выражение, последняя строка без \\n дополняется"""
+        command.execute(["^ap", "/test/words.txt"], [])
+
+        assert capsysbinary.readouterr().out == b"apple\napricot\n"
+
+    def test_grep_flags(self, command, setup_filesystem, capsysbinary):
+        """Тест: -i без учета регистра, -n с номерами строк, -v инвертирует, -c выводит количество"""
+        command.execute(["banana", "/test/words.txt"], ['i', 'n'])
+        command.execute(["a", "/test/words.txt"], ['v'])
+        command.execute(["p", "/test/words.txt"], ['c'])
+
+        assert capsysbinary.readouterr().out == b"2:Banana\ncherry\n2\n"
+
+    def test_grep_multiple_files_prefixes_names(self, command, setup_filesystem, capsysbinary):
+        """Тест: при нескольких файлах перед строкой выводится имя файла"""
+        command.execute(["apple", "/test/words.txt", "/test/other.txt"], [])
+
+        assert capsysbinary.readouterr().out == b"/test/words.txt:apple\n/test/other.txt:apple pie\n"
+
+    def test_grep_reads_stream(self, command):
+        """Тест: без файлов grep фильтрует поток предыдущей команды, строки могут пересекать границы блоков"""
+        chunks = iter([b"one\ntw", b"o\nthree\n", b"two again"])
+
+        assert b"".join(command.stream(["two"], [], chunks)) == b"two\ntwo again\n"
+
+    def test_grep_invalid_pattern_raises_error(self, command, setup_filesystem):
+        """Тест: некорректное регулярное выражение вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["[", "/test/words.txt"], [])
+
+    def test_grep_missing_file_raises_error(self, command, setup_filesystem):
+        """Тест: несуществующий файл или директория вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            command.execute(["a", "/test/missing.txt"], [])
+        with pytest.raises(FileNotFoundError):
+            command.execute(["a", "/test/directory"], [])
+
+    def test_grep_without_input_raises_error(self, command):
+        """Тест: без файлов и без конвейера вызывается SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["a"], [])
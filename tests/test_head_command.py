@@ -0,0 +1,91 @@
+import pytest
+
+from commands.head import HeadCommand
+
+
+class TestHeadCommand:
+    """Тесты для команды head"""
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return HeadCommand(block_size=8)
+
+    @pytest.fixture
+    def setup_filesystem(self, fs):
+        """Фикстура для настройки тестовой файловой системы"""
+        fs.create_file("/test/lines.txt", contents="".join(f"line{i}\n" for i in range(1, 21)))
+        fs.create_file("/test/short.txt", contents="one\ntwo")
+        fs.create_file("/test/empty.txt", contents="")
+        fs.create_dir("/test/directory")
+        return fs
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "head"
+
+    def test_head_default_ten_lines(self, command, setup_filesystem, capsysbinary):
+        """Тест: по умолчанию выводятся первые 10 строк"""
+        command.execute(["/test/lines.txt"], [])
+
+        assert capsysbinary.readouterr().out == "".join(f"line{i}\n" for i in range(1, 11)).encode()
+
+    def test_head_with_n_option(self, command, setup_filesystem, capsysbinary):
+        """Тест: количество строк задается через -n N"""
+        command.execute(["3", "/test/lines.txt"], ['n'])
+
+        assert capsysbinary.readouterr().out == b"line1\nline2\nline3\n"
+
+    def test_head_with_lines_option(self, command, setup_filesystem, capsysbinary):
+        """Тест: количество строк задается через --lines=N"""
+        command.execute(["/test/lines.txt"], ["lines=1"])
+
+        assert capsysbinary.readouterr().out == b"line1\n"
+
+    def test_head_more_lines_than_file(self, command, setup_filesystem, capsysbinary):
+        """Тест: если строк в файле меньше, то выводится весь файл"""
+        command.execute(["/test/short.txt"], [])
+
+        assert capsysbinary.readouterr().out == b"one\ntwo"
+
+    def test_head_stops_reading_after_needed_lines(self, command, setup_filesystem, capsysbinary):
+        """Тест: чтение прекращается сразу после нужных строк"""
+        reads = []
+        original_read = command._write_head
+
+        def counting_write_head(file, count):
+            read = file.read
+            file.read = lambda size: reads.append(size) or read(size)
+            original_read(file, count)
+
+        command._write_head = counting_write_head
+        command.execute(["2", "/test/lines.txt"], ['n'])
+
+        assert capsysbinary.readouterr().out == b"line1\nline2\n"
+        assert len(reads) == 2
+
+    def test_head_empty_file(self, command, setup_filesystem, capsysbinary):
+        """Тест: вывод пустого файла"""
+        command.execute(["/test/empty.txt"], [])
+
+        assert capsysbinary.readouterr().out == b""
+
+    def test_head_invalid_count_raises_error(self, command, setup_filesystem):
+        """Тест: некорректное количество строк вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["abc", "/test/lines.txt"], ['n'])
+
+    def test_head_no_arguments_raises_error(self, command):
+        """Тест: вызов без аргументов вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute([], [])
+
+    def test_head_nonexistent_file_raises_error(self, command, setup_filesystem):
+        """Тест: несуществующий файл вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: no such file or directory: missing.txt"):
+            command.execute(["/test/missing.txt"], [])
+
+    def test_head_directory_raises_error(self, command, setup_filesystem):
+        """Тест: директория вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: not a file: directory"):
+            command.execute(["/test/directory"], [])
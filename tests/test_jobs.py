@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from commands.base import BaseCommand
+from core import ShellCore
+
+
+class BlockingCommand(BaseCommand):
+    """Команда, которая печатает аргумент и ждет события (или бесконечно работает до kill)"""
+
+    def __init__(self):
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    @property
+    def name(self):
+        return "block"
+
+    def execute(self, args, options):
+        self.started.release()
+        print(f"out {args[0]}")
+        while not self.release.is_set():
+            time.sleep(0.01)
+
+
+class TestJobs:
+    """Тесты для фоновых задач"""
+
+    @pytest.fixture
+    def shell_core(self):
+        """Фикстура для создания ядра с одной фоновой задачей за раз и блокирующей командой"""
+        core = ShellCore(Mock(), max_jobs=1)
+        core.auto_discover_commands()
+        core.register_command(BlockingCommand())
+        yield core
+        core.commands["block"].release.set()
+        core.wait_jobs()
+
+    def test_job_output_is_captured_until_wait(self, shell_core, capsys):
+        """Тест: вывод фоновой задачи не смешивается с выводом оболочки и выводится командой wait"""
+        command = shell_core.commands["block"]
+        shell_core.execute_command("block 1 &\n")
+        assert command.started.acquire(timeout=5)
+        print("foreground")
+        command.release.set()
+
+        status = shell_core.execute_command("wait 1\n")
+
+        assert status == 0
+        assert capsys.readouterr().out == "[1]\nforeground\nout 1\n"
+        assert shell_core.jobs.jobs() == []
+
+    def test_max_jobs_limits_concurrency(self, shell_core, capsys):
+        """Тест: при max_jobs=1 вторая задача ждет в очереди, пока выполняется первая"""
+        command = shell_core.commands["block"]
+        shell_core.execute_command("block 1 &\n")
+        shell_core.execute_command("block 2 &\n")
+        assert command.started.acquire(timeout=5)
+
+        first, second = shell_core.jobs.jobs()
+        assert (first.state, second.state) == ("running", "queued")
+        shell_core.execute_command("jobs\n")
+        assert "[2] queued  block 2" in capsys.readouterr().out
+
+        command.release.set()
+        shell_core.execute_command("wait\n")
+        assert capsys.readouterr().out == "out 1\nout 2\n"
+
+    def test_kill_running_and_queued_jobs(self, shell_core, capsys):
+        """Тест: kill останавливает выполняемую задачу и отменяет задачу в очереди"""
+        command = shell_core.commands["block"]
+        shell_core.execute_command("block 1 &\n")
+        shell_core.execute_command("block 2 &\n")
+        assert command.started.acquire(timeout=5)
+
+        shell_core.execute_command("kill 2 %1\n")
+        first, second = shell_core.jobs.jobs()
+        assert shell_core.execute_command("wait 1 2\n") == 1
+
+        assert (first.state, second.state) == ("killed", "killed")
+        assert not command.started.acquire(timeout=0.1) # вторая задача не запускалась
+
+    def test_failed_job_status(self, shell_core, capsys):
+        """Тест: код завершения задачи с ошибкой - 1, сообщение об ошибке входит в ее вывод"""
+        shell_core.execute_command("cat /missing/file.txt &\n")
+
+        assert shell_core.execute_command("wait 1\n") == 1
+        output = capsys.readouterr().out
+        assert "cat: no such file or directory: file.txt" in output
+        assert "[1] failed" in output
+
+    def test_cd_with_background_jobs(self, shell_core, tmp_path, capsys):
+        """Тест: cd во время фоновых задач меняет только директорию ядра, задача выполняется в директории запуска"""
+        command = shell_core.commands["block"]
+        process_cwd = os.getcwd()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "note.txt").write_text("job file\n")
+
+        shell_core.execute_command("block 1 &\n")
+        assert command.started.acquire(timeout=5)
+        assert shell_core.execute_command(f"cd {tmp_path / 'sub'}\n") == 0
+        shell_core.execute_command("cat note.txt &\n")
+        shell_core.execute_command("cd .. &\n")
+        jobs = shell_core.jobs.jobs()
+        command.release.set()
+        assert shell_core.execute_command("wait\n") == 0
+
+        assert jobs[0].cwd == process_cwd
+        assert jobs[1].cwd == str(tmp_path / "sub")
+        assert "job file" in capsys.readouterr().out
+        assert shell_core.current_dir == tmp_path / "sub" # cd в задаче не меняет директорию ядра
+        assert os.getcwd() == process_cwd
+
+    def test_job_does_not_read_shell_stdin(self, shell_core, tmp_path, capsys):
+        """Тест: rm -r в фоне не задает вопрос и не читает stdin оболочки, а завершается ошибкой"""
+        (tmp_path / "dir").mkdir()
+
+        with patch("builtins.input") as mock_input:
+            shell_core.execute_command(f"rm -r {tmp_path / 'dir'} &\n")
+            assert shell_core.execute_command("wait 1\n") == 1
+
+        mock_input.assert_not_called()
+        assert "cannot ask for confirmation without input, use -f" in capsys.readouterr().out
+        assert (tmp_path / "dir").exists()
+
+    def test_unknown_job_raises_error(self, shell_core, capsys):
+        """Тест: wait и kill с несуществующим номером задачи - ошибка"""
+        assert shell_core.execute_command("wait 7\n") == 1
+        assert shell_core.execute_command("kill x\n") == 1
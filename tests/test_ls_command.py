@@ -2,9 +2,11 @@ import pytest
 from pathlib import Path
 import os
 import datetime
+import heapq
+import stat
 from unittest.mock import patch
 
-from commands.ls import LsCommand
+from commands.ls import LsCommand, _format_minute, format_mtime
 
 
 class TestLsCommand:
@@ -181,3 +183,154 @@ class TestLsCommand:
             command.execute(["/test/regular_file.txt"], [])
         assert f"{command.name}: not a directory: regular_file.txt" in str(exc_info.value)
 
+    def test_ls_detailed_output_values(self, command, setup_filesystem):
+        """Тест: подробный вывод содержит размер, время изменения и права доступа каждого файла"""
+        file_stat = os.stat("/test/dir_with_many_files/c.txt")
+        expected_time = datetime.datetime.fromtimestamp(file_stat.st_mtime).strftime('%d.%m.%y %H:%M')
+
+        with patch('builtins.print') as mock_print:
+            command.execute(["/test/dir_with_many_files"], ['l'])
+
+        lines = mock_print.call_args[0][0].split('\n')
+        row = next(line for line in lines if line.startswith("c.txt")).split()
+        assert row[1] == "3"
+        assert f"{row[2]} {row[3]}" == expected_time
+        assert row[4] == stat.filemode(file_stat.st_mode)
+
+    def test_ls_detailed_output_stats_each_entry_once(self, command, setup_filesystem):
+        """Тест: подробный вывод не вызывает отдельные stat для размера, времени и прав"""
+        with patch('os.stat', side_effect=AssertionError("extra stat call")), \
+                patch('os.path.getsize', side_effect=AssertionError("extra stat call")):
+            rows = list(command._scan(Path("/test/dir_with_many_files")))
+
+        assert sorted(name for name, _ in rows) == ["a.txt", "b.txt", "c.txt"]
+        assert sorted(entry_stat.st_size for _, entry_stat in rows) == [1, 2, 3]
+
+    def test_format_mtime_is_cached_per_minute(self):
+        """Тест: время в пределах одной минуты форматируется один раз"""
+        _format_minute.cache_clear()
+        base = 1_700_000_040  # начало минуты
+
+        assert format_mtime(base) == format_mtime(base + 59.5)
+        assert _format_minute.cache_info().hits == 1
+        assert format_mtime(base + 60) != format_mtime(base)
+
+    def test_ls_stream_prints_each_entry(self, command, setup_filesystem):
+        """Тест: потоковый режим выводит каждый элемент отдельной строкой"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/test/dir_with_many_files"], ['stream'])
+
+        assert sorted(call.args[0] for call in mock_print.call_args_list) == ["a.txt", "b.txt", "c.txt"]
+
+    def test_ls_stream_detailed_output(self, command, setup_filesystem):
+        """Тест: потоковый подробный вывод начинается с заголовка и содержит строку на каждый файл"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/test/dir_with_many_files"], ['l', 'stream', 'sample=2'])
+
+        lines = [call.args[0] for call in mock_print.call_args_list]
+        assert lines[0].startswith("File name")
+        assert len(lines) == 4
+        assert sorted(line.split()[0] for line in lines[1:]) == ["a.txt", "b.txt", "c.txt"]
+
+    def test_ls_stream_invalid_sample_raises_error(self, command, setup_filesystem):
+        """Тест: некорректный размер выборки вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["/test"], ['l', 'stream', 'sample=abc'])
+
+    def test_ls_recursive(self, command, tmp_path):
+        """Тест: рекурсивный вывод содержимого поддиректорий в порядке обхода в глубину"""
+        (tmp_path / "sub" / "deeper").mkdir(parents=True)
+        (tmp_path / "sub" / "deeper" / "z.txt").write_text("z")
+        (tmp_path / "top.txt").write_text("top")
+
+        with patch('builtins.print') as mock_print:
+            command.execute([str(tmp_path)], ['R', "workers=3"])
+
+        lines = [call.args[0] if call.args else "" for call in mock_print.call_args_list]
+        assert lines == [
+            f"{tmp_path}:", "sub\ntop.txt", "",
+            f"{tmp_path / 'sub'}:", "deeper", "",
+            f"{tmp_path / 'sub' / 'deeper'}:", "z.txt",
+        ]
+
+    def test_ls_recursive_detailed_uses_sorted_listing(self, command, tmp_path):
+        """Тест: ls -R -l выводит отсортированные строки со stat, полученным потоками обхода"""
+        (tmp_path / "sub").mkdir()
+        for name in ("c.txt", "a.txt", "b.txt"):
+            (tmp_path / "sub" / name).write_text(name)
+
+        with patch('builtins.print') as mock_print, patch("os.scandir", wraps=os.scandir) as scandir:
+            command.execute([str(tmp_path)], ['R', 'l', "workers=2"])
+
+        lines = [call.args[0] if call.args else "" for call in mock_print.call_args_list]
+        rows = lines[lines.index(f"{tmp_path / 'sub'}:") + 1].splitlines()[1:]
+        assert [row.split()[0] for row in rows] == ["a.txt", "b.txt", "c.txt"]
+        assert all(row.split()[1] == "5" for row in rows)
+        assert scandir.call_count == 2 # каждая директория читается один раз
+
+    def test_ls_recursive_with_depth(self, command, tmp_path):
+        """Тест: --depth ограничивает глубину рекурсивного вывода"""
+        (tmp_path / "sub" / "deeper").mkdir(parents=True)
+
+        with patch('builtins.print') as mock_print:
+            command.execute([str(tmp_path)], ['R', "depth=1"])
+
+        lines = [call.args[0] for call in mock_print.call_args_list]
+        assert lines == [f"{tmp_path}:", "sub"]
+
+    @pytest.fixture
+    def sized_files(self, fs):
+        """Фикстура с файлами разного размера и времени изменения"""
+        for name, size, mtime in [("b.txt", 30, 300), ("a.txt", 10, 100), ("d.txt", 40, 200), ("c.txt", 20, 400)]:
+            fs.create_file(f"/sorted/{name}", contents="x" * size)
+            os.utime(f"/sorted/{name}", (mtime, mtime))
+        return fs
+
+    def test_ls_sort_by_name(self, command, sized_files):
+        """Тест: --sort=name сортирует по имени"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/sorted"], ["sort=name"])
+
+        assert mock_print.call_args[0][0] == "a.txt\nb.txt\nc.txt\nd.txt"
+
+    def test_ls_sort_by_size(self, command, sized_files):
+        """Тест: -S сортирует по размеру от большего к меньшему"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/sorted"], ['S'])
+
+        assert mock_print.call_args[0][0] == "d.txt\nb.txt\nc.txt\na.txt"
+
+    def test_ls_sort_by_time_reversed(self, command, sized_files):
+        """Тест: -t -r сортирует по времени изменения от старых к новым"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/sorted"], ['t', 'r'])
+
+        assert mock_print.call_args[0][0] == "a.txt\nd.txt\nb.txt\nc.txt"
+
+    def test_ls_top_largest_files(self, command, sized_files):
+        """Тест: --top=N выводит N самых больших файлов"""
+        with patch('builtins.print') as mock_print:
+            command.execute(["/sorted"], ['S', "top=2"])
+
+        assert mock_print.call_args[0][0] == "d.txt\nb.txt"
+
+    def test_ls_top_detailed_uses_heap_selection(self, command, sized_files):
+        """Тест: --top выбирает элементы через кучу и выводит подробную таблицу"""
+        with patch('commands.ls.heapq.nlargest', wraps=heapq.nlargest) as mock_nlargest, \
+                patch('builtins.print') as mock_print:
+            command.execute(["/sorted"], ['l', 't', "top=1"])
+
+        mock_nlargest.assert_called_once()
+        lines = mock_print.call_args[0][0].split('\n')
+        assert len(lines) == 2
+        assert lines[1].startswith("c.txt")
+
+    def test_ls_invalid_sort_raises_error(self, command, sized_files):
+        """Тест: неизвестный ключ сортировки вызывает SyntaxError"""
+        with pytest.raises(SyntaxError, match=f"{command.name}: invalid sort key: color"):
+            command.execute(["/sorted"], ["sort=color"])
+
+    def test_ls_invalid_top_raises_error(self, command, sized_files):
+        """Тест: некорректное значение --top вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["/sorted"], ["top=-1"])
@@ -0,0 +1,78 @@
+import io
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+import main
+from src.utils.output import BatchBuffer
+
+
+class TestBatchMode:
+    """Тесты для пакетного режима"""
+
+    @pytest.fixture(autouse=True)
+    def logger(self):
+        """Фикстура, которая подменяет логгер, чтобы тесты не писали в shell.log"""
+        with patch("main.get_logger", return_value=Mock()) as get_logger:
+            yield get_logger
+
+    def test_command_string_runs_without_prompt(self, tmp_path, capfd):
+        """Тест: -c выполняет команды без приглашения, вывод появляется после завершения"""
+        (tmp_path / "a.txt").write_text("hello\n")
+
+        status = main.run(["-c", f"cat {tmp_path / 'a.txt'}\nhead -n 1 {tmp_path / 'a.txt'}"])
+
+        assert status == 0
+        assert capfd.readouterr().out == "hello\nhello\n"
+
+    def test_errexit_flag_stops_on_error(self, tmp_path, capfd):
+        """Тест: -e останавливает сценарий на первой ошибке и возвращает код 1"""
+        (tmp_path / "a.txt").write_text("hello\n")
+
+        status = main.run(["-e", "-c", f"cat {tmp_path / 'missing.txt'}\ncat {tmp_path / 'a.txt'}"])
+
+        assert status == 1
+        assert "hello" not in capfd.readouterr().out
+
+    def test_script_file(self, tmp_path, capfd):
+        """Тест: команды читаются из файла сценария, комментарии пропускаются"""
+        (tmp_path / "a.txt").write_text("hello\n")
+        (tmp_path / "script.sh").write_text(f"#!/shell\n# comment\n\ncat {tmp_path / 'a.txt'}\n")
+
+        assert main.run([str(tmp_path / "script.sh")]) == 0
+        assert capfd.readouterr().out == "hello\n"
+
+    def test_prompt_is_shown_before_reading_answer(self, tmp_path, capfd):
+        """Тест: перед вопросом rm накопленный вывод записывается, а вопрос выводится в stderr"""
+        (tmp_path / "a.txt").write_text("hello\n")
+        (tmp_path / "dir").mkdir()
+        seen = []
+
+        def answer():
+            seen.append(capfd.readouterr())
+            return "n"
+
+        with patch("builtins.input", side_effect=answer):
+            main.run(["-c", f"cat {tmp_path / 'a.txt'}\nrm -r {tmp_path / 'dir'}"])
+
+        assert seen[0].out == "hello\n"
+        assert seen[0].err.startswith("rm: are you sure you want to delete dir")
+        assert (tmp_path / "dir").exists()
+
+    def test_batch_buffer_writes_on_threshold(self, tmp_path):
+        """Тест: буфер пакетного режима пишет в файл только при достижении порога и при закрытии"""
+        fd = os.open(tmp_path / "out", os.O_WRONLY | os.O_CREAT)
+        try:
+            buffer = BatchBuffer(fd, threshold=10)
+            buffer.write(b"12345")
+            buffer.flush()
+            assert (tmp_path / "out").read_bytes() == b""
+            buffer.write(b"67890")
+            assert (tmp_path / "out").read_bytes() == b"12345"
+            buffer.close()
+            assert (tmp_path / "out").read_bytes() == b"1234567890"
+            with pytest.raises(io.UnsupportedOperation):
+                buffer.fileno()
+        finally:
+            os.close(fd)
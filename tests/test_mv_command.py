@@ -1,6 +1,8 @@
+import errno
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from commands.mv import MvCommand
 
@@ -93,3 +95,114 @@ class TestMvCommand:
 
             with pytest.raises(PermissionError):
                 mv_command.execute(["source.txt", "readonly_dir"], [])
+
+    def test_mv_across_devices_uses_bandwidth_limit(self, mv_command, tmp_path):
+        """Тест: при перемещении на другое устройство копирование идет через ограничитель скорости"""
+        (tmp_path / "source.bin").write_bytes(b"x" * 30_000)
+        (tmp_path / "target").mkdir()
+
+        with patch("os.rename", side_effect=OSError(errno.EXDEV, "cross-device link")), \
+                patch("src.utils.ratelimit.RateLimiter.consume", autospec=True) as consume:
+            mv_command.execute([str(tmp_path / "source.bin"), str(tmp_path / "target")], ["bwlimit=100K"])
+
+        assert sum(call.args[1] for call in consume.call_args_list) == 30_000
+        assert mv_command.progress.bytes_done == 30_000
+        assert mv_command.progress.files_done == 1
+        assert not (tmp_path / "source.bin").exists()
+        assert (tmp_path / "target" / "source.bin").read_bytes() == b"x" * 30_000
+
+    def test_mv_on_same_device_does_not_copy(self, mv_command, tmp_path):
+        """Тест: в пределах устройства перемещение - переименование, ограничитель не используется"""
+        (tmp_path / "source.bin").write_bytes(b"data")
+        (tmp_path / "target").mkdir()
+
+        with patch("src.utils.ratelimit.RateLimiter.consume", autospec=True) as consume:
+            mv_command.execute([str(tmp_path / "source.bin"), str(tmp_path / "target")], ["bwlimit=1K"])
+
+        consume.assert_not_called()
+        assert (tmp_path / "target" / "source.bin").read_bytes() == b"data"
+
+    def test_mv_multiple_sources_into_directory(self, mv_command, setup_filesystem):
+        """Тест: несколько источников перемещаются в директорию"""
+        fs = setup_filesystem
+        fs.create_file("a.txt", contents="a")
+        fs.create_dir("dir")
+        fs.create_file("dir/b.txt")
+        fs.create_dir("target")
+
+        mv_command.execute(["a.txt", "dir", "target"], [])
+
+        assert Path("target/a.txt").read_text() == "a"
+        assert Path("target/dir/b.txt").exists()
+        assert not Path("a.txt").exists()
+
+    def test_mv_glob_sources(self, mv_command, setup_filesystem):
+        """Тест: шаблоны раскрываются, файлы не подходящие под шаблон остаются"""
+        fs = setup_filesystem
+        for name in ("one.txt", "two.txt", "keep.log"):
+            fs.create_file(f"src/{name}")
+        fs.create_dir("target")
+
+        mv_command.execute(["src/*.txt", "target"], [])
+
+        assert sorted(p.name for p in Path("target").iterdir()) == ["one.txt", "two.txt"]
+        assert Path("src/keep.log").exists()
+
+    def test_mv_multiple_sources_to_file_raises_error(self, mv_command, setup_filesystem):
+        """Тест: несколько источников можно переместить только в директорию"""
+        fs = setup_filesystem
+        for name in ("a.txt", "b.txt", "c.txt"):
+            fs.create_file(name)
+
+        with pytest.raises(SyntaxError, match="c.txt is not a directory"):
+            mv_command.execute(["a.txt", "b.txt", "c.txt"], [])
+
+    def test_mv_multiple_sources_aggregates_errors(self, mv_command, setup_filesystem):
+        """Тест: ошибки отдельных источников выводятся в конце, остальные перемещаются"""
+        fs = setup_filesystem
+        fs.create_file("a.txt")
+        fs.create_file("b.txt")
+        fs.create_file("target/b.txt")
+
+        with pytest.raises(OSError) as exc_info:
+            mv_command.execute(["a.txt", "missing.txt", "b.txt", "target"], [])
+
+        assert "failed to move 2 items" in str(exc_info.value)
+        assert "missing.txt" in str(exc_info.value)
+        assert "destination path already exists" in str(exc_info.value)
+        assert Path("target/a.txt").exists()
+        assert Path("b.txt").exists()
+
+    def test_mv_same_device_uses_one_rename_per_source(self, mv_command, setup_filesystem):
+        """Тест: на одном устройстве каждый источник перемещается одним os.rename"""
+        fs = setup_filesystem
+        for i in range(5):
+            fs.create_file(f"src/file{i}.txt")
+        fs.create_dir("target")
+
+        with patch("os.rename", wraps=os.rename) as rename, patch("shutil.move") as shutil_move:
+            mv_command.execute(["src/*", "target"], [])
+
+        assert rename.call_count == 5
+        shutil_move.assert_not_called()
+        assert len(list(Path("target").iterdir())) == 5
+
+    def test_mv_across_devices_in_parallel(self, mv_command, tmp_path):
+        """Тест: элементы другого устройства копируются и удаляются в пуле потоков"""
+        sources = []
+        for i in range(6):
+            source = tmp_path / f"file{i}.bin"
+            source.write_bytes(bytes([i]) * 1000)
+            sources.append(str(source))
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "dir" / "nested.txt").write_text("nested")
+        (tmp_path / "target").mkdir()
+
+        with patch("os.rename", side_effect=OSError(errno.EXDEV, "cross-device link")):
+            mv_command.execute([*sources, str(tmp_path / "dir"), str(tmp_path / "target")], ["jobs=3"])
+
+        for i in range(6):
+            assert (tmp_path / "target" / f"file{i}.bin").read_bytes() == bytes([i]) * 1000
+            assert not (tmp_path / f"file{i}.bin").exists()
+        assert (tmp_path / "target" / "dir" / "nested.txt").read_text() == "nested"
+        assert mv_command.progress.files_done == 7
@@ -0,0 +1,92 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from commands.cat import CatCommand
+from commands.head import HeadCommand
+from core import ShellCore
+
+
+class TestPipeline:
+    """Тесты для конвейеров команд"""
+
+    @pytest.fixture
+    def shell_core(self):
+        """Фикстура для создания ядра с найденными командами"""
+        core = ShellCore(Mock())
+        core.auto_discover_commands()
+        return core
+
+    @pytest.fixture
+    def big_file(self, tmp_path):
+        """Фикстура с файлом из 100000 строк"""
+        path = tmp_path / "big.txt"
+        path.write_text("".join(f"line{i}\n" for i in range(100000)))
+        return path
+
+    def test_cat_grep_head(self, shell_core, big_file, capsysbinary):
+        """Тест: cat | grep | head выводит первые подходящие строки"""
+        status = shell_core.execute_command(f"cat {big_file} | grep 99 | head -n 3\n")
+
+        assert status == 0
+        assert capsysbinary.readouterr().out == b"line99\nline199\nline299\n"
+
+    def test_head_stops_upstream_cat(self, shell_core, big_file, capsysbinary):
+        """Тест: head получает нужные строки и закрывает cat, который не дочитывает файл"""
+        shell_core.commands["cat"] = CatCommand(chunk_size=1024)
+        reads = []
+        real_open = open
+
+        def counting_open(*args, **kwargs):
+            file = real_open(*args, **kwargs)
+            read = file.read
+            file.read = lambda size=-1: reads.append(size) or read(size)
+            return file
+
+        with patch("builtins.open", counting_open):
+            shell_core.execute_command(f"cat {big_file} | head -n 2\n")
+
+        assert capsysbinary.readouterr().out == b"line0\nline1\n"
+        assert sum(reads) <= 2048
+
+    def test_generators_are_closed(self, shell_core, big_file, capsysbinary):
+        """Тест: после завершения конвейера потоки всех команд закрыты"""
+        stages = []
+        stream = HeadCommand.stream
+
+        def tracking_stream(self, args, options, stdin=None):
+            generator = stream(self, args, options, stdin)
+            stages.append(generator)
+            return generator
+
+        with patch.object(HeadCommand, "stream", tracking_stream):
+            shell_core.execute_command(f"cat {big_file} | head -n 5 | head -n 1\n")
+
+        assert capsysbinary.readouterr().out == b"line0\n"
+        assert len(stages) == 2 and all(stage.gi_frame is None for stage in stages)
+
+    def test_command_without_stream_support(self, shell_core, tmp_path, capsysbinary):
+        """Тест: вывод команды без потоковой реализации передается следующей команде целиком"""
+        (tmp_path / "dir" / "a.txt").parent.mkdir()
+        (tmp_path / "dir" / "a.txt").touch()
+        (tmp_path / "dir" / "b.log").touch()
+
+        shell_core.execute_command(f"tree {tmp_path / 'dir'} | grep -c txt\n")
+        shell_core.execute_command(f"ls {tmp_path / 'dir'} | grep log\n")
+
+        assert capsysbinary.readouterr().out == b"1\nb.log\n"
+
+    def test_quoted_pipe_is_not_split(self, shell_core, tmp_path, capsysbinary):
+        """Тест: символ | в кавычках не разделяет команды"""
+        (tmp_path / "a.txt").write_text("a|b\nbc\nc\n")
+
+        shell_core.execute_command(f"grep 'a|b' {tmp_path / 'a.txt'}\n")
+
+        assert capsysbinary.readouterr().out == b"a|b\nbc\n" # a|b - альтернатива в регулярном выражении
+
+    def test_empty_command_in_pipeline_is_error(self, shell_core):
+        """Тест: пустая команда в конвейере - синтаксическая ошибка"""
+        with patch('builtins.print') as mock_print:
+            assert shell_core.execute_command("ls |\n") == 1
+
+        assert "unexpected token" in str(mock_print.call_args[0][0])
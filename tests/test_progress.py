@@ -0,0 +1,76 @@
+import io
+import threading
+from unittest.mock import patch
+
+from src.utils.progress import Progress, progress_from_options, scan_size
+
+
+class TestProgress:
+    """Тесты для счетчиков прогресса"""
+
+    def test_counters_are_thread_safe(self):
+        """Тест: счетчики корректны при обновлении из нескольких потоков"""
+        progress = Progress("cp")
+
+        threads = [threading.Thread(target=lambda: [progress.add(10, 1) for _ in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert progress.bytes_done == 40_000
+        assert progress.files_done == 4000
+
+    def test_format_with_totals(self):
+        """Тест: с известным объемом выводятся процент и оставшееся время"""
+        progress = Progress("cp", total_bytes=4096, total_files=4)
+        progress.add(1024, 1)
+
+        with patch.object(Progress, "rate", 512.0):
+            line = progress.format()
+
+        assert line == "cp: 1.0K/4.0K (25%), 1/4 files, 512/s, ETA 0:06"
+
+    def test_format_without_scan(self):
+        """Тест: без предварительного подсчета процент и время не выводятся"""
+        progress = Progress("mv")
+        progress.add(2048, 3)
+
+        with patch.object(Progress, "rate", 1024.0):
+            assert progress.format() == "mv: 2.0K, 3 files, 1.0K/s"
+        assert progress.eta is None
+
+    def test_render_is_throttled(self):
+        """Тест: строка перерисовывается не чаще интервала, итог выводится с переводом строки"""
+        stream = io.StringIO()
+        progress = Progress("cp", stream=stream, interval=3600, enabled=True)
+        progress.add(100, 1)
+        progress.finish()
+        assert stream.getvalue() == "" # быстрая операция ничего не выводит
+
+        progress = Progress("cp", stream=stream, interval=0, enabled=True)
+        progress.add(100, 1)
+        progress.add(100, 1)
+        progress.finish()
+        progress.finish()
+
+        output = stream.getvalue()
+        assert output.count("\r") == 3
+        assert output.endswith("\n") and output.count("\n") == 1
+        assert "200, 2 files" in output
+
+    def test_scan_size_counts_regular_files(self, tmp_path):
+        """Тест: предварительный подсчет обходит директории и не следует по ссылкам"""
+        (tmp_path / "dir" / "sub").mkdir(parents=True)
+        (tmp_path / "dir" / "a.txt").write_bytes(b"x" * 10)
+        (tmp_path / "dir" / "sub" / "b.txt").write_bytes(b"x" * 5)
+        (tmp_path / "dir" / "link").symlink_to(tmp_path / "dir" / "a.txt")
+
+        assert scan_size([tmp_path / "dir"]) == (15, 2)
+
+    def test_no_scan_skips_totals(self, tmp_path):
+        """Тест: --no-scan пропускает подсчет объема, --progress включает вывод"""
+        (tmp_path / "a.txt").write_bytes(b"x" * 10)
+
+        assert progress_from_options("cp", [tmp_path], ["progress"]).total_bytes == 10
+        assert progress_from_options("cp", [tmp_path], ["progress", "no-scan"]).total_bytes is None
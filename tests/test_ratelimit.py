@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.ratelimit import RateLimiter, limiter_from_options, run_low_priority
+
+
+class TestRateLimiter:
+    """Тесты для ограничителя скорости"""
+
+    def test_no_limits_gives_no_limiter(self):
+        """Тест: без флагов ограничитель не создается"""
+        assert limiter_from_options(["r"]) is None
+
+    def test_limits_parsed_from_options(self):
+        """Тест: --bwlimit понимает суффиксы размера, --iops - число"""
+        limiter = limiter_from_options(["bwlimit=50M", "iops=100"])
+
+        assert limiter.bytes_per_second == 50 * 1024 * 1024
+        assert limiter.ops_per_second == 100
+
+    @pytest.mark.parametrize("option", ["bwlimit=fast", "bwlimit=0", "iops=-1"])
+    def test_invalid_limit_raises_error(self, option):
+        """Тест: некорректный предел вызывает ValueError"""
+        with pytest.raises(ValueError):
+            limiter_from_options([option])
+
+    def test_bandwidth_limit_delays_consumers(self):
+        """Тест: сверх начального запаса байты выдаются со скоростью предела"""
+        limiter = RateLimiter(bytes_per_second=1000)
+
+        with patch("src.utils.ratelimit.time.sleep") as sleep:
+            limiter.consume(100) # начальный запас - 0.1 секунды работы
+            sleep.assert_not_called()
+            limiter.consume(500)
+
+        assert sleep.call_args.args[0] == pytest.approx(0.5, abs=0.05)
+
+    def test_iops_limit_delays_operations(self):
+        """Тест: предел операций ограничивает число вызовов независимо от их размера"""
+        limiter = RateLimiter(ops_per_second=10)
+
+        with patch("src.utils.ratelimit.time.sleep") as sleep:
+            limiter.consume(1)
+            limiter.consume(1)
+
+        assert sleep.call_args.args[0] == pytest.approx(0.1, abs=0.05)
+
+    def test_limit_is_shared_between_threads(self):
+        """Тест: предел действует на суммарную скорость всех потоков"""
+        limiter = RateLimiter(bytes_per_second=100_000)
+        start = time.monotonic()
+
+        threads = [threading.Thread(target=lambda: [limiter.consume(5_000) for _ in range(5)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 100 КБ при 100 КБ/с и запасе 10 КБ - не меньше 0.9 секунды
+        assert time.monotonic() - start >= 0.85
+
+    def test_run_low_priority_returns_result_and_keeps_caller_priority(self):
+        """Тест: функция выполняется с nice 19, приоритет вызывающего потока не меняется"""
+        before = os.getpriority(os.PRIO_PROCESS, 0)
+
+        priority = run_low_priority(lambda: os.getpriority(os.PRIO_PROCESS, threading.get_native_id()))
+
+        assert priority == 19
+        assert os.getpriority(os.PRIO_PROCESS, 0) == before
+
+    def test_run_low_priority_reraises_errors(self):
+        """Тест: исключение из функции передается вызывающему"""
+        def fail():
+            raise OSError("boom")
+
+        with pytest.raises(OSError, match="boom"):
+            run_low_priority(fail)
@@ -8,10 +8,18 @@ from commands.rm import RmCommand
 class TestRmCommand:
     """Тесты для команды rm"""
 
+    @pytest.fixture(autouse=True)
+    def fresh_trash(self):
+        """Фикстура: у каждого теста своя файловая система, поэтому общие объекты корзины не переиспользуются"""
+        with patch.dict("src.utils.trash._instances", clear=True):
+            yield
+
     @pytest.fixture
     def command(self):
         """Фикстура для создания экземпляра команды"""
-        return RmCommand(".trash")
+        command = RmCommand(".trash")
+        yield command
+        command._trash.wait() # фоновая работа корзины должна закончиться до сброса фейковой файловой системы
 
     @pytest.fixture
     def setup_filesystem(self, fs):
@@ -34,11 +42,14 @@ class TestRmCommand:
         with pytest.raises(SyntaxError):
             command.execute([], [])
 
-    def test_too_many_arguments_raises_error(self, command):
-        """Тест: слишком много аргументов вызывает SyntaxError"""
-        with pytest.raises(SyntaxError):
+    def test_many_missing_arguments_raise_error(self, command, setup_filesystem):
+        """Тест: несколько несуществующих путей вызывают одну ошибку со списком"""
+        with pytest.raises(OSError) as exc_info:
             command.execute(["file1", "file2"], [])
 
+        assert "failed to remove 2 items" in str(exc_info.value)
+        assert "no such file or directory: file2" in str(exc_info.value)
+
     def test_delete_nonexistent_file_raises_error(self, command, setup_filesystem):
         """Тест: удаление несуществующего файла вызывает FileNotFoundError"""
         with pytest.raises(FileNotFoundError):
@@ -112,3 +123,50 @@ class TestRmCommand:
         # Проверяем, что файл перемещен в корзину
         assert not test_file.exists()
         assert Path(".trash/file1.txt").exists()
+
+    @patch('builtins.input', return_value='y')
+    def test_delete_many_paths_with_single_confirmation(self, mock_input, command, setup_filesystem, capsys):
+        """Тест: несколько путей и шаблоны удаляются после одного подтверждения с количеством и объемом"""
+        fs = setup_filesystem
+        fs.create_file("test/file3.log", contents="12345")
+
+        command.execute(["test/*.txt", "test/file3.log"], [])
+
+        mock_input.assert_called_once()
+        assert "3 items (5)" in capsys.readouterr().err # вопрос выводится в stderr
+        assert not Path("test/file1.txt").exists()
+        assert not Path("test/file3.log").exists()
+        assert Path(".trash/file2.txt").exists()
+
+    @patch('builtins.input', return_value='n')
+    def test_cancelled_bulk_delete_keeps_files(self, mock_input, command, setup_filesystem):
+        """Тест: при отказе ни один элемент не удаляется"""
+        command.execute(["test/file1.txt", "test/file2.txt"], [])
+
+        assert Path("test/file1.txt").exists()
+        assert Path("test/file2.txt").exists()
+
+    @patch('builtins.input')
+    def test_force_skips_confirmation(self, mock_input, command, setup_filesystem):
+        """Тест: -f удаляет без подтверждения"""
+        command.execute(["test/dir1", "test/file1.txt"], ['r', 'f'])
+
+        mock_input.assert_not_called()
+        assert not Path("test/dir1").exists()
+        assert not Path("test/file1.txt").exists()
+
+    def test_bulk_delete_reports_errors_and_removes_rest(self, command, setup_filesystem):
+        """Тест: ошибки отдельных путей выводятся в конце, остальные пути удаляются"""
+        with pytest.raises(OSError) as exc_info:
+            command.execute(["test/file1.txt", "test/dir1", "missing.txt"], ['f'])
+
+        assert "failed to remove 2 items" in str(exc_info.value)
+        assert "dir1: is a directory" in str(exc_info.value)
+        assert not Path("test/file1.txt").exists()
+        assert Path("test/dir1").exists()
+
+    def test_bulk_delete_is_one_undo_group(self, command, setup_filesystem):
+        """Тест: элементы, удаленные одной командой, образуют одну группу в корзине"""
+        command.execute(["test/*.txt"], ['f'])
+
+        assert sorted(entry.name for entry in command._trash.last_batch()) == ["file1.txt", "file2.txt"]
@@ -0,0 +1,111 @@
+import os
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from core import ShellCore
+from src.utils.parser import expand_globs
+from src.utils.session import Session, activate, getcwd, open_file, resolve
+
+
+class TestSession:
+    """Тесты для рабочей директории сеанса оболочки"""
+
+    @pytest.fixture
+    def dirs(self, tmp_path):
+        """Фикстура с двумя директориями, в которых лежат разные файлы с одинаковым именем"""
+        for name in ("first", "second"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "data.txt").write_text(f"{name}\n")
+        return tmp_path
+
+    def make_core(self, cwd):
+        """Ядро с найденными командами в директории cwd"""
+        core = ShellCore(Mock(), cwd=cwd)
+        core.auto_discover_commands()
+        return core
+
+    def test_cores_have_own_directories(self, dirs, capsys):
+        """Тест: два ядра в одном процессе разрешают пути относительно своих директорий"""
+        process_cwd = os.getcwd()
+        first, second = self.make_core(dirs / "first"), self.make_core(dirs)
+
+        second.execute_command("cd second\n")
+        first.execute_command("cat data.txt\n")
+        second.execute_command("cat data.txt\n")
+        second.execute_command("pwd\n")
+
+        assert capsys.readouterr().out == f"first\nsecond\n{dirs / 'second'}\n"
+        assert first.current_dir == dirs / "first"
+        assert os.getcwd() == process_cwd
+
+    def test_cores_in_threads(self, dirs):
+        """Тест: ядра, выполняющие cd в разных потоках, не меняют директории друг друга"""
+        cores = {name: self.make_core(dirs) for name in ("first", "second")}
+        seen = {name: set() for name in cores}
+
+        def work(name):
+            core = cores[name]
+            for _ in range(100):
+                core.execute_command(f"cd {name}\n")
+                with activate(core.session), open_file("data.txt", "r") as file:
+                    seen[name].add(file.read())
+                core.execute_command("cd ..\n")
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in cores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert seen == {"first": {"first\n"}, "second": {"second\n"}}
+        assert all(core.current_dir == dirs for core in cores.values())
+
+    def test_open_file_uses_directory_descriptor(self, dirs):
+        """Тест: файлы открываются относительно дескриптора директории, даже если ее переименовали"""
+        session = Session(dirs / "first")
+        try:
+            (dirs / "first").rename(dirs / "renamed")
+            with activate(session):
+                with open_file("data.txt", "r") as file:
+                    assert file.read() == "first\n"
+                assert getcwd() == str(dirs / "first")
+        finally:
+            session.close()
+
+    def test_chdir_through_symlink_keeps_path_and_descriptor_together(self, dirs):
+        """Тест: после cd по ссылке и cd .. resolve и open_file указывают на одну (логическую) директорию"""
+        (dirs / "logical").mkdir()
+        (dirs / "logical" / "f.txt").write_text("LOGI")
+        (dirs / "physical" / "target").mkdir(parents=True)
+        (dirs / "physical" / "f.txt").write_text("PHYS")
+        (dirs / "logical" / "link").symlink_to(dirs / "physical" / "target")
+        session = Session(dirs / "logical")
+        try:
+            with activate(session):
+                session.chdir("link")
+                session.chdir("..")
+                with open_file("f.txt", "r") as file:
+                    assert file.read() == "LOGI"
+                assert resolve("f.txt").read_text() == "LOGI"
+                assert getcwd() == str(dirs / "logical")
+        finally:
+            session.close()
+
+    def test_resolve_and_globs_without_session(self, dirs):
+        """Тест: без активного сеанса пути и шаблоны не меняются, в сеансе - относительно его директории"""
+        assert resolve("data.txt") == Path("data.txt")
+        session = Session(dirs)
+        try:
+            with activate(session):
+                assert resolve("first/data.txt") == dirs / "first" / "data.txt"
+                assert resolve("/abs") == Path("/abs")
+                assert expand_globs(["*/data.txt"]) == ["first/data.txt", "second/data.txt"]
+                session.chdir("second")
+                assert getcwd() == str(dirs / "second")
+                with pytest.raises(FileNotFoundError):
+                    session.chdir("missing")
+        finally:
+            session.close()
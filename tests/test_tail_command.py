@@ -0,0 +1,133 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from commands.tail import TailCommand
+
+
+class TestTailCommand:
+    """Тесты для команды tail"""
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return TailCommand(block_size=8)
+
+    @pytest.fixture
+    def setup_filesystem(self, fs):
+        """Фикстура для настройки тестовой файловой системы"""
+        fs.create_file("/test/lines.txt", contents="".join(f"line{i}\n" for i in range(1, 21)))
+        fs.create_file("/test/no_newline.txt", contents="one\ntwo\nthree")
+        fs.create_file("/test/short.txt", contents="one\ntwo\n")
+        fs.create_file("/test/empty.txt", contents="")
+        fs.create_dir("/test/directory")
+        return fs
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "tail"
+
+    def test_tail_default_ten_lines(self, command, setup_filesystem, capsysbinary):
+        """Тест: по умолчанию выводятся последние 10 строк"""
+        command.execute(["/test/lines.txt"], [])
+
+        assert capsysbinary.readouterr().out == "".join(f"line{i}\n" for i in range(11, 21)).encode()
+
+    def test_tail_with_n_option(self, command, setup_filesystem, capsysbinary):
+        """Тест: количество строк задается через -n N"""
+        command.execute(["2", "/test/lines.txt"], ['n'])
+
+        assert capsysbinary.readouterr().out == b"line19\nline20\n"
+
+    def test_tail_without_trailing_newline(self, command, setup_filesystem, capsysbinary):
+        """Тест: последняя строка без перевода строки считается строкой"""
+        command.execute(["2", "/test/no_newline.txt"], ['n'])
+
+        assert capsysbinary.readouterr().out == b"two\nthree"
+
+    def test_tail_more_lines_than_file(self, command, setup_filesystem, capsysbinary):
+        """Тест: если строк в файле меньше, то выводится весь файл"""
+        command.execute(["/test/short.txt"], [])
+
+        assert capsysbinary.readouterr().out == b"one\ntwo\n"
+
+    def test_tail_zero_lines_and_empty_file(self, command, setup_filesystem, capsysbinary):
+        """Тест: ноль строк и пустой файл ничего не выводят"""
+        command.execute(["0", "/test/lines.txt"], ['n'])
+        command.execute(["/test/empty.txt"], [])
+
+        assert capsysbinary.readouterr().out == b""
+
+    def test_tail_reads_only_end_of_file(self, setup_filesystem, capsysbinary):
+        """Тест: читаются только последние блоки файла"""
+        setup_filesystem.create_file("/test/big.txt", contents="x" * 100000 + "\nlast\n")
+        command = TailCommand(block_size=16)
+        read_sizes = []
+
+        original_open = open
+
+        def tracking_open(*args, **kwargs):
+            file = original_open(*args, **kwargs)
+            read = file.read
+            file.read = lambda size=-1: read_sizes.append(size) or read(size)
+            return file
+
+        with patch("builtins.open", tracking_open):
+            command.execute(["1", "/test/big.txt"], ['n'])
+
+        assert capsysbinary.readouterr().out == b"last\n"
+        assert sum(read_sizes) < 100
+
+    def test_tail_follow_outputs_appended_data(self, command, setup_filesystem, capsysbinary):
+        """Тест: режим -f выводит дописанные данные и завершается по Ctrl+C"""
+        calls = []
+
+        def fake_sleep(interval):
+            calls.append(interval)
+            if len(calls) == 1:
+                with open("/test/short.txt", "a") as file:
+                    file.write("three\n")
+            else:
+                raise KeyboardInterrupt
+
+        with patch("commands.tail.time.sleep", fake_sleep):
+            command.execute(["/test/short.txt"], ['f', "interval=0.1"])
+
+        assert capsysbinary.readouterr().out == b"one\ntwo\nthree\n"
+        assert calls == [0.1, 0.1]
+
+    def test_tail_follow_after_truncation(self, command, setup_filesystem, capsysbinary):
+        """Тест: после усечения файла вывод продолжается с начала"""
+        calls = []
+
+        def fake_sleep(interval):
+            calls.append(interval)
+            if len(calls) == 1:
+                Path("/test/short.txt").write_text("new\n")
+            else:
+                raise KeyboardInterrupt
+
+        with patch("commands.tail.time.sleep", fake_sleep):
+            command.execute(["/test/short.txt"], ['f'])
+
+        assert capsysbinary.readouterr().out == b"one\ntwo\nnew\n"
+
+    def test_tail_invalid_interval_raises_error(self, command, setup_filesystem):
+        """Тест: некорректный период опроса вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["/test/lines.txt"], ['f', "interval=0"])
+
+    def test_tail_too_many_arguments_raises_error(self, command, setup_filesystem):
+        """Тест: несколько файлов вызывают SyntaxError"""
+        with pytest.raises(SyntaxError, match=f"{command.name}: given more arguments than required"):
+            command.execute(["/test/lines.txt", "/test/short.txt"], [])
+
+    def test_tail_nonexistent_file_raises_error(self, command, setup_filesystem):
+        """Тест: несуществующий файл вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: no such file or directory: missing.txt"):
+            command.execute(["/test/missing.txt"], [])
+
+    def test_tail_directory_raises_error(self, command, setup_filesystem):
+        """Тест: директория вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: not a file: directory"):
+            command.execute(["/test/directory"], [])
@@ -0,0 +1,323 @@
+import errno
+import fcntl
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.trash import LOCK_NAME, Trash, get_trash
+
+
+def fake_devices(mount):
+    """подмена os.stat, при которой все внутри mount находится на отдельном устройстве"""
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        result = real_stat(path, *args, **kwargs)
+        if os.path.abspath(path).startswith(str(mount)):
+            values = list(result)
+            values[2] += 1 # st_dev
+            return os.stat_result(values)
+        return result
+    return patch("src.utils.trash.os.stat", stat)
+
+
+class TestTrash:
+    """Тесты для корзины"""
+
+    @pytest.fixture
+    def layout(self, tmp_path):
+        """Фикстура с центральной корзиной и "другой файловой системой" в mnt"""
+        (tmp_path / "mnt" / "data").mkdir(parents=True)
+        (tmp_path / "mnt" / "data" / "big.bin").write_bytes(b"x" * 100)
+        (tmp_path / "local.txt").write_text("local")
+        return tmp_path
+
+    def test_same_device_uses_central_trash(self, layout):
+        """Тест: элемент с устройства центральной корзины перемещается в нее"""
+        trash = Trash(layout / ".trash")
+
+        target = trash.put(layout / "local.txt").stored
+
+        assert target == layout / ".trash" / "local.txt"
+        assert target.read_text() == "local"
+
+    def test_other_device_uses_trash_at_mount_point(self, layout):
+        """Тест: элемент другой файловой системы переименовывается в .Trash-<uid> ее точки монтирования"""
+        trash = Trash(layout / ".trash")
+
+        with fake_devices(layout / "mnt"), patch("src.utils.trash.move") as move:
+            target = trash.put(layout / "mnt" / "data" / "big.bin").stored
+
+        move.assert_not_called()
+        assert target == layout / "mnt" / f".Trash-{os.getuid()}" / "big.bin"
+        assert target.read_bytes() == b"x" * 100
+
+    def test_mount_point_is_found_once_per_device(self, layout):
+        """Тест: корзина устройства определяется один раз"""
+        (layout / "mnt" / "data" / "second.bin").write_bytes(b"y")
+        trash = Trash(layout / ".trash")
+
+        with fake_devices(layout / "mnt"), patch.object(trash, "_mount_trash", wraps=trash._mount_trash) as find:
+            trash.put(layout / "mnt" / "data" / "big.bin")
+            trash.put(layout / "mnt" / "data" / "second.bin")
+
+        assert find.call_count == 1
+
+    def test_falls_back_to_central_trash(self, layout):
+        """Тест: если корзину в точке монтирования создать нельзя, используется центральная"""
+        trash = Trash(layout / ".trash")
+        real_makedirs = os.makedirs
+
+        def makedirs(path, *args, **kwargs):
+            if ".Trash-" in str(path):
+                raise PermissionError(errno.EACCES, "permission denied")
+            return real_makedirs(path, *args, **kwargs)
+
+        with fake_devices(layout / "mnt"), patch("src.utils.trash.os.makedirs", makedirs):
+            target = trash.put(layout / "mnt" / "data" / "big.bin").stored
+
+        assert target == layout / ".trash" / "big.bin"
+
+    def test_copies_when_rename_crosses_devices(self, layout):
+        """Тест: если переименование невозможно (EXDEV), элемент копируется"""
+        trash = Trash(layout / ".trash")
+
+        with patch("os.rename", side_effect=OSError(errno.EXDEV, "cross-device link")):
+            target = trash.put(layout / "mnt" / "data").stored
+
+        assert (target / "big.bin").read_bytes() == b"x" * 100
+        assert not (layout / "mnt" / "data").exists()
+
+    def test_same_names_do_not_collide(self, layout):
+        """Тест: элементы с одинаковым именем хранятся под разными именами"""
+        trash = Trash(layout / ".trash")
+        (layout / "a").mkdir()
+        (layout / "a" / "config.yaml").write_text("first")
+        (layout / "b").mkdir()
+        (layout / "b" / "config.yaml").write_text("second")
+
+        first = trash.put(layout / "a" / "config.yaml")
+        second = trash.put(layout / "b" / "config.yaml")
+
+        assert first.stored != second.stored
+        assert first.stored.read_text() == "first"
+        assert second.stored.read_text() == "second"
+
+    def test_index_records_entries(self, layout):
+        """Тест: индекс хранит исходный путь, размер и время удаления"""
+        trash = Trash(layout / ".trash")
+
+        entry = trash.put(layout / "mnt" / "data")
+        trash.wait() # размер директории считается в фоне
+
+        found = trash.find(layout / "mnt" / "data")
+        assert found.id == entry.id
+        assert found.path == str(layout / "mnt" / "data")
+        assert found.size == 100
+        assert trash.total_size == 100
+
+    def test_index_is_shared_through_journal(self, layout):
+        """Тест: другой объект корзины видит записи через журнал, не читая содержимое корзины"""
+        Trash(layout / ".trash").put(layout / "local.txt")
+
+        with patch("os.scandir") as scandir, patch("os.listdir") as listdir:
+            entry = Trash(layout / ".trash").find(layout / "local.txt")
+
+        scandir.assert_not_called()
+        listdir.assert_not_called()
+        assert entry.stored.read_text() == "local"
+
+    def test_restore_returns_item_and_removes_entry(self, layout):
+        """Тест: восстановление возвращает элемент по исходному пути и удаляет запись"""
+        trash = Trash(layout / ".trash")
+        entry = trash.put(layout / "mnt" / "data")
+
+        trash.restore(entry)
+
+        assert (layout / "mnt" / "data" / "big.bin").read_bytes() == b"x" * 100
+        assert trash.find(layout / "mnt" / "data") is None
+        assert trash.total_size == 0
+
+    def test_restore_does_not_overwrite(self, layout):
+        """Тест: восстановление на занятый путь вызывает FileExistsError"""
+        trash = Trash(layout / ".trash")
+        entry = trash.put(layout / "local.txt")
+        (layout / "local.txt").write_text("new")
+
+        with pytest.raises(FileExistsError):
+            trash.restore(entry)
+
+    def test_last_batch(self, layout):
+        """Тест: последняя группа содержит все элементы, удаленные одной командой"""
+        trash = Trash(layout / ".trash")
+        trash.put(layout / "local.txt")
+        batch = trash.new_batch()
+        trash.put(layout / "mnt" / "data" / "big.bin", batch=batch)
+        trash.put(layout / "mnt" / "data", batch=batch)
+
+        assert [entry.name for entry in trash.last_batch()] == ["big.bin", "data"]
+
+    def test_journal_is_compacted(self, layout):
+        """Тест: журнал переписывается, когда устаревших записей больше, чем актуальных"""
+        trash = Trash(layout / ".trash")
+        with patch("src.utils.trash.COMPACT_MIN_RECORDS", 4):
+            for _ in range(3):
+                trash.restore(trash.put(layout / "local.txt"))
+            trash.put(layout / "local.txt")
+
+        lines = trash.index_path.read_text().splitlines()
+        assert len(lines) < 8
+        assert Trash(layout / ".trash").find(layout / "local.txt") is not None
+
+    def test_torn_journal_line_is_skipped(self, layout):
+        """Тест: оборванная строка журнала пропускается, следующие записи начинаются с новой строки"""
+        trash = Trash(layout / ".trash")
+        trash.put(layout / "local.txt")
+        with open(trash.index_path, "a") as file:
+            file.write('{"op": "add", "id": ') # аварийное завершение во время записи
+        (layout / "other.txt").write_text("other")
+
+        trash = Trash(layout / ".trash")
+        trash.put(layout / "other.txt")
+        with patch("src.utils.trash.COMPACT_MIN_RECORDS", 1):
+            trash.restore(trash.find(layout / "other.txt"))
+
+        assert trash.find(layout / "local.txt") is not None
+        assert (layout / "other.txt").read_text() == "other"
+        assert '"id": \n' not in trash.index_path.read_text()
+        assert Trash(layout / ".trash").find(layout / "local.txt") is not None
+
+    def test_get_trash_shares_one_object_per_root(self, layout):
+        """Тест: команды одного процесса получают общий объект корзины для одной директории"""
+        with patch.dict("src.utils.trash._instances", clear=True):
+            assert get_trash(layout / ".trash") is get_trash(str(layout / ".trash"))
+            assert get_trash(layout / ".trash") is not get_trash(layout / "other")
+
+    def test_journal_append_waits_for_lock(self, layout):
+        """Тест: запись в журнал ждет блокировку журнала, которую держит другой процесс"""
+        trash = Trash(layout / ".trash")
+        trash.put(layout / "mnt" / "data" / "big.bin")
+        done = threading.Event()
+        with open(layout / ".trash" / LOCK_NAME, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            thread = threading.Thread(target=lambda: (trash.put(layout / "local.txt"), done.set()))
+            thread.start()
+            assert not done.wait(0.2)
+        thread.join(timeout=5)
+
+        assert done.is_set()
+        assert Trash(layout / ".trash").find(layout / "local.txt") is not None
+
+    def test_quota_evicts_oldest_entries_in_background(self, layout):
+        """Тест: при превышении размера старейшие элементы удаляются фоновым потоком"""
+        trash = Trash(layout / ".trash")
+        trash.configure(max_size=150)
+        threads = []
+        real_unlink = os.unlink
+
+        def unlink(path, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return real_unlink(path, *args, **kwargs)
+
+        entries = []
+        for i in range(3):
+            (layout / f"file{i}.bin").write_bytes(b"x" * 100)
+            entries.append(trash.put(layout / f"file{i}.bin"))
+        with patch("src.utils.trash.os.unlink", unlink):
+            trash.maintain()
+            trash.wait()
+
+        assert threads == ["trash-worker", "trash-worker"]
+        assert [entry.name for entry in trash.entries()] == ["file2.bin"]
+        assert not entries[0].stored.exists() and not entries[1].stored.exists()
+        assert trash.total_size == 100
+
+    def test_worker_survives_failed_job(self, layout):
+        """Тест: ошибка фоновой работы не останавливает поток, следующая работа выполняется, wait завершается"""
+        trash = Trash(layout / ".trash")
+        done = threading.Event()
+
+        def fail():
+            raise ValueError("broken job")
+
+        with patch("src.utils.trash.logging.getLogger"):
+            trash._submit(fail)
+            trash.wait()
+            trash._submit(done.set)
+            trash.wait()
+
+        assert done.is_set()
+        assert trash._worker is None
+
+    def test_quota_evicts_old_entries(self, layout):
+        """Тест: элементы старше max_age удаляются окончательно"""
+        trash = Trash(layout / ".trash")
+        entry = trash.put(layout / "local.txt")
+        trash.configure(max_age=60)
+
+        with patch("src.utils.trash.time.time", return_value=entry.time + 120):
+            trash.maintain()
+            trash.wait()
+
+        assert trash.entries() == []
+        assert not entry.stored.exists()
+
+    def test_quota_check_does_not_scan_trash(self, layout):
+        """Тест: проверка квоты использует размер из индекса, а не обход корзины"""
+        trash = Trash(layout / ".trash")
+        trash.put(layout / "local.txt")
+        trash.configure(max_size=1024)
+
+        with patch("src.utils.trash.scan_size") as scan_size:
+            trash.maintain()
+
+        scan_size.assert_not_called()
+        assert trash.entries()[0].name == "local.txt"
+
+    def test_compression_after_rename(self, layout):
+        """Тест: файл сжимается в фоновом потоке после переименования, размер в индексе - размер архива"""
+        trash = Trash(layout / ".trash")
+        trash.configure(compression="gzip", compression_min_size=1024)
+        (layout / "big.txt").write_bytes(b"a" * 100000)
+
+        trash.put(layout / "big.txt")
+        trash.wait()
+
+        entry = trash.entries()[0]
+        assert entry.compression == "gzip"
+        assert entry.stored == layout / ".trash" / "big.txt.gz"
+        assert not (layout / ".trash" / "big.txt").exists()
+        assert entry.size == entry.stored.stat().st_size < 100000
+        assert trash.total_size == entry.size
+        assert Trash(layout / ".trash").entries()[0].compression == "gzip" # состояние восстанавливается из журнала
+
+    def test_restore_decompresses(self, layout):
+        """Тест: сжатый файл при восстановлении распаковывается с исходным временем изменения"""
+        trash = Trash(layout / ".trash")
+        trash.configure(compression="lzma", compression_level=1, compression_min_size=0)
+        (layout / "data.bin").write_bytes(bytes(range(256)) * 100)
+        os.utime(layout / "data.bin", (1000000, 1000000))
+
+        trash.put(layout / "data.bin")
+        trash.wait()
+        entry = trash.find(str(layout / "data.bin"))
+        assert entry.stored.name == "data.bin.xz"
+        trash.restore(entry)
+
+        assert (layout / "data.bin").read_bytes() == bytes(range(256)) * 100
+        assert (layout / "data.bin").stat().st_mtime == 1000000
+        assert not entry.stored.exists()
+        assert trash.entries() == []
+
+    def test_small_files_are_not_compressed(self, layout):
+        """Тест: файлы меньше compression_min_size хранятся как есть"""
+        trash = Trash(layout / ".trash")
+        trash.configure(compression="gzip", compression_min_size=1024)
+
+        entry = trash.put(layout / "local.txt")
+        trash.wait()
+
+        assert entry.compression is None
+        assert entry.stored.read_text() == "local"
@@ -0,0 +1,94 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from commands.rm import RmCommand
+from commands.trash import TrashCommand
+
+
+class TestTrashCommand:
+    """Тесты для команды trash"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_trash(self):
+        """Фикстура: у каждого теста своя файловая система, поэтому общие объекты корзины не переиспользуются"""
+        with patch.dict("src.utils.trash._instances", clear=True):
+            yield
+
+    @pytest.fixture
+    def setup_filesystem(self, fs):
+        fs.create_file("/work/config.yaml", contents="first")
+        fs.create_file("/work/other/config.yaml", contents="second")
+        return fs
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return TrashCommand("/trash")
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "trash"
+
+    def test_unknown_action_raises_error(self, command, setup_filesystem):
+        """Тест: неизвестное действие вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["clean"], [])
+
+    def test_list_shows_original_paths(self, command, setup_filesystem):
+        """Тест: trash list выводит исходные пути и размеры удаленных элементов"""
+        RmCommand("/trash").execute(["/work/config.yaml"], [])
+        RmCommand("/trash").execute(["/work/other/config.yaml"], [])
+
+        with patch('builtins.print') as mock_print:
+            command.execute(["list"], [])
+
+        lines = mock_print.call_args[0][0].split("\n")
+        assert lines[0].startswith("Deletion time")
+        assert lines[1].rstrip().endswith("5 /work/config.yaml")
+        assert lines[2].endswith("6 /work/other/config.yaml")
+
+    def test_restore_by_original_path(self, command, setup_filesystem):
+        """Тест: trash restore возвращает элемент по исходному пути"""
+        RmCommand("/trash").execute(["/work/config.yaml"], [])
+        RmCommand("/trash").execute(["/work/other/config.yaml"], [])
+
+        command.execute(["restore", "/work/other/config.yaml"], [])
+
+        assert Path("/work/other/config.yaml").read_text() == "second"
+        assert not Path("/work/config.yaml").exists()
+
+    def test_restore_missing_path_raises_error(self, command, setup_filesystem):
+        """Тест: восстановление элемента, которого нет в корзине, вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            command.execute(["restore", "/work/missing.txt"], [])
+
+    def test_quota_is_saved_and_shown(self, command, setup_filesystem):
+        """Тест: trash quota сохраняет квоту и выводит ее вместе с размером корзины"""
+        RmCommand("/trash").execute(["/work/config.yaml"], [])
+
+        command.execute(["quota"], ["size=10M", "days=30"])
+        with patch('builtins.print') as mock_print:
+            command.execute(["quota"], [])
+
+        assert mock_print.call_args[0][0] == "trash: size 5 of 10M, max age 30 days"
+
+    def test_invalid_quota_raises_error(self, command, setup_filesystem):
+        """Тест: некорректная квота вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["quota"], ["size=big"])
+
+    def test_compression_settings_are_saved_and_shown(self, command, setup_filesystem):
+        """Тест: trash compress сохраняет способ, уровень и порог сжатия"""
+        command.execute(["compress"], ["method=lzma", "level=9", "min-size=64K"])
+        with patch('builtins.print') as mock_print:
+            command.execute(["compress"], [])
+
+        assert mock_print.call_args[0][0] == "trash: compression lzma, level 9, min size 64K"
+
+    def test_invalid_compression_raises_error(self, command, setup_filesystem):
+        """Тест: неизвестный способ или недопустимый уровень сжатия вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute(["compress"], ["method=zip"])
+        with pytest.raises(SyntaxError):
+            command.execute(["compress"], ["method=gzip", "level=0"])
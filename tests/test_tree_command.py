@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import patch
+
+from commands.tree import TreeCommand
+from src.utils.walker import walk_parallel
+
+
+class TestTreeCommand:
+    """Тесты для команды tree"""
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return TreeCommand()
+
+    # pyfakefs не потокобезопасен, поэтому параллельный обход проверяется на настоящих файлах
+    @pytest.fixture
+    def tree_dir(self, tmp_path):
+        """Фикстура для создания дерева директорий"""
+        (tmp_path / "b_dir" / "nested").mkdir(parents=True)
+        (tmp_path / "b_dir" / "nested" / "deep.txt").write_text("deep")
+        (tmp_path / "b_dir" / "inner.txt").write_text("inner")
+        (tmp_path / "a_dir").mkdir()
+        (tmp_path / "c.txt").write_text("c")
+        (tmp_path / "a.txt").write_text("a")
+        return tmp_path
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "tree"
+
+    def test_tree_output(self, command, tree_dir):
+        """Тест: вывод дерева отсортирован и содержит итоговые счетчики"""
+        with patch('builtins.print') as mock_print:
+            command.execute([str(tree_dir)], ["workers=4"])
+
+        lines = [call.args[0] if call.args else "" for call in mock_print.call_args_list]
+        assert lines == [
+            tree_dir,
+            "├── a.txt",
+            "├── a_dir",
+            "├── b_dir",
+            "│   ├── inner.txt",
+            "│   └── nested",
+            "│       └── deep.txt",
+            "└── c.txt",
+            "\n3 directories, 4 files",
+        ]
+
+    def test_tree_max_depth(self, command, tree_dir):
+        """Тест: --depth ограничивает количество выводимых уровней"""
+        with patch('builtins.print') as mock_print:
+            command.execute([str(tree_dir)], ["depth=1"])
+
+        lines = [call.args[0] for call in mock_print.call_args_list]
+        assert "│   ├── inner.txt" not in lines
+        assert lines[-1] == "\n2 directories, 2 files"
+
+    def test_walk_parallel_is_deterministic(self, tree_dir):
+        """Тест: порядок обхода не зависит от количества потоков"""
+        results = [[(path, depth, listing) for path, depth, listing in walk_parallel(tree_dir, workers=workers)]
+                   for workers in (1, 2, 8)]
+
+        assert results[0] == results[1] == results[2]
+        assert [path.name for path, _, _ in results[0]] == [tree_dir.name, "a_dir", "b_dir", "nested"]
+
+    def test_tree_invalid_workers_raises_error(self, command, tree_dir):
+        """Тест: некорректное количество потоков вызывает SyntaxError"""
+        with pytest.raises(SyntaxError):
+            command.execute([str(tree_dir)], ["workers=0"])
+
+    def test_tree_nonexistent_directory_raises_error(self, command, tree_dir):
+        """Тест: несуществующая директория вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError, match=f"{command.name}: no such file or directory: missing"):
+            command.execute([str(tree_dir / "missing")], [])
+
+    def test_tree_file_raises_error(self, command, tree_dir):
+        """Тест: файл вместо директории вызывает NotADirectoryError"""
+        with pytest.raises(NotADirectoryError, match=f"{command.name}: not a directory: a.txt"):
+            command.execute([str(tree_dir / "a.txt")], [])
@@ -0,0 +1,43 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from commands.rm import RmCommand
+from commands.undo import UndoCommand
+
+
+class TestUndoCommand:
+    """Тесты для команды undo"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_trash(self):
+        """Фикстура: у каждого теста своя файловая система, поэтому общие объекты корзины не переиспользуются"""
+        with patch.dict("src.utils.trash._instances", clear=True):
+            yield
+
+    @pytest.fixture
+    def command(self):
+        """Фикстура для создания экземпляра команды"""
+        return UndoCommand("/trash")
+
+    def test_command_name(self, command):
+        """Тест имени команды"""
+        assert command.name == "undo"
+
+    def test_undo_restores_last_deletion(self, command, fs):
+        """Тест: undo возвращает элемент, удаленный последним"""
+        fs.create_file("/work/a.txt", contents="a")
+        fs.create_file("/work/b.txt", contents="b")
+        RmCommand("/trash").execute(["/work/a.txt"], [])
+        RmCommand("/trash").execute(["/work/b.txt"], [])
+
+        with patch('builtins.print'):
+            command.execute([], [])
+
+        assert Path("/work/b.txt").read_text() == "b"
+        assert not Path("/work/a.txt").exists()
+
+    def test_undo_with_empty_trash_raises_error(self, command, fs):
+        """Тест: undo при пустой корзине вызывает FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            command.execute([], [])